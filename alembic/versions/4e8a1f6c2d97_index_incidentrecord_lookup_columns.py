@@ -0,0 +1,73 @@
+"""Index incidentrecord lookup columns
+
+Revision ID: 4e8a1f6c2d97
+Revises: 9c41d7a2e5b8
+Create Date: 2026-10-17 15:48:36.771402
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4e8a1f6c2d97"
+down_revision = "9c41d7a2e5b8"
+branch_labels = None
+depends_on = None
+
+# Index name, column and whether it is unique
+indexes = [
+    ("ix_incidentrecord_channel_id", "channel_id", True),
+    ("ix_incidentrecord_channel_name", "channel_name", False),
+    ("ix_incidentrecord_slug", "slug", True),
+    ("ix_incidentrecord_status", "status", False),
+]
+
+
+def drop_invalid_index(name: str, table_name: str):
+    # A concurrent build that failed, e.g. on duplicate values for a unique
+    # index, leaves an invalid index behind that if_not_exists would skip
+    invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT NOT indisvalid FROM pg_index "
+                + "WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+    if invalid:
+        op.drop_index(
+            name, table_name=table_name, postgresql_concurrently=True
+        )
+
+
+def upgrade():
+    # Build the indexes without locking incidentrecord against writes, which
+    # can't happen inside a transaction
+    with op.get_context().autocommit_block():
+        for name, column, unique in indexes:
+            drop_invalid_index(name, "incidentrecord")
+            op.create_index(
+                name,
+                "incidentrecord",
+                [column],
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(indexes):
+            op.drop_index(
+                name,
+                table_name="incidentrecord",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,75 @@
+"""Index incidentevent timeline
+
+Revision ID: b7d3e9f14a26
+Revises: 4e8a1f6c2d97
+Create Date: 2026-10-17 16:31:12.508913
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7d3e9f14a26"
+down_revision = "4e8a1f6c2d97"
+branch_labels = None
+depends_on = None
+
+# Index name and columns, matching the timeline order of message_ts then
+# created_at so reads don't need a separate sort
+indexes = [
+    (
+        "ix_incidentevent_parent_message_ts",
+        ["parent", "message_ts", "created_at"],
+    ),
+    (
+        "ix_incidentevent_incident_slug_message_ts",
+        ["incident_slug", "message_ts", "created_at"],
+    ),
+]
+
+
+def drop_invalid_index(name: str, table_name: str):
+    # A concurrent build that failed leaves an invalid index behind that
+    # if_not_exists would skip
+    invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT NOT indisvalid FROM pg_index "
+                + "WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+    if invalid:
+        op.drop_index(
+            name, table_name=table_name, postgresql_concurrently=True
+        )
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in indexes:
+            drop_invalid_index(name, "incidentevent")
+            op.create_index(
+                name,
+                "incidentevent",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(indexes):
+            op.drop_index(
+                name,
+                table_name="incidentevent",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,74 @@
+"""Index incidentrecord listing
+
+Revision ID: d2f85c0b7e13
+Revises: b7d3e9f14a26
+Create Date: 2026-10-17 17:12:48.093615
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2f85c0b7e13"
+down_revision = "b7d3e9f14a26"
+branch_labels = None
+depends_on = None
+
+# Index name and columns, newest first to match how incidents are listed
+indexes = [
+    (
+        "ix_incidentrecord_created_at_id",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    ),
+    (
+        "ix_incidentrecord_status_created_at",
+        ["status", sa.text("created_at DESC")],
+    ),
+]
+
+
+def drop_invalid_index(name: str, table_name: str):
+    # A concurrent build that failed leaves an invalid index behind that
+    # if_not_exists would skip
+    invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT NOT indisvalid FROM pg_index "
+                + "WHERE indexrelid = to_regclass(:name)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+    if invalid:
+        op.drop_index(
+            name, table_name=table_name, postgresql_concurrently=True
+        )
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in indexes:
+            drop_invalid_index(name, "incidentrecord")
+            op.create_index(
+                name,
+                "incidentrecord",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(indexes):
+            op.drop_index(
+                name,
+                table_name="incidentrecord",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
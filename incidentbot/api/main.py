@@ -9,6 +9,7 @@ from incidentbot.api.routes import (
     users,
 )
 from incidentbot.configuration.settings import settings, __version__
+from incidentbot.models.unit_of_work import begin, end
 
 from fastapi import (
     APIRouter,
@@ -20,6 +21,7 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 """
 Run Init Tasks
@@ -46,6 +48,25 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def unit_of_work_middleware(request: Request, call_next):
+    """
+    Handle each request as one unit of work, committing its queued updates
+    off the event loop once the response is ready
+
+    Updates that can't be written fail the request rather than being lost
+    behind a successful response
+    """
+
+    uow, token = begin()
+
+    try:
+        return await call_next(request)
+    finally:
+        end(uow, token)
+        await run_in_threadpool(uow.commit)
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
@@ -1,8 +1,19 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
+from incidentbot.util.readiness import readiness
 
 router = APIRouter()
 
 
 @router.get("/health", status_code=status.HTTP_200_OK)
 async def get_health():
-    return {"healthy": True}
+    return {"healthy": True, "ready": readiness.ready}
+
+
+@router.get("/health/ready", status_code=status.HTTP_200_OK)
+async def get_health_ready(response: Response):
+    current = readiness.status()
+
+    if not current.get("ready"):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return current
@@ -1,8 +1,22 @@
 import asyncio
 import base64
-
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+import json
+import threading
+import time
+
+from datetime import datetime
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from incidentbot.api.deps import get_current_active_superuser, SessionDep
+from incidentbot.exceptions import BlobNotFoundError, ConfigurationError
 from incidentbot.incident.actions import (
     set_description,
     set_severity,
@@ -11,7 +25,6 @@ from incidentbot.incident.actions import (
 from incidentbot.incident.core import Incident, IncidentRequestParameters
 from incidentbot.incident.event import EventLogHandler
 from incidentbot.models.database import (
-    ApplicationData,
     IncidentEvent,
     IncidentEventBase,
     IncidentParticipant,
@@ -20,20 +33,118 @@ from incidentbot.models.database import (
     OpsgenieIncidentRecord,
     PagerDutyIncidentRecord,
     PostmortemRecord,
+    SlackUser,
     StatuspageIncidentRecord,
 )
+from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.response import SuccessResponse
+from incidentbot.storage.blob import get_blob_store
+from incidentbot.storage.image import get_thumbnail
 from pydantic import BaseModel
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import col, select
-from typing import Any
+from sqlmodel import select
+from typing import Annotated, Any
 
 router = APIRouter()
 
 
 class Incidents(BaseModel):
     data: list[IncidentRecord]
-    count: int
+    count: int | None = None
+    next_cursor: str | None = None
+
+
+# Largest page GET /incident will return
+max_page_size = 500
+
+# Seconds a total count for a set of filters is reused for
+total_count_ttl = 30
+
+# Most sets of filters a total count is kept for at once
+max_total_counts = 256
+
+_total_counts: dict[tuple, tuple[float, int]] = {}
+_total_counts_lock = threading.Lock()
+
+
+def encode_cursor(incident: IncidentRecord) -> str:
+    """
+    Return an opaque cursor pointing after an incident
+
+    Parameters:
+        incident (IncidentRecord): Last incident of a page
+    """
+
+    return (
+        base64.urlsafe_b64encode(
+            json.dumps([incident.created_at.isoformat(), incident.id]).encode()
+        )
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Return the (created_at, id) key a cursor points after
+
+    Raises ValueError if the cursor is not one returned by encode_cursor
+
+    Parameters:
+        cursor (str): Cursor from a previous page
+    """
+
+    try:
+        created_at, id = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+
+        return datetime.fromisoformat(created_at), int(id)
+    except Exception:
+        raise ValueError(f"{cursor} is not a valid cursor")
+
+
+def cached_total(filters: dict[str, Any]) -> int:
+    """
+    Return the number of incidents matching a set of filters, reusing a
+    recent count for the same filters
+
+    Expired counts are dropped whenever a new one is stored, and the oldest
+    are evicted once max_total_counts sets of filters are held.
+
+    Parameters:
+        filters (dict[str, Any]): Filters accepted by list_page
+    """
+
+    key = tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in filters.items()
+        )
+    )
+    now = time.monotonic()
+
+    with _total_counts_lock:
+        cached = _total_counts.get(key)
+        if cached and now - cached[0] < total_count_ttl:
+            return cached[1]
+
+    total = IncidentDatabaseInterface.count(**filters)
+
+    with _total_counts_lock:
+        # Counts are stored oldest first, so expired ones lead the dict
+        for stale, (counted_at, _) in list(_total_counts.items()):
+            if now - counted_at < total_count_ttl:
+                break
+            del _total_counts[stale]
+
+        _total_counts.pop(key, None)
+        while len(_total_counts) >= max_total_counts:
+            del _total_counts[next(iter(_total_counts))]
+
+        _total_counts[key] = (now, total)
+
+    return total
 
 
 """
@@ -46,27 +157,51 @@ class Incidents(BaseModel):
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_incidents(
-    session: SessionDep,
-    skip: int = 0,
-    limit: int = 100,
-    filter: str = None,
+def get_incidents(
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=max_page_size)] = 100,
+    filter: str | None = None,
+    statuses: Annotated[list[str] | None, Query(alias="status")] = None,
+    severities: Annotated[list[str] | None, Query(alias="severity")] = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    include_total: bool = True,
 ) -> Incidents:
-    try:
-        if filter:
-            incidents = session.exec(
-                select(IncidentRecord)
-                .where(col(IncidentRecord.description).contains(filter))
-                .order_by(IncidentRecord.slug)
-            ).all()
+    """
+    Return a page of incidents, newest first
+
+    Pass next_cursor from a response as cursor to get the following page.
+    count is the total number of incidents matching the filters, which is
+    reused for a short time rather than counted for every page.
+    """
 
-            return Incidents(data=incidents, count=len(incidents))
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    filters = {
+        "created_after": created_after,
+        "created_before": created_before,
+        "description": filter,
+        "severities": severities,
+        "statuses": statuses,
+    }
 
-        incidents = session.exec(
-            select(IncidentRecord).offset(skip).limit(limit).order_by("id")
-        ).all()
+    try:
+        incidents = IncidentDatabaseInterface.list_page(
+            after=after, limit=limit, **filters
+        )
 
-        return Incidents(data=incidents, count=len(incidents))
+        return Incidents(
+            data=incidents,
+            count=cached_total(filters) if include_total else None,
+            next_cursor=(
+                encode_cursor(incidents[-1])
+                if len(incidents) == limit
+                else None
+            ),
+        )
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
 
@@ -361,34 +496,56 @@ def get_incident_events(
     Return events excluding the image field
 
     If there is an image present, an additional request will have to be made
-    against the following endpoint to get the iamge specifically
+    against the following endpoint to get the image specifically
     """
     try:
-        records = EventLogHandler.read(incident_slug=slug)
-
-        return [
-            IncidentEventBase(
-                created_at=record.created_at,
-                id=record.id,
-                incident_slug=record.incident_slug,
-                message_ts=record.message_ts,
-                mimetype=record.mimetype,
-                parent=record.parent,
-                source=record.source,
-                text=record.text,
-                timestamp=record.timestamp,
-                title=record.title,
-                updated_at=record.updated_at,
-                user=record.user,
-            )
-            for record in records
-        ]
+        return EventLogHandler.read_summaries(incident_slug=slug)
     except NoResultFound:
         raise HTTPException(status_code=404, detail="incident not found")
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
 
 
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Return the first and last byte, inclusive, requested by a Range header
+
+    Only a single range is supported. Returns None when the header should be
+    ignored and the whole content served instead. Raises ValueError when the
+    range can't be satisfied.
+
+    Parameters:
+        header (str): Value of the Range header
+        size (int): Size of the content in bytes
+    """
+
+    unit, _, spec = header.partition("=")
+
+    if unit.strip() != "bytes" or "," in spec or "-" not in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+
+    try:
+        if not first:
+            # A suffix range such as bytes=-500 asks for the last 500 bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError(f"{header} can't be satisfied")
+
+            return max(size - length, 0), size - 1
+
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        raise ValueError(f"{header} can't be satisfied")
+
+    if start >= size or start > end:
+        raise ValueError(f"{header} can't be satisfied")
+
+    return start, end
+
+
 @router.get(
     "/incident/{slug}/events/image/{id}",
     dependencies=[Depends(get_current_active_superuser)],
@@ -398,22 +555,78 @@ def get_incident_events(
 def get_incident_event_image(
     slug: str,
     id: str,
+    thumbnail: bool = False,
+    range_header: Annotated[str | None, Header(alias="range")] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """
-    Returns only the image content and mimetype when an event contains an image
+    Returns the raw image content of an event that contains an image
+
+    Images never change once stored, so responses carry a strong ETag and may
+    be cached indefinitely. Single byte ranges are supported. Setting
+    thumbnail returns a small PNG version of the image instead.
     """
 
+    event = EventLogHandler.read_one(id=id, incident_slug=slug)
+
+    if not event or not event.image_ref:
+        raise HTTPException(status_code=404, detail="image not found")
+
+    store = get_blob_store()
+    key = event.image_ref
+    media_type = event.mimetype or "application/octet-stream"
+
     try:
-        event = EventLogHandler.read_one(id=id, incident_slug=slug)
+        if thumbnail:
+            key = get_thumbnail(store, key)
+            media_type = "image/png"
+
+        size = store.size(key)
+    except BlobNotFoundError:
+        raise HTTPException(status_code=404, detail="image not found")
+    except ConfigurationError as error:
+        raise HTTPException(status_code=501, detail=str(error))
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": f'"{key}"',
+    }
 
+    if if_none_match and headers["ETag"] in (
+        tag.strip() for tag in if_none_match.split(",")
+    ):
         return Response(
-            content=base64.b64encode(event.image).decode("utf-8"),
-            media_type=event.mimetype,
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
         )
-    except NoResultFound:
-        raise HTTPException(status_code=404, detail="incident not found")
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=str(error))
+
+    start, end = 0, size - 1
+    status_code = status.HTTP_200_OK
+
+    if range_header:
+        try:
+            requested = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+
+        if requested:
+            start, end = requested
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        store.iter(key, start, end) if size else iter(()),
+        headers=headers,
+        media_type=media_type,
+        status_code=status_code,
+    )
 
 
 @router.delete(
@@ -472,13 +685,21 @@ async def get_incident_config(
     try:
         match parameter:
             case "users":
-                record = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).one()
-
-                return ConfigurationResponse(data=record.json_data)
+                users = session.exec(
+                    select(SlackUser).order_by(SlackUser.name)
+                ).all()
+
+                return ConfigurationResponse(
+                    data=[
+                        {
+                            "name": user.name,
+                            "real_name": user.real_name,
+                            "email": user.email,
+                            "id": user.id,
+                        }
+                        for user in users
+                    ]
+                )
             case _:
                 raise HTTPException(status_code=404, detail="not found")
     except Exception as error:
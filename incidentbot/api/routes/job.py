@@ -7,6 +7,8 @@ from incidentbot.scheduler.core import (
     scrape_for_aging_incidents,
 )
 from incidentbot.slack.client import (
+    load_slack_usergroup_directory,
+    save_cache_snapshot,
     store_slack_channel_list_db,
     store_slack_user_list_db,
 )
@@ -16,10 +18,12 @@ router = APIRouter()
 
 protected_jobs = [
     "scrape_for_aging_incidents",
+    "update_cache_snapshot",
     "update_opsgenie_oc_data",
     "update_pagerduty_oc_data",
     "update_slack_channel_list",
     "update_slack_user_list",
+    "update_slack_usergroups",
 ]
 
 
@@ -56,6 +60,11 @@ async def run_job(job_id) -> SuccessResponse:
                 scrape_for_aging_incidents()
             except Exception as error:
                 raise HTTPException(status_code=500, detail=str(error))
+        case "update_cache_snapshot":
+            try:
+                save_cache_snapshot()
+            except Exception as error:
+                raise HTTPException(status_code=500, detail=str(error))
         case "update_opsgenie_oc_data":
             if (
                 settings.integrations
@@ -104,6 +113,11 @@ async def run_job(job_id) -> SuccessResponse:
                 store_slack_user_list_db()
             except Exception as error:
                 raise HTTPException(status_code=500, detail=str(error))
+        case "update_slack_usergroups":
+            try:
+                load_slack_usergroup_directory(refresh=True)
+            except Exception as error:
+                raise HTTPException(status_code=500, detail=str(error))
         case _:
             raise HTTPException(
                 status_code=500, detail=f"{job_id} is not a valid option"
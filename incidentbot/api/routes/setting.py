@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from incidentbot.api.deps import get_current_active_superuser, SessionDep
 from incidentbot.models.database import ApplicationData
-from incidentbot.slack.client import slack_workspace_id
+from incidentbot.slack.client import (
+    get_slack_user_list_db,
+    get_workspace_id,
+)
 from sqlalchemy.exc import NoResultFound
 from sqlmodel import select
 
@@ -31,16 +34,12 @@ def get_settings(session: SessionDep) -> list[ApplicationData]:
 def get_setting(session: SessionDep, setting_name: str) -> ApplicationData:
     match setting_name:
         case "slack_users":
-            data = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
-                )
-            ).first()
-
-            return ApplicationData(name="slack_users", value=data.json_data)
+            return ApplicationData(
+                name="slack_users", value=get_slack_user_list_db()
+            )
         case "slack_workspace_id":
             return ApplicationData(
-                name="slack_workspace_id", value=[slack_workspace_id]
+                name="slack_workspace_id", value=[get_workspace_id()]
             )
         case _:
             try:
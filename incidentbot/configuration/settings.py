@@ -1,6 +1,8 @@
+import importlib.util
 import os
 import secrets
 
+from incidentbot.exceptions import ConfigurationError
 from pydantic import (
     AnyUrl,
     BaseModel,
@@ -100,7 +102,9 @@ class Options(BaseModel):
     """
 
     additional_welcome_messages: list[AdditionalWelcomeMessage] | None = None
+    async_runtime: bool = False
     auto_invite_groups: list[GroupAutoInvite] | None = None
+    cache_snapshot_path: str | None = None
     channel_name_prefix: str | None = "inc"
     channel_name_date_format: str | None = "YYYY-MM-DD"
     channel_name_use_date_prefix: bool | None = False
@@ -251,6 +255,45 @@ class StatusDefinition(BaseModel):
     final: bool | None = False
 
 
+class BlobStore(BaseModel):
+    """
+    Model for the blob_store field, where pinned images are kept
+
+    backend is local or s3. For local, path is the directory to store blobs
+    in and must be absolute, on a volume that outlives the container and is
+    shared with the migrations job. For s3, bucket is required, path is an
+    optional key prefix and boto3 must be installed, e.g. with the s3 extra.
+    """
+
+    backend: str = "local"
+    bucket: str | None = None
+    endpoint_url: str | None = None
+    path: str | None = None
+
+    @model_validator(mode="after")
+    def _check_backend(self) -> Self:
+        if self.backend == "local" and not (
+            self.path and os.path.isabs(self.path)
+        ):
+            raise ValueError(
+                "blob_store.path must be an absolute path for the local backend."
+            )
+
+        if self.backend == "s3":
+            if not self.bucket:
+                raise ValueError(
+                    "blob_store.bucket is required for the s3 backend."
+                )
+
+            if importlib.util.find_spec("boto3") is None:
+                raise ConfigurationError(
+                    "boto3 must be installed to use the s3 blob store backend, "
+                    + "e.g. with the s3 extra"
+                )
+
+        return self
+
+
 class Settings(BaseSettings):
     """
     Root settings model
@@ -261,6 +304,7 @@ class Settings(BaseSettings):
     """
 
     api: API | None = API()
+    blob_store: BlobStore | None = None
     digest_channel: str = "incidents"
     emails_enabled: bool = False
     enable_pinned_images: bool = True
@@ -4,6 +4,7 @@ import uuid
 from incidentbot.configuration.settings import settings
 from incidentbot.confluence.api import ConfluenceApi
 from incidentbot.exceptions import PostmortemException
+from incidentbot.incident.event import EventLogHandler
 from incidentbot.models.database import (
     IncidentEvent,
     IncidentParticipant,
@@ -174,18 +175,19 @@ class IncidentPostmortem:
         base = f'<table data-table-width="760" data-layout="default" ac:local-id="{str(uuid.uuid4())}"><tbody><tr><th><p><strong>Timestamp</strong></p></th><th><p><strong>Event</strong></p></th></tr>'
         all_items_formatted = ""
         for item in self.timeline:
-            if item.image is not None:
+            if item.image_ref is not None:
                 try:
-                    # Attach content to document
-                    self.exec.attach_content(
-                        comment=item.title,
-                        content=item.image,
-                        content_type=item.mimetype,
-                        name=item.title,
-                        page_id=created_page_id,
-                        space=settings.integrations.atlassian.confluence.space,
-                        title=item.title,
-                    )
+                    # Attach content to document one image at a time
+                    with EventLogHandler.open_image(item) as image:
+                        self.exec.attach_content(
+                            comment=item.title,
+                            content=image,
+                            content_type=item.mimetype,
+                            name=item.title,
+                            page_id=created_page_id,
+                            space=settings.integrations.atlassian.confluence.space,
+                            title=item.title,
+                        )
                 except Exception as error:
                     logger.error(
                         f"Error attaching file {item.title} to postmortem: {error}"
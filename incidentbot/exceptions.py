@@ -1,3 +1,16 @@
+class BlobNotFoundError(Exception):
+    """
+    Exception raised for a blob that is not in the blob store
+
+    Parameters:
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
 class ConfigurationError(Exception):
     """
     Exception raised for errors in a config object
@@ -35,3 +48,42 @@ class PostmortemException(Exception):
     def __init__(self, message: str) -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class SnapshotError(Exception):
+    """
+    Exception raised for a snapshot that cannot be read or written
+
+    Parameters:
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class StepFailedError(Exception):
+    """
+    Exception raised when a required step of a StepRunner fails
+
+    Parameters:
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnitOfWorkError(Exception):
+    """
+    Exception raised when updates queued in a unit of work can't be written
+
+    Parameters:
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
@@ -1,21 +1,22 @@
+import asyncio
 import datetime
+import os
 
 from incidentbot.configuration.settings import settings
 from incidentbot.exceptions import IndexNotFoundError
 from incidentbot.incident.core import format_channel_name
 from incidentbot.incident.event import EventLogHandler
+from incidentbot.incident.updates import channel_updates
 from incidentbot.scheduler.core import process as TaskScheduler
 from incidentbot.logging import logger
 from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.slack import User
 from incidentbot.slack.client import (
-    get_digest_channel_id,
-    get_formatted_channel_history,
-    slack_web_client,
+    slack_async_api,
+    write_formatted_channel_history,
 )
 from incidentbot.slack.messages import (
     BlockBuilder,
-    IncidentChannelDigestNotification,
     IncidentUpdate,
 )
 from incidentbot.util import gen
@@ -38,12 +39,14 @@ async def archive_incident_channel(
         channel_id (str): Incident channel_id
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     if incident:
         try:
             logger.info(f"Archiving {incident.channel_name}.")
-            result = slack_web_client.conversations_archive(
+            result = await slack_async_api.conversations_archive(
                 channel=incident.channel_id
             )
             logger.debug(result)
@@ -51,14 +54,15 @@ async def archive_incident_channel(
             logger.error(f"Error archiving {incident.channel_name}: {error}")
         finally:
             # Write event log
-            EventLogHandler.create(
+            await asyncio.to_thread(
+                EventLogHandler.create,
                 event="The incident channel was archived",
                 incident_id=incident.id,
                 incident_slug=incident.slug,
                 source="system",
             )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -73,19 +77,22 @@ async def export_chat_logs(channel_id: str, user: str):
         user (str): The user who exported the logs
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     if incident:
         # Retrieve channel history and post as text attachment
-        history = get_formatted_channel_history(
+        transcript = await asyncio.to_thread(
+            write_formatted_channel_history,
             channel_id=incident.channel_id,
             channel_name=incident.channel_name,
         )
         try:
             logger.info(f"Sending chat transcript to {incident.channel_name}.")
-            result = slack_web_client.files_upload_v2(
+            result = await slack_async_api.files_upload_v2(
                 channel=incident.channel_id,
-                content=history,
+                file=transcript,
                 filename=f"{incident.channel_name} Chat Transcript.txt",
                 initial_comment="As requested, here is the chat transcript. Remember"
                 + " - while this is useful, it will likely need cultivation before "
@@ -98,15 +105,18 @@ async def export_chat_logs(channel_id: str, user: str):
                 f"Error sending message and attachment to {incident.channel_name}: {error}"
             )
         finally:
+            os.remove(transcript)
+
             # Write event log
-            EventLogHandler.create(
+            await asyncio.to_thread(
+                EventLogHandler.create,
                 event=f"Incident channel text log was exported by {user}",
                 incident_id=incident.id,
                 incident_slug=incident.slug,
                 source="system",
             )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -124,7 +134,9 @@ async def join_incident_as_role(
         user (incidentbot.models.slack.User): User object from the Slack response
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     # Verify the role is valid
     try:
@@ -137,12 +149,13 @@ async def join_incident_as_role(
         role_normalized = role.replace("_", " ").title()
 
         # Check whether or not the user has already claimed the role
-        assigned = IncidentDatabaseInterface.check_role_assigned_to_user(
+        assigned = await asyncio.to_thread(
+            IncidentDatabaseInterface.check_role_assigned_to_user,
             incident=incident, role=role, user=user
         )
         if assigned:
             try:
-                slack_web_client.chat_postEphemeral(
+                await slack_async_api.chat_postEphemeral(
                     channel=channel_id,
                     user=user.id,
                     text=f"You have already joined this incident as *{role_normalized}*.",
@@ -156,7 +169,7 @@ async def join_incident_as_role(
 
         # Send update notification message to incident channel
         try:
-            result = slack_web_client.chat_postMessage(
+            result = await slack_async_api.chat_postMessage(
                 **IncidentUpdate.role(
                     action="joined",
                     channel=incident.channel_id,
@@ -173,7 +186,7 @@ async def join_incident_as_role(
 
         # Provide the user with information regarding the role
         try:
-            slack_web_client.chat_postEphemeral(
+            await slack_async_api.chat_postEphemeral(
                 channel=channel_id,
                 user=user.id,
                 text="You have joined this incident as {}. {}".format(
@@ -186,51 +199,29 @@ async def join_incident_as_role(
                 f"error sending message back to user via slash command invocation: {error}"
             )
 
-        # Update topic if lead role
-        if role_definition.is_lead:
-            # Get current topic
-            try:
-                current_topic = [
-                    item.strip()
-                    for item in slack_web_client.conversations_info(
-                        channel=incident.channel_id,
-                    )
-                    .get("channel")
-                    .get("topic")
-                    .get("value")
-                    .split("|")
-                ]
-            except SlackApiError as error:
-                logger.error(f"error getting channel info: {error}")
-
-            # Update topic
-            # Severity is always index 0
-            # Status is always index 1
-            try:
-                slack_web_client.conversations_setTopic(
-                    channel=incident.channel_id,
-                    topic=f"{current_topic[0]} | {current_topic[1]} | {role_normalized}: <@{user.id}>",
-                )
-            except SlackApiError as error:
-                logger.error(f"Error setting incident channel topic: {error}")
-
         # Create record
-        IncidentDatabaseInterface.associate_role(
+        await asyncio.to_thread(
+            IncidentDatabaseInterface.associate_role,
             incident=incident,
             is_lead=role_definition.is_lead,
             role=role,
             user=user,
         )
 
+        # Update topic if lead role
+        if role_definition.is_lead:
+            channel_updates.request(incident.channel_id, "topic")
+
         # Write event log
-        EventLogHandler.create(
+        await asyncio.to_thread(
+            EventLogHandler.create,
             event=f"{user.name} joined the incident as {role_normalized}",
             incident_id=incident.id,
             incident_slug=incident.slug,
             source="system",
         )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -248,7 +239,9 @@ async def leave_incident_as_role(
         user (incidentbot.models.slack.User): User object from the Slack response
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     # Verify the role is valid
     try:
@@ -261,7 +254,8 @@ async def leave_incident_as_role(
         role_normalized = role.replace("_", " ").title()
 
         # Check whether or not the user has claimed the role
-        assigned = IncidentDatabaseInterface.check_role_assigned_to_user(
+        assigned = await asyncio.to_thread(
+            IncidentDatabaseInterface.check_role_assigned_to_user,
             incident=incident, role=role, user=user
         )
         if assigned:
@@ -272,7 +266,7 @@ async def leave_incident_as_role(
 
         # Send update notification message to incident channel
         try:
-            result = slack_web_client.chat_postMessage(
+            result = await slack_async_api.chat_postMessage(
                 **IncidentUpdate.role(
                     action="left",
                     channel=incident.channel_id,
@@ -289,7 +283,7 @@ async def leave_incident_as_role(
 
         # Notify the user
         try:
-            slack_web_client.chat_postEphemeral(
+            await slack_async_api.chat_postEphemeral(
                 channel=channel_id,
                 user=user.id,
                 text="You are no longer {}.".format(
@@ -301,50 +295,28 @@ async def leave_incident_as_role(
                 f"error sending message back to user via slash command invocation: {error}"
             )
 
-        # Update topic if lead role
-        if role_definition.is_lead:
-            # Get current topic
-            try:
-                current_topic = [
-                    item.strip()
-                    for item in slack_web_client.conversations_info(
-                        channel=incident.channel_id,
-                    )
-                    .get("channel")
-                    .get("topic")
-                    .get("value")
-                    .split("|")
-                ]
-            except SlackApiError as error:
-                logger.error(f"error getting channel info: {error}")
-
-            # Update topic
-            # Severity is always index 0
-            # Status is always index 1
-            try:
-                slack_web_client.conversations_setTopic(
-                    channel=incident.channel_id,
-                    topic=f"{current_topic[0]} | {current_topic[1]}",
-                )
-            except SlackApiError as error:
-                logger.error(f"Error setting incident channel topic: {error}")
-
         # Delete record
-        IncidentDatabaseInterface.remove_role(
+        await asyncio.to_thread(
+            IncidentDatabaseInterface.remove_role,
             incident=incident,
             role=role,
             user=user,
         )
 
+        # Update topic if lead role
+        if role_definition.is_lead:
+            channel_updates.request(incident.channel_id, "topic")
+
         # Write event log
-        EventLogHandler.create(
+        await asyncio.to_thread(
+            EventLogHandler.create,
             event=f"{user.name} left the incident as {role_normalized}",
             incident_id=incident.id,
             incident_slug=incident.slug,
             source="system",
         )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -357,35 +329,13 @@ async def set_description(channel_id: str, description: str, user: str = None):
         description (str): The description value
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     if incident:
-        # Update digest message
-        try:
-            slack_web_client.chat_update(
-                channel=get_digest_channel_id(),
-                ts=incident.digest_message_ts,
-                blocks=IncidentChannelDigestNotification.update(
-                    channel_id=incident.channel_id,
-                    has_private_channel=incident.has_private_channel,
-                    incident_components=incident.components,
-                    incident_description=description,
-                    incident_impact=incident.impact,
-                    incident_slug=incident.slug,
-                    meeting_link=incident.meeting_link,
-                    severity=incident.severity,
-                    status=incident.status,
-                ),
-                text="Digest message has been updated.",
-            )
-        except SlackApiError as error:
-            logger.error(
-                f"Error during description update for incident channel {incident.channel_name}: {error}"
-            )
-            return
-
         # Update boilerplate message
-        result = slack_web_client.conversations_history(
+        result = await slack_async_api.conversations_history(
             channel=incident.channel_id,
             inclusive=True,
             oldest=incident.boilerplate_message_ts,
@@ -404,7 +354,7 @@ async def set_description(channel_id: str, description: str, user: str = None):
             "text"
         ] = f":mag_right: *Description:* {description}"
 
-        slack_web_client.chat_update(
+        await slack_async_api.chat_update(
             channel=incident.channel_id,
             ts=incident.boilerplate_message_ts,
             blocks=blocks,
@@ -415,7 +365,7 @@ async def set_description(channel_id: str, description: str, user: str = None):
         notification_suffix = (
             f"{description} by {user}" if user else f"{description}"
         )
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=f"The description of this incident has been updated to {notification_suffix}.",
         )
@@ -427,7 +377,7 @@ async def set_description(channel_id: str, description: str, user: str = None):
             useDatePrefix=settings.options.channel_name_use_date_prefix
         )
         try:
-            slack_web_client.conversations_rename(
+            await slack_async_api.conversations_rename(
                 channel=channel_id, name=new_channel_name
             )
         except SlackApiError as error:
@@ -437,12 +387,14 @@ async def set_description(channel_id: str, description: str, user: str = None):
 
         # Update database record
         try:
-            IncidentDatabaseInterface.update_col(
+            await asyncio.to_thread(
+                IncidentDatabaseInterface.update_col,
                 channel_id=incident.channel_id,
                 col_name="channel_name",
                 value=new_channel_name,
             )
-            IncidentDatabaseInterface.update_col(
+            await asyncio.to_thread(
+                IncidentDatabaseInterface.update_col,
                 channel_id=incident.channel_id,
                 col_name="description",
                 value=description,
@@ -450,8 +402,12 @@ async def set_description(channel_id: str, description: str, user: str = None):
         except Exception as error:
             logger.fatal(f"Error updating entry in database: {error}")
 
+        # Update digest message
+        channel_updates.request(incident.channel_id, "digest")
+
         # Write event log
-        EventLogHandler.create(
+        await asyncio.to_thread(
+            EventLogHandler.create,
             event=f"The incident description was updated to {notification_suffix}",
             incident_id=incident.id,
             incident_slug=incident.slug,
@@ -462,7 +418,7 @@ async def set_description(channel_id: str, description: str, user: str = None):
             f"Updated incident description for {incident.channel_name}."
         )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -476,14 +432,16 @@ async def set_severity(channel_id: str, severity: str, user: User | str):
         user (incidentbot.models.slack.User | str): User object from the Slack response, or api
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     if incident:
         if user != "api":
             # Check to see if the severity is already set to that value
             if incident.severity == severity:
                 try:
-                    slack_web_client.chat_postEphemeral(
+                    await slack_async_api.chat_postEphemeral(
                         channel=channel_id,
                         user=user.id,
                         text=f"The severity for this incident is already {severity.upper()}.",
@@ -495,32 +453,9 @@ async def set_severity(channel_id: str, severity: str, user: User | str):
                         f"error sending message back to user via slash command invocation: {error}"
                     )
 
-        # Update digest message
-        try:
-            slack_web_client.chat_update(
-                channel=get_digest_channel_id(),
-                ts=incident.digest_message_ts,
-                blocks=IncidentChannelDigestNotification.update(
-                    channel_id=incident.channel_id,
-                    has_private_channel=incident.has_private_channel,
-                    incident_components=incident.components,
-                    incident_description=incident.description,
-                    incident_impact=incident.impact,
-                    incident_slug=incident.slug,
-                    meeting_link=incident.meeting_link,
-                    severity=severity,
-                    status=incident.status,
-                ),
-                text="Digest message has been updated.",
-            )
-        except SlackApiError as error:
-            logger.error(
-                f"Error sending severity update to incident channel {incident.channel_name}: {error}"
-            )
-
         # Channel notification
         try:
-            result = slack_web_client.chat_postMessage(
+            result = await slack_async_api.chat_postMessage(
                 **IncidentUpdate.severity(
                     channel=incident.channel_id, severity=severity
                 ),
@@ -532,37 +467,6 @@ async def set_severity(channel_id: str, severity: str, user: User | str):
                 f"Error sending severity update to incident channel {incident.channel_name}: {error}"
             )
 
-        # Get current topic
-        try:
-            current_topic = [
-                item.strip()
-                for item in slack_web_client.conversations_info(
-                    channel=incident.channel_id,
-                )
-                .get("channel")
-                .get("topic")
-                .get("value")
-                .split("|")
-            ]
-        except SlackApiError as error:
-            logger.error(f"error getting channel info: {error}")
-
-        # Update topic
-        # Severity is always index 0
-        # Status is always index 1
-        # If commander is assigned, it's always index 2
-        new_topic = f"Severity: {severity.upper()} | {current_topic[1]}"
-        if len(current_topic) == 3:
-            new_topic += f" | {current_topic[2]}"
-
-        try:
-            slack_web_client.conversations_setTopic(
-                channel=incident.channel_id,
-                topic=new_topic,
-            )
-        except SlackApiError as error:
-            logger.error(f"Error setting incident channel topic: {error}")
-
         # Log
         logger.info(
             f"Updated incident severity for {incident.channel_name} to {severity}"
@@ -570,7 +474,8 @@ async def set_severity(channel_id: str, severity: str, user: User | str):
 
         # Update incident record with new severity
         try:
-            IncidentDatabaseInterface.update_col(
+            await asyncio.to_thread(
+                IncidentDatabaseInterface.update_col,
                 channel_id=incident.channel_id,
                 col_name="severity",
                 value=severity,
@@ -578,15 +483,19 @@ async def set_severity(channel_id: str, severity: str, user: User | str):
         except Exception as error:
             logger.fatal(f"Error updating entry in database: {error}")
 
+        # Update digest message and topic
+        channel_updates.request(incident.channel_id, "digest", "topic")
+
         # Write event log
-        EventLogHandler.create(
+        await asyncio.to_thread(
+            EventLogHandler.create,
             event=f"The incident severity was changed to {severity.upper()}",
             incident_id=incident.id,
             incident_slug=incident.slug,
             source="system",
         )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -604,14 +513,16 @@ async def set_status(
         user (incidentbot.models.slack.User | str): User object from the Slack response, or api
     """
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = await asyncio.to_thread(
+        IncidentDatabaseInterface.get_by_channel_id, channel_id
+    )
 
     if incident:
         if user != "api":
             # Check to see if the status is already set to that value
             if incident.status == status:
                 try:
-                    slack_web_client.chat_postEphemeral(
+                    await slack_async_api.chat_postEphemeral(
                         channel=channel_id,
                         user=user.id,
                         text=f"The status for this incident is already {status.title()}.",
@@ -634,7 +545,8 @@ async def set_status(
             ][0]
         ):
             # First, make sure a postmortem doesn't already exist
-            if not IncidentDatabaseInterface.get_postmortem(
+            if not await asyncio.to_thread(
+                IncidentDatabaseInterface.get_postmortem,
                 parent=incident.id,
             ):
                 # Generate postmortem template and create postmortem if enabled
@@ -652,22 +564,29 @@ async def set_status(
 
                     postmortem = IncidentPostmortem(
                         incident=incident,
-                        participants=IncidentDatabaseInterface.list_participants(
-                            incident=incident
+                        participants=await asyncio.to_thread(
+                            IncidentDatabaseInterface.list_participants,
+                            incident=incident,
+                        ),
+                        timeline=await asyncio.to_thread(
+                            EventLogHandler.read, incident_id=incident.id
                         ),
-                        timeline=EventLogHandler.read(incident_id=incident.id),
                         title=f"{datetime.datetime.today().strftime('%Y-%m-%d')} - {incident.slug.upper()} - {incident.description}",
                     )
-                    postmortem_link = postmortem.create()
+                    postmortem_link = await asyncio.to_thread(
+                        postmortem.create
+                    )
 
                     if postmortem_link:
                         # Create record
-                        IncidentDatabaseInterface.add_postmortem(
+                        await asyncio.to_thread(
+                            IncidentDatabaseInterface.add_postmortem,
                             parent=incident.id, url=postmortem_link
                         )
 
                         # Write event log
-                        EventLogHandler.create(
+                        await asyncio.to_thread(
+                            EventLogHandler.create,
                             event="Postmortem generated",
                             incident_id=incident.id,
                             incident_slug=incident.slug,
@@ -714,12 +633,12 @@ async def set_status(
 
                         # Send postmortem message to incident channel
                         try:
-                            result = slack_web_client.chat_postMessage(
+                            result = await slack_async_api.chat_postMessage(
                                 channel=incident.channel_id,
                                 blocks=postmortem_boilerplate_message_blocks,
                                 text=postmortem_link,
                             )
-                            slack_web_client.pins_add(
+                            await slack_async_api.pins_add(
                                 channel=incident.channel_id,
                                 timestamp=result.get("ts"),
                             )
@@ -738,76 +657,22 @@ async def set_status(
 
                 pagerduty_interface = PagerDutyInterface()
 
-                if IncidentDatabaseInterface.list_pagerduty_incident_records(
-                    id=incident.id
-                ):
-                    for (
-                        inc
-                    ) in IncidentDatabaseInterface.list_pagerduty_incident_records(
-                        id=incident.id
-                    ):
+                pagerduty_incidents = await asyncio.to_thread(
+                    IncidentDatabaseInterface.list_pagerduty_incident_records,
+                    id=incident.id,
+                )
+                if pagerduty_incidents:
+                    for inc in pagerduty_incidents:
                         try:
-                            pagerduty_interface.resolve(inc.url.split("/")[-1])
+                            await asyncio.to_thread(
+                                pagerduty_interface.resolve,
+                                inc.url.split("/")[-1],
+                            )
                         except Exception as error:
                             logger.error(
                                 f"Error resolving PagerDuty incident {inc.url}: {error}"
                             )
 
-        # Update digest message
-        try:
-            slack_web_client.chat_update(
-                channel=get_digest_channel_id(),
-                ts=incident.digest_message_ts,
-                blocks=IncidentChannelDigestNotification.update(
-                    channel_id=incident.channel_id,
-                    has_private_channel=incident.has_private_channel,
-                    incident_components=incident.components,
-                    incident_description=incident.description,
-                    incident_impact=incident.impact,
-                    incident_slug=incident.slug,
-                    meeting_link=incident.meeting_link,
-                    severity=incident.severity,
-                    status=status,
-                    postmortem_link=postmortem_link,
-                ),
-                text="The digest message has been updated.",
-            )
-        except SlackApiError as error:
-            logger.error(
-                f"Error sending status update to incident channel {incident.channel_name}: {error}"
-            )
-
-        # Get current topic
-        try:
-            current_topic = [
-                item.strip()
-                for item in slack_web_client.conversations_info(
-                    channel=incident.channel_id,
-                )
-                .get("channel")
-                .get("topic")
-                .get("value")
-                .split("|")
-            ]
-        except SlackApiError as error:
-            logger.error(f"error getting channel info: {error}")
-
-        # Update topic
-        # Severity is always index 0
-        # Status is always index 1
-        # If commander is assigned, it's always index 2
-        new_topic = f"{current_topic[0]} | Status: {status.title()}"
-        if len(current_topic) == 3:
-            new_topic += f" | {current_topic[2]}"
-
-        try:
-            slack_web_client.conversations_setTopic(
-                channel=incident.channel_id,
-                topic=new_topic,
-            )
-        except SlackApiError as error:
-            logger.error(f"Error setting incident channel topic: {error}")
-
         # Log
         logger.info(
             f"Updated incident status for {incident.channel_name} to {status}"
@@ -815,7 +680,7 @@ async def set_status(
 
         # Channel notification
         try:
-            result = slack_web_client.chat_postMessage(
+            result = await slack_async_api.chat_postMessage(
                 **IncidentUpdate.status(
                     channel=incident.channel_id, status=status
                 ),
@@ -838,14 +703,16 @@ async def set_status(
             from incidentbot.jira.api import JiraApi
 
             jira = JiraApi()
-            jira.update_issue_status(
+            await asyncio.to_thread(
+                jira.update_issue_status,
                 incident_name=incident.channel_name,
                 incident_status=status,
             )
 
         # Update incident record with new status
         try:
-            IncidentDatabaseInterface.update_col(
+            await asyncio.to_thread(
+                IncidentDatabaseInterface.update_col,
                 channel_id=incident.channel_id,
                 col_name="status",
                 value=status,
@@ -853,8 +720,12 @@ async def set_status(
         except Exception as error:
             logger.fatal(f"Error updating entry in database: {error}")
 
+        # Update digest message and topic
+        channel_updates.request(incident.channel_id, "digest", "topic")
+
         # Write event log
-        EventLogHandler.create(
+        await asyncio.to_thread(
+            EventLogHandler.create,
             event=f"The incident status was changed to {status}",
             incident_id=incident.id,
             incident_slug=incident.slug,
@@ -871,11 +742,14 @@ async def set_status(
         ):
             # Remove comms reminder job if it exists
             try:
-                job = TaskScheduler.get_job(
-                    job_id=f"{incident.slug}_comms_reminder"
+                job = await asyncio.to_thread(
+                    TaskScheduler.get_job,
+                    job_id=f"{incident.slug}_comms_reminder",
                 )
                 if job:
-                    TaskScheduler.delete_job(job_to_delete=job.id)
+                    await asyncio.to_thread(
+                        TaskScheduler.delete_job, job_to_delete=job.id
+                    )
             except Exception as error:
                 logger.error(
                     f"error removing job {incident.slug}_comms_reminder: {error}"
@@ -883,11 +757,14 @@ async def set_status(
 
             # Remove role watcher job if it exists
             try:
-                job = TaskScheduler.get_job(
-                    job_id=f"{incident.slug}_role_watcher"
+                job = await asyncio.to_thread(
+                    TaskScheduler.get_job,
+                    job_id=f"{incident.slug}_role_watcher",
                 )
                 if job:
-                    TaskScheduler.delete_job(job_to_delete=job.id)
+                    await asyncio.to_thread(
+                        TaskScheduler.delete_job, job_to_delete=job.id
+                    )
             except Exception as error:
                 logger.error(
                     f"error removing job {incident.slug}_role_watcher: {error}"
@@ -895,7 +772,7 @@ async def set_status(
 
             # Resolution message
             try:
-                result = slack_web_client.chat_postMessage(
+                result = await slack_async_api.chat_postMessage(
                     **BlockBuilder.resolution_message(
                         channel=incident.channel_id
                     ),
@@ -907,7 +784,7 @@ async def set_status(
                     f"Error sending resolution update to incident channel {incident.channel_name}: {error}"
                 )
     else:
-        slack_web_client.chat_postMessage(
+        await slack_async_api.chat_postMessage(
             channel=channel_id,
             text=err_msg,
         )
@@ -1,13 +1,21 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 import asyncio
 import re
 import slack_sdk.errors
+import threading
 
 from incidentbot.configuration.settings import settings
 from incidentbot.incident.event import EventLogHandler
+from incidentbot.incident.updates import channel_updates, render_topic
 from incidentbot.incident.util import comms_reminder, role_watcher
 from incidentbot.logging import logger
-from incidentbot.models.database import IncidentRecord, engine
+from incidentbot.models.database import (
+    IncidentRecord,
+    JiraIssueRecord,
+    engine,
+)
 from incidentbot.models.pager import read_pager_auto_page_targets
 from incidentbot.scheduler.core import (
     process as TaskScheduler,
@@ -17,20 +25,57 @@ from incidentbot.slack.messages import (
     IncidentChannelDigestNotification,
 )
 from incidentbot.statuspage.slack import return_new_statuspage_incident_message
+from incidentbot.util.dag import Step, StepRunner
 from incidentbot.zoom.meeting import ZoomMeeting
 from pydantic import BaseModel
 from sqlmodel import Session, select
+from typing import Any, Callable
 
 if not settings.IS_TEST_ENVIRONMENT:
     from incidentbot.scheduler.core import process as TaskScheduler
-    from incidentbot.slack.client import invite_user_to_channel
     from incidentbot.slack.client import (
-        all_workspace_groups,
+        invite_user_to_channel,
+        invite_users_to_channel,
+    )
+    from incidentbot.slack.client import (
         get_slack_user,
+        get_usergroup_members,
+        get_workspace_id,
         slack_web_client,
-        slack_workspace_id,
     )
 
+# Maximum number of calls to each integration made at once when setting up
+# the optional features of a new incident
+integration_concurrency = {"jira": 2, "pagerduty": 4, "slack": 8}
+
+# Seconds to wait for a single optional feature before leaving it to finish
+# in the background
+integration_timeout = 30
+
+_integration_executors: dict[str, ThreadPoolExecutor] = {}
+_integration_executors_lock = threading.Lock()
+
+
+def integration_executor(integration: str) -> ThreadPoolExecutor:
+    """
+    Return the thread pool calls to an integration are made in
+
+    Each pool has integration_concurrency workers, so the limit holds for as
+    long as a call runs, even past integration_timeout, and across incidents.
+
+    Parameters:
+        integration (str): Key of integration_concurrency
+    """
+
+    with _integration_executors_lock:
+        if integration not in _integration_executors:
+            _integration_executors[integration] = ThreadPoolExecutor(
+                max_workers=integration_concurrency[integration],
+                thread_name_prefix=f"incidentbot-{integration}",
+            )
+
+        return _integration_executors[integration]
+
 
 def format_channel_name(id: int,
                         description: str,
@@ -137,6 +182,150 @@ class Incident:
                 else None
             )
 
+    def creation_steps(
+        self, channel_name: str, private: bool, record: IncidentRecord
+    ) -> list[Step]:
+        """
+        Return the steps that set up the Slack side of a new incident
+
+        Steps only declare what they need, so e.g. the topic, welcome
+        message and bookmark all go out as soon as the channel exists.
+        Only creating the channel is required for the incident to be started.
+
+        Parameters:
+            channel_name (str): Name of the incident channel
+            private (bool): Whether or not the channel should be private
+            record (IncidentRecord): Unsaved copy of the incident record,
+                filled in as steps complete
+        """
+
+        def create_channel(results: dict[str, Any]) -> dict:
+            channel = self.create_channel(
+                channel_name=channel_name, private=private
+            )
+            if not channel:
+                raise RuntimeError(f"could not create channel {channel_name}")
+
+            return channel
+
+        def meeting_link(results: dict[str, Any]) -> str | None:
+            return self.generate_meeting_link(channel_name=channel_name)
+
+        def digest(results: dict[str, Any]) -> str:
+            logger.info(
+                f"Sending message to digest channel for: {channel_name}"
+            )
+
+            return slack_web_client.chat_postMessage(
+                **IncidentChannelDigestNotification.create(
+                    channel_id=results["channel"]["id"],
+                    has_private_channel=private,
+                    incident_components=record.components,
+                    incident_description=record.description,
+                    incident_impact=record.impact,
+                    incident_slug=record.slug,
+                    initial_status=record.status,
+                    meeting_link=results.get("meeting_link"),
+                    severity=record.severity,
+                ),
+                text="A new incident has been declared!",
+            ).get("ts")
+
+        def topic(results: dict[str, Any]):
+            slack_web_client.conversations_setTopic(
+                channel=results["channel"]["id"],
+                topic=render_topic(record),
+            )
+
+        def boilerplate(results: dict[str, Any]) -> str:
+            record.channel_id = results["channel"]["id"]
+
+            return slack_web_client.chat_postMessage(
+                **BlockBuilder.boilerplate_message(
+                    incident=record,
+                ),
+                text="Incident details have been posted to an incident channel.",
+            ).get("ts")
+
+        def welcome(results: dict[str, Any]):
+            slack_web_client.chat_postMessage(
+                channel=results["channel"]["id"],
+                blocks=BlockBuilder.welcome_message(),
+                text="Welcome Message",
+            )
+
+        def bookmark(results: dict[str, Any]):
+            link = results["meeting_link"]
+            if not link:
+                return
+
+            # Try to sort out the meeting link provider
+            meeting_link_provider = "Audio"
+            if "zoom" in link.lower():
+                meeting_link_provider = "Zoom"
+
+            slack_web_client.bookmarks_add(
+                channel_id=results["channel"]["id"],
+                emoji=settings.icons.get(settings.platform).get("meeting"),
+                title=f"{meeting_link_provider} Meeting",
+                type="link",
+                link=link,
+            )
+
+        def pin_meeting_link(results: dict[str, Any]):
+            link = results["meeting_link"]
+            if not link or not settings.options.pin_meeting_link_to_channel:
+                return
+
+            resp = slack_web_client.chat_postMessage(
+                channel=results["channel"]["id"],
+                text=f"Join the meeting here: {link}",
+            )
+            slack_web_client.pins_add(
+                channel=results["channel"]["id"],
+                timestamp=resp["ts"],
+            )
+
+        def invite_reporter(results: dict[str, Any]):
+            # Invite the user who started the incident to the channel
+            invite_user_to_channel(
+                channel_id=results["channel"]["id"], user=self.params.user
+            )
+
+        return [
+            Step("channel", create_channel),
+            Step("meeting_link", meeting_link, optional=True),
+            # Doesn't wait for the meeting link, which is added once known
+            Step("digest", digest, requires=["channel"], optional=True),
+            Step("topic", topic, requires=["channel"], optional=True),
+            Step(
+                "boilerplate",
+                boilerplate,
+                requires=["channel"],
+                optional=True,
+            ),
+            # Posted after the boilerplate to keep message order stable
+            Step("welcome", welcome, requires=["boilerplate"], optional=True),
+            Step(
+                "bookmark",
+                bookmark,
+                requires=["channel", "meeting_link"],
+                optional=True,
+            ),
+            Step(
+                "pin_meeting_link",
+                pin_meeting_link,
+                requires=["meeting_link", "welcome"],
+                optional=True,
+            ),
+            Step(
+                "invite_reporter",
+                invite_reporter,
+                requires=["channel"],
+                optional=True,
+            ),
+        ]
+
     def start(self) -> str:
         """
         Create an incident
@@ -167,171 +356,58 @@ class Incident:
                 session.refresh(record)
 
                 """
-                Create Slack channel for incident
+                Create Slack channel for incident and post to it
                 """
 
+                slug = f"{settings.options.channel_name_prefix}-{record.id}"
                 channel_name = format_channel_name(
                     id=record.id,
                     description=self.params.incident_description,
                     useDatePrefix=settings.options.channel_name_use_date_prefix
                 )
-                channel = self.create_channel(
-                    channel_name=channel_name,
-                    private=self.params.private_channel
-                    | self.params.is_security_incident,
-                )
-                meeting_link = self.generate_meeting_link(
-                    channel_name=channel_name
-                )
-
-                """
-                Update record
-                """
-
-                record.channel_id = channel.get("id")
-                record.channel_name = channel_name
-                record.has_private_channel = (
+                private = (
                     self.params.private_channel
                     or self.params.is_security_incident
                 )
-                record.link = "https://{}.slack.com/archives/{}".format(
-                    slack_workspace_id, channel.get("id")
-                )
-                record.meeting_link = meeting_link
-                record.slug = (
-                    f"{settings.options.channel_name_prefix}-{record.id}"
-                )
 
-                """
-                Notify incidents digest channel
-                """
-
-                logger.info(
-                    f"Sending message to digest channel for: {record.channel_name}"
-                )
-                try:
-                    digest_message = slack_web_client.chat_postMessage(
-                        **IncidentChannelDigestNotification.create(
-                            channel_id=record.channel_id,
-                            has_private_channel=record.has_private_channel,
-                            incident_components=record.components,
-                            incident_description=record.description,
-                            incident_impact=record.impact,
-                            incident_slug=f"{settings.options.channel_name_prefix}-{record.id}",
-                            initial_status=record.status,
-                            meeting_link=record.meeting_link,
+                runner = StepRunner(
+                    self.creation_steps(
+                        channel_name=channel_name,
+                        private=private,
+                        record=IncidentRecord(
+                            components=record.components,
+                            description=record.description,
+                            impact=record.impact,
                             severity=record.severity,
+                            slug=slug,
+                            status=record.status,
                         ),
-                        text="A new incident has been declared!",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending message to incident digest channel: {error}"
-                    )
-
-                """
-                Update record
-                """
-
-                record.digest_message_ts = digest_message.get("ts")
-
-                """
-                Set incident channel topic
-                """
-
-                try:
-                    slack_web_client.conversations_setTopic(
-                        channel=record.channel_id,
-                        topic=f"Severity: {record.severity.upper()} | Status: {record.status.title()}",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error setting incident channel topic: {error}"
                     )
+                )
+                results = runner.run()
 
-                """
-                Send boilerplate info to incident channel
-                """
-
-                try:
-                    bp_message = slack_web_client.chat_postMessage(
-                        **BlockBuilder.boilerplate_message(
-                            incident=record,
-                        ),
-                        text="Incident details have been posted to an incident channel.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending message to incident channel: {error}"
+                logger.info(
+                    f"Created incident {slug} - step timings: "
+                    + ", ".join(
+                        f"{name}={duration:.2f}s"
+                        for name, duration in runner.timings.items()
                     )
+                )
 
                 """
                 Update record
                 """
 
-                record.boilerplate_message_ts = bp_message.get("ts")
-
-                """
-                Send welcome message to incident channel
-                """
-
-                try:
-                    slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        blocks=BlockBuilder.welcome_message(),
-                        text="Welcome Message",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending welcome message to incident channel: {error}"
-                    )
-
-                """
-                Create bookmark for meeting (optional)
-                """
-
-                if record.meeting_link:
-                    try:
-                        # Try to sort out the meeting link provider
-                        meeting_link_provider = "Audio"
-                        if "zoom" in record.meeting_link.lower():
-                            meeting_link_provider = "Zoom"
-
-                        slack_web_client.bookmarks_add(
-                            channel_id=record.channel_id,
-                            emoji=settings.icons.get(settings.platform).get(
-                                "meeting"
-                            ),
-                            title=f"{meeting_link_provider} Meeting",
-                            type="link",
-                            link=record.meeting_link,
-                        )
-                    except slack_sdk.errors.SlackApiError as error:
-                        logger.error(
-                            f"Error adding meeting bookmark to channel: {error}"
-                        )
-
-                """
-                Pin meeting link to channel (optional)
-                """
-
-                if (
-                    record.meeting_link
-                    and settings.options.pin_meeting_link_to_channel
-                ):
-                    try:
-                        resp = slack_web_client.chat_postMessage(
-                            channel=record.channel_id,
-                            text=f"Join the meeting here: {record.meeting_link}",
-                        )
-                        slack_web_client.pins_add(
-                            channel=record.channel_id,
-                            timestamp=resp["ts"],
-                        )
-                    except slack_sdk.errors.SlackApiError as error:
-                        logger.error(
-                            f"Error pinning meeting link to channel: {error}"
-                        )
+                record.boilerplate_message_ts = results.get("boilerplate")
+                record.channel_id = results["channel"].get("id")
+                record.channel_name = channel_name
+                record.digest_message_ts = results.get("digest")
+                record.has_private_channel = private
+                record.link = "https://{}.slack.com/archives/{}".format(
+                    get_workspace_id(), record.channel_id
+                )
+                record.meeting_link = results.get("meeting_link")
+                record.slug = slug
 
                 """
                 Database commit
@@ -340,6 +416,15 @@ class Incident:
                 session.add(record)
                 session.commit()
 
+                # The digest may have gone out before the meeting link was
+                # ready, so bring it up to date
+                if (
+                    record.digest_message_ts
+                    and record.meeting_link
+                    and not private
+                ):
+                    channel_updates.request(record.channel_id, "digest")
+
                 """
                 Run additional features
                 """
@@ -348,11 +433,6 @@ class Incident:
                     self.handle_incident_optional_features(id=record.id)
                 )
 
-                # Invite the user who started the incident to the channel
-                invite_user_to_channel(
-                    channel_id=record.channel_id, user=self.params.user
-                )
-
                 # Write event log
                 EventLogHandler.create(
                     event="The incident was reported by {}".format(
@@ -406,7 +486,12 @@ class Incident:
 
     async def handle_incident_optional_features(self, id: int):
         """
-        Invite required participants (optional)
+        Run the optional integrations for a new incident
+
+        Integrations are dispatched concurrently, each kind limited by
+        integration_concurrency, and the events they produce are written to
+        the event log together at the end. Anything still running after
+        integration_timeout is left to finish and recorded when it does.
         """
 
         with Session(engine) as session:
@@ -414,83 +499,75 @@ class Incident:
                 select(IncidentRecord).filter(IncidentRecord.id == id)
             ).one()
 
-            if settings.options.auto_invite_groups:
-                for gr in settings.options.auto_invite_groups:
-                    if (
-                        record.severity in gr.severities.split(",")
-                        or gr.severities == "all"
-                    ):
-                        # Get group members
-                        try:
-                            required_participants_group_members = (
-                                slack_web_client.usergroups_users_list(
-                                    usergroup=[
-                                        g
-                                        for g in all_workspace_groups.get(
-                                            "usergroups"
-                                        )
-                                        if g["handle"] == gr.name
-                                    ][0]["id"],
-                                )
-                            )["users"]
-                        except Exception as error:
-                            logger.error(
-                                f"Error getting group members for {gr.name}: {error}"
-                            )
-                            raise
-
-                        # Invite group members to channel
-                        try:
-                            slack_web_client.conversations_invite(
-                                channel=record.channel_id,
-                                users=",".join(
-                                    required_participants_group_members
-                                ),
-                            )
+            async def dispatch(
+                integration: str, name: str, func: Callable[[], Any]
+            ) -> Any:
+                future = integration_executor(integration).submit(func)
 
-                            # Write event log
-                            EventLogHandler.create(
-                                event=f"Group {gr.name} was invited to the incident channel based on configured settings",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
-                            )
-                        except slack_sdk.errors.SlackApiError as error:
-                            logger.error(
-                                f"Error when inviting auto users: {error}"
-                            )
+                try:
+                    # Shielded so that timing out does not cancel a call
+                    # that is still queued for its integration
+                    return await asyncio.wait_for(
+                        asyncio.shield(asyncio.wrap_future(future)),
+                        timeout=integration_timeout,
+                    )
+                except TimeoutError:
+                    logger.warning(
+                        f"{name} for {record.slug} is still running after {integration_timeout} seconds, "
+                        + "its result will be recorded when it finishes"
+                    )
+                    future.add_done_callback(
+                        partial(self.apply_late_result, record.id, name)
+                    )
+                except Exception as error:
+                    logger.error(f"{name} for {record.slug} failed: {error}")
 
-                        # If the PagerDuty integration is enabled
-                        # and the group declaration has an escalation
-                        # issue a page
-                        if (
-                            settings.integrations
-                            and settings.integrations.pagerduty
-                            and settings.integrations.pagerduty.enabled
-                            and gr.pagerduty_escalation_policy
-                        ):
-                            from incidentbot.pagerduty.api import (
-                                PagerDutyInterface,
-                            )
+            tasks = []
 
-                            pagerduty_interface = PagerDutyInterface(
-                                escalation_policy=gr.pagerduty_escalation_policy
-                            )
+            """
+            Invite required participants (optional)
+            """
 
-                            pagerduty_interface.page(
-                                priority=gr.pagerduty_escalation_priority,
-                                channel_name=record.channel_name,
-                                channel_id=record.channel_id,
-                                paging_user="auto",
-                            )
+            if settings.options.auto_invite_groups:
+                groups = [
+                    gr
+                    for gr in settings.options.auto_invite_groups
+                    if record.severity in gr.severities.split(",")
+                    or gr.severities == "all"
+                ]
+
+                if groups:
+                    tasks.append(
+                        dispatch(
+                            "slack",
+                            "Inviting groups",
+                            partial(self.invite_groups, record, groups),
+                        )
+                    )
 
-                            # Write event log
-                            EventLogHandler.create(
-                                event="Created PagerDuty incident based on automatic configuration",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
+                for gr in groups:
+                    # If the PagerDuty integration is enabled
+                    # and the group declaration has an escalation
+                    # issue a page
+                    if (
+                        settings.integrations
+                        and settings.integrations.pagerduty
+                        and settings.integrations.pagerduty.enabled
+                        and gr.pagerduty_escalation_policy
+                    ):
+                        tasks.append(
+                            dispatch(
+                                "pagerduty",
+                                f"Paging {gr.pagerduty_escalation_policy}",
+                                partial(
+                                    self.page,
+                                    record=record,
+                                    escalation_policy=gr.pagerduty_escalation_policy,
+                                    priority=gr.pagerduty_escalation_priority,
+                                    event="Created PagerDuty incident based on automatic configuration",
+                                ),
                             )
+                        )
 
             """
             Post prompt for creating Statuspage incident if enabled (optional)
@@ -502,26 +579,14 @@ class Incident:
                 and settings.integrations.atlassian.statuspage
                 and settings.integrations.atlassian.statuspage.enabled
             ):
-                sp_starter_message_content = (
-                    return_new_statuspage_incident_message(
-                        channel_id=record.channel_id
+                tasks.append(
+                    dispatch(
+                        "slack",
+                        "Sending Statuspage prompt",
+                        partial(self.send_statuspage_prompt, record),
                     )
                 )
 
-                logger.info(
-                    f"Sending Statuspage prompt to {record.channel_name}"
-                )
-
-                try:
-                    slack_web_client.chat_postMessage(
-                        **sp_starter_message_content,
-                        text="Statuspage prompt has been posted to an incident.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending Statuspage prompt to incident channel {record.channel_name}: {error}"
-                    )
-
             """
             Page groups that are required to be automatically paged (optional)
             """
@@ -531,32 +596,23 @@ class Incident:
                 and settings.integrations.pagerduty
                 and settings.integrations.pagerduty.enabled
             ):
-                from incidentbot.pagerduty.api import PagerDutyInterface
-
                 auto_page_targets = read_pager_auto_page_targets()
 
                 if auto_page_targets:
                     for i in auto_page_targets:
                         for k, v in i.items():
-                            logger.info(f"Paging {k}...")
-
-                            pagerduty_interface = PagerDutyInterface(
-                                escalation_policy=v
-                            )
-
-                            pagerduty_interface.page(
-                                priority="low",
-                                channel_name=record.channel_name,
-                                channel_id=record.channel_id,
-                                paging_user="auto",
-                            )
-
-                            # Write event log
-                            EventLogHandler.create(
-                                event=f"Created PagerDuty incident for team {k} at user request",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
+                            tasks.append(
+                                dispatch(
+                                    "pagerduty",
+                                    f"Paging {k}",
+                                    partial(
+                                        self.page,
+                                        record=record,
+                                        escalation_policy=v,
+                                        priority="low",
+                                        event=f"Created PagerDuty incident for team {k} at user request",
+                                    ),
+                                )
                             )
 
             """
@@ -564,15 +620,17 @@ class Incident:
             """
 
             if record.is_security_incident:
-                try:
-                    slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        text=":warning: This incident was flagged as a security incident and the channel is private. You must invite other users to this channel manually.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending additional information to the incident channel {record.channel_name}: {error}"
+                tasks.append(
+                    dispatch(
+                        "slack",
+                        "Sending security incident notice",
+                        partial(
+                            slack_web_client.chat_postMessage,
+                            channel=record.channel_id,
+                            text=":warning: This incident was flagged as a security incident and the channel is private. You must invite other users to this channel manually.",
+                        ),
                     )
+                )
 
             """
             If a Jira issue should be created automatically, create it (optional)
@@ -585,94 +643,44 @@ class Incident:
                 and settings.integrations.atlassian.jira.enabled
                 and settings.integrations.atlassian.jira.auto_create_issue
             ):
-                from incidentbot.jira.issue import JiraIssue
-                from incidentbot.models.database import JiraIssueRecord
-
-                try:
-                    issue_obj = JiraIssue(
-                        description=record.channel_name,
-                        incident_id=record.id,
-                        issue_type=settings.integrations.atlassian.jira.auto_create_issue_type,
-                        summary=record.description,
-                    )
-
-                    resp = issue_obj.new()
-
-                    if resp is not None:
-                        issue_link = f"{settings.ATLASSIAN_API_URL}/browse/{resp.get('key')}"
-
-                        jira_issue_record = JiraIssueRecord(
-                            key=resp.get("key"),
-                            parent=record.id,
-                            status="Unassigned",
-                            url=issue_link,
-                        )
-
-                        session.add(jira_issue_record)
-
-                        from incidentbot.slack.messages import (
-                            BlockBuilder,
-                        )
-
-                        try:
-                            resp = slack_web_client.chat_postMessage(
-                                channel=record.channel_id,
-                                blocks=BlockBuilder.jira_issue_message(
-                                    key=resp.get("key"),
-                                    summary=record.description,
-                                    type=settings.integrations.atlassian.jira.auto_create_issue_type,
-                                    link=issue_link,
-                                ),
-                                text=f"A Jira issue has been created for this incident: {resp.get('self')}",
-                            )
-                            slack_web_client.pins_add(
-                                channel=record.channel_id,
-                                timestamp=resp["ts"],
-                            )
-                        except Exception as error:
-                            logger.error(
-                                f"Error sending Jira issue message for {record.channel_name}: {error}"
-                            )
-                except Exception as error:
-                    logger.error(
-                        f"Error creating Jira incident for {record.channel_name}: {error}"
+                tasks.append(
+                    dispatch(
+                        "jira",
+                        "Creating Jira issue",
+                        partial(self.create_jira_issue, record),
                     )
+                )
 
             """
             Additional comms channel (optional)
             """
 
             if record.additional_comms_channel:
-                try:
-                    comms_channel = self.create_channel(
-                        channel_name=format_channel_name(
-                            id=record.id,
-                            description=record.description,
-                            useDatePrefix=settings.options.channel_name_use_date_prefix,
-                            comms=True,
-                        ),
-                        private=False,
-                    )
-                    resp = slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        text="As requested, here is the dedicated communications channel for this incident: <#{}>".format(
-                            comms_channel.get("id")
-                        ),
+                tasks.append(
+                    dispatch(
+                        "slack",
+                        "Creating comms channel",
+                        partial(self.create_comms_channel, record),
                     )
-                    slack_web_client.pins_add(
-                        channel=record.channel_id,
-                        timestamp=resp["ts"],
-                    )
-                except Exception as error:
-                    logger.error(f"Error creating comms channel: {error}")
+                )
 
-                record.additional_comms_channel_id = comms_channel.get("id")
-                record.additional_comms_channel_link = (
-                    "https://{}.slack.com/archives/{}".format(
-                        slack_workspace_id, comms_channel.get("id")
+            """
+            Additional welcome messages
+            """
+
+            if settings.options.additional_welcome_messages:
+                tasks.append(
+                    dispatch(
+                        "slack",
+                        "Sending additional welcome messages",
+                        partial(self.send_additional_welcome_messages, record),
                     )
                 )
 
+            results = await asyncio.gather(*tasks)
+
+            self.apply_results(session, record, results)
+
             """
             Create task to remind channel about status updates
             """
@@ -710,29 +718,279 @@ class Incident:
                 logger.error(f"Error adding job: {error}")
 
             """
-            Additional welcome messages
+            Final mutation
             """
 
-            try:
-                if settings.options.additional_welcome_messages:
-                    for entry in settings.options.additional_welcome_messages:
-                        resp = slack_web_client.chat_postMessage(
-                            channel=record.channel_id,
-                            text=entry.message,
-                        )
-                        if entry.pin:
-                            slack_web_client.pins_add(
-                                channel=record.channel_id,
-                                timestamp=resp["ts"],
-                            )
-            except Exception as error:
+            session.add(record)
+            session.commit()
+
+    @staticmethod
+    def apply_results(
+        session: Session, record: IncidentRecord, results: list[Any]
+    ):
+        """
+        Record what the optional features of an incident returned and write
+        the events they produced to the event log
+
+        Parameters:
+            session (Session): Session the incident was read in
+            record (IncidentRecord): The incident
+            results (list[Any]): Return values of the optional features
+        """
+
+        events = []
+        for result in results:
+            if isinstance(result, str):
+                events.append(result)
+            elif isinstance(result, list):
+                events.extend(result)
+            elif isinstance(result, JiraIssueRecord):
+                session.add(result)
+            elif isinstance(result, dict) and result.get("comms_channel"):
+                comms_channel_id = result["comms_channel"]
+                record.additional_comms_channel_id = comms_channel_id
+                record.additional_comms_channel_link = (
+                    "https://{}.slack.com/archives/{}".format(
+                        get_workspace_id(), comms_channel_id
+                    )
+                )
+
+        EventLogHandler.create_many(
+            incident_id=record.id,
+            incident_slug=record.slug,
+            source="system",
+            events=events,
+        )
+
+    def apply_late_result(self, id: int, name: str, future: Future):
+        """
+        Record the result of an optional feature that finished after
+        integration_timeout, e.g. a slow Jira issue creation
+
+        Parameters:
+            id (int): ID of the incident
+            name (str): Name of the feature, for logging
+            future (Future): The finished call
+        """
+
+        error = future.exception()
+        if error is not None:
+            logger.error(f"{name} for incident {id} failed: {error}")
+            return
+
+        try:
+            with Session(engine) as session:
+                record = session.exec(
+                    select(IncidentRecord).filter(IncidentRecord.id == id)
+                ).one()
+
+                self.apply_results(session, record, [future.result()])
+
+                session.add(record)
+                session.commit()
+
+            logger.info(f"{name} for incident {id} finished late")
+        except Exception as error:
+            logger.error(
+                f"Error recording {name.lower()} for incident {id}: {error}"
+            )
+
+    """
+    Optional features
+    """
+
+    def create_comms_channel(self, record: IncidentRecord) -> dict[str, str]:
+        """
+        Create the additional comms channel for an incident and link to it
+        from the incident channel
+
+        Parameters:
+            record (IncidentRecord): The incident
+        """
+
+        comms_channel = self.create_channel(
+            channel_name=format_channel_name(
+                id=record.id,
+                description=record.description,
+                useDatePrefix=settings.options.channel_name_use_date_prefix,
+                comms=True,
+            ),
+            private=False,
+        )
+        resp = slack_web_client.chat_postMessage(
+            channel=record.channel_id,
+            text="As requested, here is the dedicated communications channel for this incident: <#{}>".format(
+                comms_channel.get("id")
+            ),
+        )
+        slack_web_client.pins_add(
+            channel=record.channel_id,
+            timestamp=resp["ts"],
+        )
+
+        return {"comms_channel": comms_channel.get("id")}
+
+    def create_jira_issue(self, record: IncidentRecord):
+        """
+        Create a Jira issue for an incident and post it to the incident
+        channel
+
+        Returns the JiraIssueRecord to store, or None if no issue was created
+
+        Parameters:
+            record (IncidentRecord): The incident
+        """
+
+        from incidentbot.jira.issue import JiraIssue
+
+        issue_obj = JiraIssue(
+            description=record.channel_name,
+            incident_id=record.id,
+            issue_type=settings.integrations.atlassian.jira.auto_create_issue_type,
+            summary=record.description,
+        )
+
+        resp = issue_obj.new()
+
+        if resp is None:
+            return None
+
+        issue_link = f"{settings.ATLASSIAN_API_URL}/browse/{resp.get('key')}"
+
+        try:
+            message = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                blocks=BlockBuilder.jira_issue_message(
+                    key=resp.get("key"),
+                    summary=record.description,
+                    type=settings.integrations.atlassian.jira.auto_create_issue_type,
+                    link=issue_link,
+                ),
+                text=f"A Jira issue has been created for this incident: {resp.get('self')}",
+            )
+            slack_web_client.pins_add(
+                channel=record.channel_id,
+                timestamp=message["ts"],
+            )
+        except Exception as error:
+            logger.error(
+                f"Error sending Jira issue message for {record.channel_name}: {error}"
+            )
+
+        return JiraIssueRecord(
+            key=resp.get("key"),
+            parent=record.id,
+            status="Unassigned",
+            url=issue_link,
+        )
+
+    def invite_groups(
+        self, record: IncidentRecord, groups: list
+    ) -> list[str]:
+        """
+        Invite the members of Slack groups to the incident channel
+
+        Members of more than one group are only invited once
+
+        Returns the events to log
+
+        Parameters:
+            record (IncidentRecord): The incident
+            groups (list[GroupAutoInvite]): Groups from
+                options.auto_invite_groups
+        """
+
+        events = []
+        members = set()
+
+        for group in groups:
+            group_members = get_usergroup_members(group.name)
+
+            if not group_members:
                 logger.error(
-                    f"Error sending additional welcome message to {record.slug}: {error}"
+                    f"Group {group.name} was not found or has no members"
                 )
+                continue
 
-            """
-            Final mutation
-            """
+            members |= group_members
+            events.append(
+                f"Group {group.name} was invited to the incident channel based on configured settings"
+            )
 
-            session.add(record)
-            session.commit()
+        results = invite_users_to_channel(record.channel_id, members)
+
+        for user, error in sorted(results.items()):
+            if error:
+                events.append(
+                    f"Could not invite <@{user}> to the incident channel: {error}"
+                )
+
+        return events
+
+    def page(
+        self,
+        record: IncidentRecord,
+        escalation_policy: str,
+        priority: str,
+        event: str,
+    ) -> str:
+        """
+        Issue a PagerDuty page for an incident
+
+        Returns the event to log
+
+        Parameters:
+            record (IncidentRecord): The incident
+            escalation_policy (str): Escalation policy to page
+            priority (str): Priority of the page
+            event (str): Event to log once paged
+        """
+
+        from incidentbot.pagerduty.api import PagerDutyInterface
+
+        logger.info(f"Paging {escalation_policy}...")
+
+        PagerDutyInterface(escalation_policy=escalation_policy).page(
+            priority=priority,
+            channel_name=record.channel_name,
+            channel_id=record.channel_id,
+            paging_user="auto",
+        )
+
+        return event
+
+    def send_additional_welcome_messages(self, record: IncidentRecord):
+        """
+        Send the configured additional welcome messages, in order
+
+        Parameters:
+            record (IncidentRecord): The incident
+        """
+
+        for entry in settings.options.additional_welcome_messages:
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                text=entry.message,
+            )
+            if entry.pin:
+                slack_web_client.pins_add(
+                    channel=record.channel_id,
+                    timestamp=resp["ts"],
+                )
+
+    def send_statuspage_prompt(self, record: IncidentRecord):
+        """
+        Post the prompt for creating a Statuspage incident
+
+        Parameters:
+            record (IncidentRecord): The incident
+        """
+
+        logger.info(f"Sending Statuspage prompt to {record.channel_name}")
+
+        slack_web_client.chat_postMessage(
+            **return_new_statuspage_incident_message(
+                channel_id=record.channel_id
+            ),
+            text="Statuspage prompt has been posted to an incident.",
+        )
@@ -2,14 +2,53 @@ from datetime import datetime
 
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, IncidentEvent
+from incidentbot.models.database import (
+    engine,
+    IncidentEvent,
+    IncidentEventBase,
+)
+from incidentbot.storage.blob import get_blob_store
 from incidentbot.util.gen import fetch_timestamp
-from sqlmodel import Session, select, or_
+from sqlmodel import Session, select
+from sqlmodel.sql.expression import Select, SelectOfScalar
+from typing import BinaryIO
 
 if not settings.IS_TEST_ENVIRONMENT:
     from incidentbot.slack.client import get_slack_user
 
 
+def timeline_query(
+    *columns,
+    incident_id: int = None,
+    incident_slug: str = None,
+) -> Select | SelectOfScalar:
+    """
+    Return a query for an incident's events in timeline order
+
+    Only one key is filtered on, preferring the incident id, so the query is
+    served by the (parent, message_ts, created_at) or the (incident_slug,
+    message_ts, created_at) index
+
+    Parameters:
+        columns: Entity or columns to select
+        incident_id (int): The incident id
+        incident_slug (str): The incident slug
+    """
+
+    if incident_id is not None:
+        predicate = IncidentEvent.parent == incident_id
+    elif incident_slug is not None:
+        predicate = IncidentEvent.incident_slug == incident_slug
+    else:
+        raise ValueError("Either incident_id or incident_slug is required")
+
+    return (
+        select(*columns)
+        .where(predicate)
+        .order_by(IncidentEvent.message_ts, IncidentEvent.created_at)
+    )
+
+
 class EventLogHandler:
     @classmethod
     def create(
@@ -18,7 +57,7 @@ class EventLogHandler:
         incident_slug: str,
         source: str,
         event: str | None = None,
-        image: bytes | None = None,
+        image_ref: str | None = None,
         message_ts: str | None = None,
         mimetype: str | None = None,
         title: str | None = None,
@@ -32,7 +71,7 @@ class EventLogHandler:
         with Session(engine) as session:
             try:
                 event = IncidentEvent(
-                    image=image,
+                    image_ref=image_ref,
                     incident_slug=incident_slug,
                     message_ts=(
                         message_ts
@@ -45,7 +84,7 @@ class EventLogHandler:
                     text=event,
                     timestamp=timestamp,
                     title=title,
-                    user=get_slack_user(user).get("real_name", "NotAvailable"),
+                    user=self.user_display_name(user),
                 )
 
                 session.add(event)
@@ -55,6 +94,61 @@ class EventLogHandler:
                     f"Event log creation failed for incident {incident_id}: {error}"
                 )
 
+    @classmethod
+    def create_many(
+        self,
+        incident_id: int,
+        incident_slug: str,
+        source: str,
+        events: list[str],
+    ):
+        """
+        Create several event logs for an incident in a single transaction
+
+        Parameters:
+            incident_id (int): The incident's id
+            incident_slug (str): The incident's slug
+            source (str): Source of the events, e.g. system
+            events (list[str]): Text of each event
+        """
+
+        if not events:
+            return
+
+        with Session(engine) as session:
+            try:
+                session.add_all(
+                    [
+                        IncidentEvent(
+                            incident_slug=incident_slug,
+                            message_ts=fetch_timestamp(epoch=True),
+                            parent=incident_id,
+                            source=source,
+                            text=event,
+                        )
+                        for event in events
+                    ]
+                )
+                session.commit()
+            except Exception as error:
+                logger.error(
+                    f"Event log creation failed for incident {incident_id}: {error}"
+                )
+
+    @staticmethod
+    def user_display_name(user: str | None) -> str | None:
+        """
+        Return the name to record for the user behind an event
+
+        Parameters:
+            user (str | None): Slack user id, handle or name
+        """
+
+        if user is None:
+            return None
+
+        return (get_slack_user(user) or {}).get("real_name", "NotAvailable")
+
     @classmethod
     def delete(
         self,
@@ -77,6 +171,16 @@ class EventLogHandler:
                 session.commit()
 
                 logger.info(f"deleted incident event {id}")
+
+                if (
+                    record.image_ref
+                    and not session.exec(
+                        select(IncidentEvent.id)
+                        .filter(IncidentEvent.image_ref == record.image_ref)
+                        .limit(1)
+                    ).first()
+                ):
+                    get_blob_store().delete(record.image_ref)
             except Exception as error:
                 logger.error(
                     f"Event log delete failed for record {id}: {error}"
@@ -101,15 +205,10 @@ class EventLogHandler:
         with Session(engine) as session:
             try:
                 records = session.exec(
-                    select(IncidentEvent)
-                    .filter(
-                        or_(
-                            IncidentEvent.incident_slug == incident_slug,
-                            IncidentEvent.parent == incident_id,
-                        )
-                    )
-                    .order_by(
-                        IncidentEvent.message_ts, IncidentEvent.created_at
+                    timeline_query(
+                        IncidentEvent,
+                        incident_id=incident_id,
+                        incident_slug=incident_slug,
                     )
                 ).all()
 
@@ -119,6 +218,54 @@ class EventLogHandler:
                     f"Event log lookup failed for incident {incident_id}: {error}"
                 )
 
+    @classmethod
+    def read_summaries(
+        self,
+        incident_id: int = None,
+        incident_slug: str = None,
+    ) -> list[IncidentEventBase]:
+        """
+        Read an incident's event logs, selecting only the columns of
+        IncidentEventBase
+
+        Parameters:
+            incident_id (int): The incident id
+            incident_slug (str): The incident slug
+        """
+
+        with Session(engine) as session:
+            try:
+                rows = session.exec(
+                    timeline_query(
+                        *(
+                            getattr(IncidentEvent, field)
+                            for field in IncidentEventBase.model_fields
+                        ),
+                        incident_id=incident_id,
+                        incident_slug=incident_slug,
+                    )
+                ).all()
+
+                return [IncidentEventBase(**row._mapping) for row in rows]
+            except Exception as error:
+                logger.error(
+                    f"Event log lookup failed for incident {incident_id}: {error}"
+                )
+
+    @classmethod
+    def open_image(self, event: IncidentEvent | IncidentEventBase) -> BinaryIO:
+        """
+        Return a file-like object to read an event's image from
+
+        The image is read from the blob store as it is consumed, so callers
+        handling many images only hold one at a time
+
+        Parameters:
+            event (IncidentEvent | IncidentEventBase): An event with an image
+        """
+
+        return get_blob_store().open(event.image_ref)
+
     @classmethod
     def read_one(
         self,
@@ -0,0 +1,190 @@
+import threading
+
+from incidentbot.logging import logger
+from incidentbot.models.database import IncidentParticipant, IncidentRecord
+from incidentbot.models.incident import IncidentDatabaseInterface
+from incidentbot.models.unit_of_work import current_unit_of_work
+from incidentbot.slack.client import get_digest_channel_id, slack_api
+from incidentbot.slack.messages import IncidentChannelDigestNotification
+from typing import Any, Callable
+
+# Seconds to wait for more changes to an incident before writing them out
+update_window = 2
+
+# What can be written for an incident
+update_targets = ("digest", "topic")
+
+
+def render_topic(
+    record: IncidentRecord, lead: IncidentParticipant | None = None
+) -> str:
+    """
+    Return the incident channel topic for an incident
+
+    Severity is always first, then status, then the lead role if assigned
+
+    Parameters:
+        record (IncidentRecord): The incident
+        lead (IncidentParticipant): Participant holding the lead role
+    """
+
+    topic = f"Severity: {record.severity.upper()} | Status: {record.status.title()}"
+
+    if lead:
+        topic += f" | {lead.role.replace('_', ' ').title()}: <@{lead.user_id}>"
+
+    return topic
+
+
+def render_digest(
+    record: IncidentRecord, postmortem_link: str | None = None
+) -> list[dict[str, Any]]:
+    """
+    Return the blocks of the digest message for an incident
+
+    Parameters:
+        record (IncidentRecord): The incident
+        postmortem_link (str): Link to the postmortem, if there is one
+    """
+
+    return IncidentChannelDigestNotification.update(
+        channel_id=record.channel_id,
+        has_private_channel=record.has_private_channel,
+        incident_components=record.components,
+        incident_description=record.description,
+        incident_impact=record.impact,
+        incident_slug=record.slug,
+        meeting_link=record.meeting_link,
+        severity=record.severity,
+        status=record.status,
+        postmortem_link=postmortem_link,
+    )
+
+
+class ChannelUpdateQueue:
+    """
+    Collects changes to the topic and digest message of incident channels
+    and writes each one out once per window
+
+    The first change for a channel starts its window. Anything requested for
+    the same channel before the window closes is merged in, so a burst of
+    changes results in a single write per target.
+
+    Parameters:
+        write (Callable[[str, set[str]], None]): Called with a channel ID and
+            the targets to write once its window closes
+        window (float): Seconds to wait for more changes
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, set[str]], None],
+        window: float = update_window,
+    ):
+        self.write = write
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, set[str]] = {}
+
+    def request(self, channel_id: str, *targets: str):
+        """
+        Ask for targets of a channel to be written
+
+        Parameters:
+            channel_id (str): Incident channel ID
+            targets (str): Any of update_targets
+        """
+
+        for target in targets:
+            if target not in update_targets:
+                raise ValueError(f"{target} is not a valid update target")
+
+        # Changes made in a unit of work are only written when it ends
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.on_commit(lambda: self.request(channel_id, *targets))
+            return
+
+        with self._lock:
+            if channel_id in self._pending:
+                self._pending[channel_id].update(targets)
+                return
+
+            self._pending[channel_id] = set(targets)
+
+        timer = threading.Timer(self.window, self.flush, args=[channel_id])
+        timer.daemon = True
+        timer.start()
+
+    def flush(self, channel_id: str):
+        """
+        Write out everything pending for a channel now
+
+        Parameters:
+            channel_id (str): Incident channel ID
+        """
+
+        with self._lock:
+            targets = self._pending.pop(channel_id, set())
+
+        if not targets:
+            return
+
+        try:
+            self.write(channel_id, targets)
+        except Exception as error:
+            logger.error(
+                f"Error writing {', '.join(sorted(targets))} for {channel_id}: {error}"
+            )
+
+
+def write_channel_updates(channel_id: str, targets: set[str]):
+    """
+    Render the topic and digest message of an incident from its record and
+    write them to Slack
+
+    Parameters:
+        channel_id (str): Incident channel ID
+        targets (set[str]): Any of update_targets
+    """
+
+    incident = IncidentDatabaseInterface.get_by_channel_id(channel_id)
+
+    if not incident:
+        return
+
+    if "topic" in targets:
+        leads = [
+            participant
+            for participant in IncidentDatabaseInterface.list_participants(
+                incident=incident
+            )
+            or []
+            if participant.is_lead
+        ]
+
+        slack_api.conversations_setTopic(
+            channel=channel_id,
+            topic=render_topic(
+                incident,
+                max(leads, key=lambda p: p.created_at) if leads else None,
+            ),
+        )
+
+    if "digest" in targets and incident.digest_message_ts:
+        postmortem = IncidentDatabaseInterface.get_postmortem(
+            parent=incident.id
+        )
+
+        slack_api.chat_update(
+            channel=get_digest_channel_id(),
+            ts=incident.digest_message_ts,
+            blocks=render_digest(
+                incident, postmortem.url if postmortem else None
+            ),
+            text="Digest message has been updated.",
+        )
+
+
+channel_updates = ChannelUpdateQueue(write_channel_updates)
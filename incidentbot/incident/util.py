@@ -65,7 +65,7 @@ def role_watcher(channel_id: str):
         channel_id (str): The incident channel id
     """
 
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
     participants = IncidentDatabaseInterface.list_participants(record)
 
     if not participants:
@@ -4,14 +4,13 @@ from datetime import datetime
 from incidentbot.configuration.settings import settings
 from incidentbot.util.security import get_password_hash
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import DateTime, func, text
+from sqlalchemy import DateTime, func, Index, text
 from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlmodel import (
     create_engine,
     Column,
     Field,
     JSON,
-    LargeBinary,
     Relationship,
     select,
     Session,
@@ -137,12 +136,25 @@ class ApplicationData(SQLModel, table=True):
 
 
 class IncidentRecord(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_incidentrecord_created_at_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_incidentrecord_status_created_at",
+            "status",
+            text("created_at DESC"),
+        ),
+    )
+
     additional_comms_channel: bool | None = None
     additional_comms_channel_id: str | None = None
     additional_comms_channel_link: str | None = None
     boilerplate_message_ts: str | None = None
-    channel_id: str | None = None
-    channel_name: str | None = None
+    channel_id: str | None = Field(default=None, index=True, unique=True)
+    channel_name: str | None = Field(default=None, index=True)
     components: str | None = None
     created_at: datetime = Field(
         sa_column_kwargs={
@@ -175,8 +187,8 @@ class IncidentRecord(SQLModel, table=True):
     severities: list | None = Field(
         sa_column=Column(MutableList.as_mutable(JSON)), default_factory=list
     )
-    slug: str | None = None
-    status: str | None = None
+    slug: str | None = Field(default=None, index=True, unique=True)
+    status: str | None = Field(default=None, index=True)
     statuses: list | None = Field(
         sa_column=Column(MutableList.as_mutable(JSON)), default_factory=list
     )
@@ -193,11 +205,12 @@ class IncidentRecord(SQLModel, table=True):
 
 class IncidentEventBase(BaseModel):
     """
-    IncidentEvent base class, excludes image
+    IncidentEvent base class
     """
 
     created_at: datetime
     id: uuid.UUID
+    image_ref: str | None = None
     incident_slug: str
     message_ts: str | None = None
     mimetype: str | None = None
@@ -218,13 +231,28 @@ class IncidentEventBase(BaseModel):
 
 
 class IncidentEvent(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_incidentevent_parent_message_ts",
+            "parent",
+            "message_ts",
+            "created_at",
+        ),
+        Index(
+            "ix_incidentevent_incident_slug_message_ts",
+            "incident_slug",
+            "message_ts",
+            "created_at",
+        ),
+    )
+
     created_at: datetime = Field(
         sa_column_kwargs={
             "server_default": text("CURRENT_TIMESTAMP"),
         }
     )
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    image: bytes | None = Field(sa_column=Column(LargeBinary))
+    image_ref: str | None = None
     incident: IncidentRecord | None = Relationship(back_populates="events")
     incident_slug: str | None = None
     message_ts: str | None = None
@@ -380,6 +408,44 @@ class PostmortemRecord(SQLModel, table=True):
     url: str | None = None
 
 
+class SlackChannel(SQLModel, table=True):
+    __tablename__ = "slack_channel"
+
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    id: str = Field(primary_key=True)
+    name: str
+    updated_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            onupdate=func.now(),
+        )
+    )
+
+
+class SlackUser(SQLModel, table=True):
+    __tablename__ = "slack_user"
+
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    email: str | None = None
+    id: str = Field(primary_key=True)
+    name: str
+    real_name: str | None = None
+    updated_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            onupdate=func.now(),
+        )
+    )
+
+
 class StatuspageIncidentRecord(SQLModel, table=True):
     channel_id: str | None = None
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
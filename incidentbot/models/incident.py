@@ -1,3 +1,4 @@
+from datetime import datetime
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
 from incidentbot.models.database import (
@@ -9,14 +10,107 @@ from incidentbot.models.database import (
     StatuspageIncidentRecord,
 )
 from incidentbot.models.slack import User
+from incidentbot.models.unit_of_work import current_unit_of_work
+from sqlalchemy import func, tuple_
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import or_, Session, select
+from sqlmodel import col, or_, Session, select
+from typing import Iterator
 
 """
 API Models
 """
 
 
+"""
+Helpers
+"""
+
+# Columns update_col is allowed to change
+updatable_cols = (
+    "channel_name",
+    "description",
+    "last_update_sent",
+    "severity",
+    "status",
+)
+
+
+def _incident_predicates(
+    channel_id: str = None,
+    channel_name: str = None,
+    id: int = None,
+    slug: str = None,
+) -> list:
+    """
+    Return a predicate for each incident key that was supplied
+
+    Parameters:
+        channel_id (str): Filter by channel_id
+        channel_name (str): Filter by channel_name
+        id (int): Filter by incident id
+        slug (str): Filter by slug
+    """
+
+    predicates = []
+
+    if channel_id is not None:
+        predicates.append(IncidentRecord.channel_id == channel_id)
+    if channel_name is not None:
+        predicates.append(IncidentRecord.channel_name == channel_name)
+    if id is not None:
+        predicates.append(IncidentRecord.id == id)
+    if slug is not None:
+        predicates.append(IncidentRecord.slug == slug)
+
+    return predicates
+
+
+def _listing_predicates(
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    description: str | None = None,
+    exclude_statuses: list[str] | None = None,
+    severities: list[str] | None = None,
+    statuses: list[str] | None = None,
+) -> list:
+    """
+    Return a predicate for each incident listing filter that was supplied
+
+    Parameters:
+        created_after (datetime): Only incidents created at or after this
+        created_before (datetime): Only incidents created before this
+        description (str): Only incidents whose description contains this
+        exclude_statuses (list[str]): Leave out incidents in these statuses
+        severities (list[str]): Only incidents with these severities
+        statuses (list[str]): Only incidents in these statuses
+    """
+
+    predicates = []
+
+    if created_after is not None:
+        predicates.append(IncidentRecord.created_at >= created_after)
+    if created_before is not None:
+        predicates.append(IncidentRecord.created_at < created_before)
+    if description:
+        predicates.append(
+            col(IncidentRecord.description).contains(description)
+        )
+    if exclude_statuses:
+        predicates.append(col(IncidentRecord.status).not_in(exclude_statuses))
+    if severities:
+        predicates.append(col(IncidentRecord.severity).in_(severities))
+    if statuses:
+        predicates.append(col(IncidentRecord.status).in_(statuses))
+
+    return predicates
+
+
+def _forget_participants(incident: IncidentRecord):
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.forget_participants(incident.id)
+
+
 """
 Database Interface
 """
@@ -42,6 +136,9 @@ class IncidentDatabaseInterface:
         """
         Read a single incident from the database
 
+        Only the filters that are supplied are used, so the lookup can be
+        served by the index on that column
+
         Parameters:
             channel_id (str): Filter by channel_id
             channel_name (str): Filter by channel_name
@@ -49,25 +146,69 @@ class IncidentDatabaseInterface:
             slug (str): Filter by slug
         """
 
+        predicates = _incident_predicates(
+            channel_id=channel_id, channel_name=channel_name, id=id, slug=slug
+        )
+
+        if not predicates:
+            logger.error("incident lookup (single) requires a filter")
+            return None
+
+        uow = current_unit_of_work()
+        if uow is not None and len(predicates) == 1:
+            key, value = next(
+                (key, value)
+                for key, value in (
+                    ("channel_id", channel_id),
+                    ("channel_name", channel_name),
+                    ("id", id),
+                    ("slug", slug),
+                )
+                if value is not None
+            )
+            incident = uow.get_incident(key, value)
+            if incident is not None:
+                return incident
+
         try:
             with Session(engine) as session:
                 incident = session.exec(
-                    select(IncidentRecord).filter(
-                        or_(
-                            IncidentRecord.channel_id == channel_id,
-                            IncidentRecord.channel_name == channel_name,
-                            IncidentRecord.id == id,
-                            IncidentRecord.slug == slug,
-                        )
-                    )
+                    select(IncidentRecord).where(*predicates)
                 ).one()
 
+                if uow is not None:
+                    uow.add_incident(incident)
+
                 return incident
         except NoResultFound:
-            logger.error(f"incident {channel_id} not found in database")
+            logger.error(
+                f"incident {channel_id or channel_name or id or slug} not found in database"
+            )
         except Exception as error:
             logger.error(f"incident lookup (single) query failed: {error}")
 
+    @classmethod
+    def get_by_channel_id(self, channel_id: str) -> IncidentRecord:
+        """
+        Read a single incident by the ID of its channel
+
+        Parameters:
+            channel_id (str): Incident channel ID
+        """
+
+        return self.get_one(channel_id=channel_id)
+
+    @classmethod
+    def get_by_slug(self, slug: str) -> IncidentRecord:
+        """
+        Read a single incident by its slug
+
+        Parameters:
+            slug (str): Incident slug
+        """
+
+        return self.get_one(slug=slug)
+
     @classmethod
     def get_statuspage_incident_record(
         self,
@@ -161,6 +302,81 @@ class IncidentDatabaseInterface:
         except Exception as error:
             logger.error(f"Lookup failed: {error}")
 
+    @classmethod
+    def list_page(
+        self,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 100,
+        **filters,
+    ) -> list[IncidentRecord]:
+        """
+        Return a page of incidents, newest first
+
+        Pages are keyset paginated on (created_at, id). Pass the created_at
+        and id of the last incident of one page as after to get the next.
+
+        Parameters:
+            after (tuple[datetime, int]): Return incidents after this key
+            limit (int): How many incidents to return
+            filters: Any filters accepted by _listing_predicates
+        """
+
+        query = select(IncidentRecord).where(*_listing_predicates(**filters))
+
+        if after is not None:
+            query = query.where(
+                tuple_(IncidentRecord.created_at, IncidentRecord.id)
+                < tuple_(*after)
+            )
+
+        with Session(engine) as session:
+            return session.exec(
+                query.order_by(
+                    col(IncidentRecord.created_at).desc(),
+                    col(IncidentRecord.id).desc(),
+                ).limit(limit)
+            ).all()
+
+    @classmethod
+    def count(self, **filters) -> int:
+        """
+        Return how many incidents match a set of filters
+
+        Parameters:
+            filters: Any filters accepted by _listing_predicates
+        """
+
+        with Session(engine) as session:
+            return session.exec(
+                select(func.count())
+                .select_from(IncidentRecord)
+                .where(*_listing_predicates(**filters))
+            ).one()
+
+    @classmethod
+    def iter_all(
+        self, page_size: int = 500, **filters
+    ) -> Iterator[IncidentRecord]:
+        """
+        Yield every incident, newest first, a page at a time
+
+        Parameters:
+            page_size (int): How many incidents to load per query
+            filters: Any filters accepted by list_page
+        """
+
+        after = None
+
+        while True:
+            page = self.list_page(after=after, limit=page_size, **filters)
+
+            yield from page
+
+            if len(page) < page_size:
+                return
+
+            after = (page[-1].created_at, page[-1].id)
+
     @classmethod
     def list_recent(self, limit: int = 5) -> list[IncidentRecord]:
         """
@@ -177,17 +393,15 @@ class IncidentDatabaseInterface:
         ][0]
 
         try:
-            with Session(engine) as session:
-                incidents = session.exec(
-                    select(IncidentRecord)
-                    .filter(IncidentRecord.status != final_status)
-                    .order_by(IncidentRecord.created_at)
-                ).all()
-
-            return incidents[-limit:]
+            page = self.list_page(limit=limit, exclude_statuses=[final_status])
         except Exception as error:
             logger.error(f"incident lookup (recent) query failed: {error}")
 
+            return []
+
+        # Oldest first, as the app home has always listed them
+        return list(reversed(page))
+
     """
     Update
     """
@@ -204,6 +418,9 @@ class IncidentDatabaseInterface:
         Updates the value of a column for an incident - don't forget to specify all
         required parameters for this method
 
+        Within a unit of work the update is queued and written with the
+        others when the unit of work ends
+
         Parameters:
             col_name (str): Column name
             value (str): New value for field
@@ -211,28 +428,27 @@ class IncidentDatabaseInterface:
             id (str): Filter by incident id
         """
 
+        if col_name not in updatable_cols:
+            logger.error(f"incident col {col_name} can't be updated")
+            return
+
+        uow = current_unit_of_work()
+        if uow is not None and (channel_id or id is not None):
+            if channel_id:
+                uow.update_incident("channel_id", channel_id, col_name, value)
+            else:
+                uow.update_incident("id", id, col_name, value)
+            return
+
         try:
             with Session(engine) as session:
                 incident = session.exec(
-                    select(IncidentRecord).filter(
-                        or_(
-                            IncidentRecord.channel_id == channel_id,
-                            IncidentRecord.id == id,
-                        )
+                    select(IncidentRecord).where(
+                        *_incident_predicates(channel_id=channel_id, id=id)
                     )
                 ).one()
 
-                match col_name:
-                    case "channel_name":
-                        incident.channel_name = value
-                    case "description":
-                        incident.description = value
-                    case "last_update_sent":
-                        incident.last_update_sent = value
-                    case "severity":
-                        incident.severity = value
-                    case "status":
-                        incident.status = value
+                setattr(incident, col_name, value)
                 session.add(incident)
                 session.commit()
         except Exception as error:
@@ -274,6 +490,8 @@ class IncidentDatabaseInterface:
 
                 session.add(participant)
                 session.commit()
+
+            _forget_participants(incident)
         except Exception as error:
             logger.error(
                 f"adding user {user.name} to incident {incident.slug} failed: {error}"
@@ -295,6 +513,15 @@ class IncidentDatabaseInterface:
             user (User): The user
         """
 
+        uow = current_unit_of_work()
+        if uow is not None:
+            participants = uow.get_participants(incident.id)
+            if participants is not None:
+                return any(
+                    participant.role == role and participant.user_id == user.id
+                    for participant in participants
+                )
+
         try:
             with Session(engine) as session:
                 participant = session.exec(
@@ -322,6 +549,12 @@ class IncidentDatabaseInterface:
         Returns any participants associated with an incident
         """
 
+        uow = current_unit_of_work()
+        if uow is not None:
+            participants = uow.get_participants(incident.id)
+            if participants is not None:
+                return participants
+
         try:
             with Session(engine) as session:
                 participants = session.exec(
@@ -330,6 +563,9 @@ class IncidentDatabaseInterface:
                     )
                 ).all()
 
+            if uow is not None:
+                uow.set_participants(incident.id, participants)
+
             return participants
         except Exception as error:
             logger.error(
@@ -365,6 +601,8 @@ class IncidentDatabaseInterface:
 
                 session.delete(participant)
                 session.commit()
+
+            _forget_participants(incident)
         except Exception as error:
             logger.error(
                 f"removing user {user.name} from incident {incident.slug} failed: {error}"
@@ -0,0 +1,286 @@
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from incidentbot.exceptions import UnitOfWorkError
+from incidentbot.logging import logger
+from incidentbot.models.database import (
+    engine,
+    IncidentParticipant,
+    IncidentRecord,
+)
+from sqlmodel import Session, select
+from typing import Any, Callable, Iterator
+
+# Columns an incident can be looked up by
+incident_keys = ("channel_id", "channel_name", "id", "slug")
+
+_current: ContextVar["UnitOfWork | None"] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+class UnitOfWork:
+    """
+    Caches incidents and participants loaded while handling one Slack event
+    or API request and collects column updates to write in one commit
+
+    Incidents are cached under every key they can be looked up by, so a
+    lookup by channel ID after one by slug is served from memory. Queued
+    updates are applied to cached incidents straight away, so reads later in
+    the same event see them before they are written.
+    """
+
+    def __init__(self):
+        self.closed = False
+
+        self._lock = threading.RLock()
+        self._incidents: dict[tuple[str, Any], IncidentRecord] = {}
+        self._participants: dict[int, list[IncidentParticipant]] = {}
+        self._updates: dict[tuple[str, Any], dict[str, Any]] = {}
+        self._on_commit: list[Callable[[], None]] = []
+
+    """
+    Incidents
+    """
+
+    def get_incident(self, key: str, value: Any) -> IncidentRecord | None:
+        """
+        Return a cached incident
+
+        Parameters:
+            key (str): Any of incident_keys
+            value (Any): Value of the key
+        """
+
+        with self._lock:
+            return self._incidents.get((key, value))
+
+    def add_incident(self, incident: IncidentRecord):
+        """
+        Cache an incident under each of its keys, applying any updates
+        already queued for it under any of them
+
+        Parameters:
+            incident (IncidentRecord): The incident
+        """
+
+        with self._lock:
+            self._apply_updates(incident)
+            self._cache(incident)
+
+    def _apply_updates(self, incident: IncidentRecord):
+        # Updates are applied in the order they were queued, following the
+        # incident to new values of its keys as they change
+        keys = {(key, getattr(incident, key)) for key in incident_keys}
+
+        for queued, columns in self._updates.items():
+            if queued not in keys:
+                continue
+
+            for col_name, new in columns.items():
+                setattr(incident, col_name, new)
+                if col_name in incident_keys:
+                    keys.add((col_name, new))
+
+    def _cache(self, incident: IncidentRecord):
+        for key in incident_keys:
+            value = getattr(incident, key)
+            if value is not None:
+                self._incidents[(key, value)] = incident
+
+    def update_incident(self, key: str, value: Any, col_name: str, new: Any):
+        """
+        Queue a column update for an incident and apply it to the cached
+        incident, if there is one
+
+        Parameters:
+            key (str): Any of incident_keys
+            value (Any): Value of the key
+            col_name (str): Column name
+            new (Any): New value for the column
+        """
+
+        with self._lock:
+            self._updates.setdefault((key, value), {})[col_name] = new
+
+            incident = self._incidents.get((key, value))
+            if incident is not None:
+                for cached, record in list(self._incidents.items()):
+                    if record is incident:
+                        del self._incidents[cached]
+
+                setattr(incident, col_name, new)
+                self._cache(incident)
+
+    """
+    Participants
+    """
+
+    def get_participants(
+        self, incident_id: int
+    ) -> list[IncidentParticipant] | None:
+        """
+        Return the cached participants of an incident
+
+        Parameters:
+            incident_id (int): The incident id
+        """
+
+        with self._lock:
+            return self._participants.get(incident_id)
+
+    def set_participants(
+        self, incident_id: int, participants: list[IncidentParticipant]
+    ):
+        """
+        Cache the participants of an incident
+
+        Parameters:
+            incident_id (int): The incident id
+            participants (list[IncidentParticipant]): The participants
+        """
+
+        with self._lock:
+            self._participants[incident_id] = participants
+
+    def forget_participants(self, incident_id: int):
+        """
+        Drop the cached participants of an incident after they changed
+
+        Parameters:
+            incident_id (int): The incident id
+        """
+
+        with self._lock:
+            self._participants.pop(incident_id, None)
+
+    """
+    Commit
+    """
+
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        Run a callback once queued updates have been written
+
+        Parameters:
+            callback (Callable[[], None]): Function to run
+        """
+
+        with self._lock:
+            self._on_commit.append(callback)
+
+    def commit(self):
+        """
+        Write every queued update in a single transaction, then run the
+        on_commit callbacks
+
+        The updates for each incident are applied in their own savepoint, so
+        one that can't be written, e.g. for an incident that no longer
+        exists, doesn't undo the rest. UnitOfWorkError is raised afterwards
+        naming the incidents that weren't updated.
+        """
+
+        with self._lock:
+            updates, self._updates = self._updates, {}
+            callbacks, self._on_commit = self._on_commit, []
+
+        failed = []
+
+        if updates:
+            try:
+                with Session(engine, expire_on_commit=False) as session:
+                    for (key, value), columns in updates.items():
+                        try:
+                            with session.begin_nested():
+                                incident = session.exec(
+                                    select(IncidentRecord).where(
+                                        getattr(IncidentRecord, key) == value
+                                    )
+                                ).one()
+
+                                for col_name, new in columns.items():
+                                    setattr(incident, col_name, new)
+
+                                session.add(incident)
+                        except Exception as error:
+                            failed.append(f"{key}={value}")
+                            logger.error(
+                                f"incident col updates for {key}={value} failed: {error}"
+                            )
+
+                    session.commit()
+            except Exception as error:
+                failed = [f"{key}={value}" for key, value in updates]
+                logger.error(f"incident col updates failed: {error}")
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as error:
+                logger.error(f"unit of work callback failed: {error}")
+
+        if failed:
+            raise UnitOfWorkError(
+                f"Could not update incident {', '.join(failed)}"
+            )
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """
+    Return the unit of work for the event being handled, if any
+    """
+
+    uow = _current.get()
+
+    return uow if uow is not None and not uow.closed else None
+
+
+def begin() -> tuple[UnitOfWork, Token]:
+    """
+    Open a unit of work for the current context
+
+    Pair with end, then commit the unit of work. Prefer unit_of_work unless
+    the commit has to happen somewhere else, e.g. off the event loop.
+    """
+
+    uow = UnitOfWork()
+
+    return uow, _current.set(uow)
+
+
+def end(uow: UnitOfWork, token: Token):
+    """
+    Close a unit of work opened with begin, without committing it
+
+    Parameters:
+        uow (UnitOfWork): The unit of work
+        token (Token): Token returned by begin
+    """
+
+    _current.reset(token)
+    uow.closed = True
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """
+    Handle everything in the block as one unit of work, committing queued
+    updates when it exits
+
+    Nested blocks join the unit of work that is already open. Raises
+    UnitOfWorkError on exit if any of the updates couldn't be written.
+    """
+
+    existing = current_unit_of_work()
+    if existing is not None:
+        yield existing
+        return
+
+    uow, token = begin()
+
+    try:
+        yield uow
+    finally:
+        end(uow, token)
+        uow.commit()
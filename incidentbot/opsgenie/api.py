@@ -4,7 +4,7 @@ import requests
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
 from incidentbot.models.database import engine, ApplicationData
-from incidentbot.slack.client import slack_workspace_id
+from incidentbot.slack.client import get_workspace_id
 from sqlalchemy import update
 from sqlmodel import Session, select
 
@@ -60,7 +60,7 @@ class OpsgenieAPI:
         body = opsgenie_sdk.CreateAlertPayload(
             message=f"Slack incident {channel_name} has been started and a page has been issued for assistance.",
             description="An incident has been started in Slack and this team has been paged as a result. "
-            + f"You were paged by {paging_user}. Link: https://{slack_workspace_id}.slack.com/archives/{channel_id}",
+            + f"You were paged by {paging_user}. Link: https://{get_workspace_id()}.slack.com/archives/{channel_id}",
             responders=[{"name": t, "type": "team"} for t in responders],
             priority=priority,
         )
@@ -8,7 +8,10 @@ from incidentbot.models.database import (
     IncidentRecord,
     PagerDutyIncidentRecord,
 )
-from incidentbot.slack.client import slack_workspace_id
+from incidentbot.slack.client import (
+    get_slack_user_list_db,
+    get_workspace_id,
+)
 from incidentbot.util.gen import fetch_timestamp
 from pdpyras import APISession, PDClientError
 from sqlalchemy import update
@@ -61,22 +64,10 @@ class PagerDutyInterface:
         on_call = {}
         auto_mapping = {}
 
-        try:
-            with Session(engine) as session:
-                slack_users_from_dict = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).first()
-        except Exception as error:
-            logger.error(
-                f"Error retrieving list of Slack users from db: {error}"
-            )
-
         slack_users = {
             user.get("real_name"): user.get("id")
-            for user in slack_users_from_dict
-            if user.__contains__("real_name")
+            for user in get_slack_user_list_db()
+            if user.get("real_name")
         }
 
         oncalls = self.session().iter_all("oncalls")
@@ -155,7 +146,7 @@ class PagerDutyInterface:
                     "body": {
                         "type": "incident_body",
                         "details": "An incident has been started in Slack and this team has been paged as a result. "
-                        + f"You were paged by {paging_user}. Link: https://{slack_workspace_id}.slack.com/archives/{channel_id}",
+                        + f"You were paged by {paging_user}. Link: https://{get_workspace_id()}.slack.com/archives/{channel_id}",
                     },
                     "escalation_policy": {
                         "id": self.escalation_policy_id,
@@ -8,11 +8,13 @@ from incidentbot.models.incident import IncidentDatabaseInterface
 from apscheduler.schedulers.background import BackgroundScheduler
 from incidentbot.slack.client import (
     get_digest_channel_id,
+    load_slack_usergroup_directory,
+    save_cache_snapshot,
     slack_web_client,
     store_slack_channel_list_db,
     store_slack_user_list_db,
 )
-from incidentbot.util import gen
+from incidentbot.util.readiness import readiness
 from zoneinfo import ZoneInfo
 
 configured_timezone = settings.options.timezone
@@ -91,64 +93,52 @@ def scrape_for_aging_incidents():
         {"type": "divider"},
     ]
 
-    # Find open incidents and append them to a list to add to the message if they're older
-    # than the max age
-    open_incidents = IncidentDatabaseInterface.list_all()
+    # Find incidents older than the max age, excluding any ignored statuses
+    now = datetime.datetime.now()
+    formatted_incidents = []
 
-    # Exclude statuses if provided
-    if (
-        settings.jobs
-        and settings.jobs.scrape_for_aging_incidents.ignore_statuses
+    for inc in IncidentDatabaseInterface.iter_all(
+        created_before=now - datetime.timedelta(days=max_age),
+        exclude_statuses=(
+            settings.jobs.scrape_for_aging_incidents.ignore_statuses
+            if settings.jobs
+            else None
+        ),
     ):
-        open_incidents = [
-            i
-            for i in open_incidents
-            if i.status
-            not in settings.jobs.scrape_for_aging_incidents.ignore_statuses
-        ]
-
-    formatted_incidents = []
-    for inc in open_incidents:
-        created_at = datetime.datetime.strptime(
-            inc.created_at, gen.timestamp_fmt
+        time_open = now - inc.created_at
+        logger.info(
+            f"{inc.channel_id} is older than {max_age} days and will be "
+            + "added to the weekly reminder"
         )
-        now = datetime.datetime.now()
-        time_open = now - created_at
-        old = datetime.timedelta(days=max_age) < time_open
-        if old:
-            logger.info(
-                f"{inc.channel_id} is older than {max_age} days and will be "
-                + "added to the weekly reminder"
-            )
 
-            formatted_incidents.append(
-                {
-                    "type": "section",
-                    "fields": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Incident Name:* <#{inc.channel_id}>",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Current Severity:* {inc.severity.upper()}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Creation Time:* {inc.created_at}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Current Status:* {inc.status.title()}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Time Open:* {time_open}",
-                        },
-                    ],
-                }
-            )
-            formatted_incidents.append({"type": "divider"})
+        formatted_incidents.append(
+            {
+                "type": "section",
+                "fields": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Incident Name:* <#{inc.channel_id}>",
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Current Severity:* {inc.severity.upper()}",
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Creation Time:* {inc.created_at}",
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Current Status:* {inc.status.title()}",
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Time Open:* {time_open}",
+                    },
+                ],
+            }
+        )
+        formatted_incidents.append({"type": "divider"})
     if len(formatted_incidents) > 0:
         for inc in formatted_incidents:
             base_block.append(inc)
@@ -183,6 +173,7 @@ def update_slack_channel_list():
 
     try:
         store_slack_channel_list_db()
+        readiness.done("slack_channels")
     except Exception as error:
         logger.error(
             f"Error updating Slack channel list information in scheduled job: {error}"
@@ -194,7 +185,7 @@ process.scheduler.add_job(
     func=update_slack_channel_list,
     trigger="interval",
     name="Update local copy of Slack channels",
-    minutes=15,
+    hours=12,
     replace_existing=True,
 )
 
@@ -206,6 +197,7 @@ def update_slack_user_list():
 
     try:
         store_slack_user_list_db()
+        readiness.done("slack_users")
     except Exception as error:
         logger.error(
             f"Error updating Slack user list information in scheduled job: {error}"
@@ -217,7 +209,52 @@ process.scheduler.add_job(
     func=update_slack_user_list,
     trigger="interval",
     name="Update local copy of Slack users",
-    minutes=15,
+    hours=12,
+    replace_existing=True,
+)
+
+
+def update_slack_usergroups():
+    """
+    Uses Slack API to fetch the current user groups and their members
+    """
+
+    try:
+        load_slack_usergroup_directory(refresh=True)
+        readiness.done("slack_usergroups")
+    except Exception as error:
+        logger.error(
+            f"Error updating Slack user group information in scheduled job: {error}"
+        )
+
+
+process.scheduler.add_job(
+    id="update_slack_usergroups",
+    func=update_slack_usergroups,
+    trigger="interval",
+    name="Update local copy of Slack user groups",
+    hours=1,
+    replace_existing=True,
+)
+
+
+def update_cache_snapshot():
+    """
+    Writes the Slack caches to the local snapshot file for fast restarts
+    """
+
+    try:
+        save_cache_snapshot()
+    except Exception as error:
+        logger.error(f"Error writing cache snapshot in scheduled job: {error}")
+
+
+process.scheduler.add_job(
+    id="update_cache_snapshot",
+    func=update_cache_snapshot,
+    trigger="interval",
+    name="Update local snapshot of Slack caches",
+    minutes=10,
     replace_existing=True,
 )
 
@@ -0,0 +1,296 @@
+import asyncio
+import threading
+
+from functools import wraps
+from incidentbot.configuration.settings import settings
+from incidentbot.exceptions import ConfigurationError, UnitOfWorkError
+from incidentbot.incident.actions import (
+    archive_incident_channel,
+    export_chat_logs,
+    join_incident_as_role,
+    leave_incident_as_role,
+    set_severity as set_incident_severity,
+    set_status as set_incident_status,
+)
+from incidentbot.logging import logger
+from incidentbot.models.incident import IncidentDatabaseInterface
+from incidentbot.models.slack import SlackBlockActionsResponse, User
+from incidentbot.models.unit_of_work import begin, end
+from incidentbot.slack.client import slack_async_api
+from incidentbot.slack.handler import (
+    app as sync_app,
+    report_unit_of_work_error,
+)
+from incidentbot.slack.util import parse_modal_values
+from slack_bolt import App
+from slack_bolt.adapter.socket_mode.async_handler import (
+    AsyncSocketModeHandler,
+)
+from slack_bolt.adapter.socket_mode.async_internals import (
+    run_async_bolt_app,
+    send_async_response,
+)
+from slack_bolt.adapter.socket_mode.internals import run_bolt_app
+from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
+from time import time
+from typing import Any, Awaitable, Callable
+
+try:
+    from aiohttp import ClientSession, TCPConnector
+except ImportError:
+    raise ConfigurationError(
+        "aiohttp must be installed to use the async runtime, "
+        + "e.g. with the async extra"
+    )
+
+# Maximum number of pooled connections to the Slack API
+connection_pool_size = 100
+
+"""
+Runtime
+"""
+
+
+class IncidentAsyncApp(AsyncApp):
+    """
+    AsyncApp that stays quiet about requests it has no listener for, since
+    those are handed to the synchronous app rather than dropped
+    """
+
+    def _handle_unmatched_requests(self, req, resp):
+        return resp
+
+
+class BridgedSocketModeHandler(AsyncSocketModeHandler):
+    """
+    Socket Mode handler that serves requests with native async listeners
+    where they exist and hands everything else to the synchronous app on a
+    worker thread
+
+    Parameters:
+        app (AsyncApp): App holding the native async listeners
+        fallback (App): Synchronous app for all other requests
+        app_token (str): App-level token starting with xapp-
+    """
+
+    def __init__(self, app: AsyncApp, fallback: App, app_token: str):
+        super().__init__(app, app_token)
+        self.fallback = fallback
+
+    async def handle(self, client, req):
+        start = time()
+
+        bolt_resp = await run_async_bolt_app(self.app, req)
+        if bolt_resp.status == 404:
+            bolt_resp = await asyncio.to_thread(
+                run_bolt_app, self.fallback, req
+            )
+
+        await send_async_response(client, req, bolt_resp, start)
+
+
+def in_unit_of_work(
+    listener: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Run a native async listener in its own unit of work, as the synchronous
+    app does for its listeners, committing off the event loop and reporting
+    updates that couldn't be written
+
+    Parameters:
+        listener (Callable): Listener taking ack and body
+    """
+
+    @wraps(listener)
+    async def run(ack, body):
+        uow, token = begin()
+
+        try:
+            return await listener(ack, body)
+        finally:
+            end(uow, token)
+
+            try:
+                await asyncio.to_thread(uow.commit)
+            except UnitOfWorkError as error:
+                await asyncio.to_thread(report_unit_of_work_error, error, body)
+
+    return run
+
+
+def build_app(client: AsyncWebClient) -> AsyncApp:
+    """
+    Return an AsyncApp with native listeners for incident actions
+
+    Parameters:
+        client (AsyncWebClient): Client for the app to use
+    """
+
+    app = IncidentAsyncApp(client=client)
+
+    @app.action("incident.archive_incident_channel")
+    @in_unit_of_work
+    async def handle_incident_archive_incident_channel(ack, body):
+        await ack()
+        parsed_body = SlackBlockActionsResponse(**body)
+
+        await archive_incident_channel(channel_id=parsed_body.channel.id)
+
+    @app.action("incident.export_chat_logs")
+    @in_unit_of_work
+    async def handle_incident_export_chat_logs(ack, body):
+        await ack()
+        parsed_body = SlackBlockActionsResponse(**body)
+
+        await export_chat_logs(
+            channel_id=parsed_body.channel.id, user=parsed_body.user.name
+        )
+
+    for role in settings.roles:
+
+        @app.action(f"incident.join_this_incident_{role}")
+        @in_unit_of_work
+        async def handle_join_this_incident(ack, body):
+            await ack()
+            parsed_body = SlackBlockActionsResponse(**body)
+
+            await join_incident_as_role(
+                channel_id=parsed_body.channel.id,
+                role=parsed_body.actions[0]
+                .get("value")
+                .replace("join_this_incident_", ""),
+                user=parsed_body.user,
+            )
+
+    @app.action("incident.leave_this_incident")
+    @in_unit_of_work
+    async def handle_leave_this_incident(ack, body):
+        await ack()
+        parsed_body = SlackBlockActionsResponse(**body)
+        role = (
+            parsed_body.actions[0]
+            .get("value")
+            .replace("leave_this_incident_as_", "")
+        )
+
+        incident = await asyncio.to_thread(
+            IncidentDatabaseInterface.get_one,
+            channel_name=parsed_body.channel.name,
+        )
+        has_role = await asyncio.to_thread(
+            IncidentDatabaseInterface.check_role_assigned_to_user,
+            incident=incident,
+            role=role,
+            user=parsed_body.user,
+        )
+
+        if has_role:
+            await leave_incident_as_role(
+                channel_id=parsed_body.channel.id,
+                role=role,
+                user=parsed_body.user,
+            )
+
+    @app.action("incident.set_severity")
+    @in_unit_of_work
+    async def handle_incident_set_severity(ack, body):
+        await ack()
+        parsed_body = SlackBlockActionsResponse(**body)
+
+        await set_incident_severity(
+            channel_id=parsed_body.channel.id,
+            severity=parsed_body.actions[0]
+            .get("selected_option")
+            .get("value"),
+            user=parsed_body.user,
+        )
+
+    @app.action("incident.set_status")
+    @in_unit_of_work
+    async def handle_incident_set_status(ack, body):
+        await ack()
+        parsed_body = SlackBlockActionsResponse(**body)
+
+        await set_incident_status(
+            channel_id=parsed_body.channel.id,
+            status=parsed_body.actions[0].get("selected_option").get("value"),
+            user=parsed_body.user,
+        )
+
+    @app.view("incident.set_this_severity_modal")
+    @in_unit_of_work
+    async def handle_set_this_severity_submission(ack, body):
+        await ack()
+        channel_id = (
+            body.get("view").get("blocks")[0].get("block_id").split("_")[-1]
+        )
+
+        await set_incident_severity(
+            channel_id=channel_id,
+            severity=parse_modal_values(body).get(
+                "incident.set_this_severity"
+            ),
+            user=User(**body.get("user")),
+        )
+
+    @app.view("incident.set_this_status_modal")
+    @in_unit_of_work
+    async def handle_set_this_status_submission(ack, body):
+        await ack()
+        channel_id = (
+            body.get("view").get("blocks")[0].get("block_id").split("_")[-1]
+        )
+
+        await set_incident_status(
+            channel_id=channel_id,
+            status=parse_modal_values(body).get("incident.set_this_status"),
+            user=User(**body.get("user")),
+        )
+
+    return app
+
+
+async def serve(app_token: str):
+    """
+    Serve Slack requests over Socket Mode until cancelled
+
+    Parameters:
+        app_token (str): App-level token starting with xapp-
+    """
+
+    session = ClientSession(connector=TCPConnector(limit=connection_pool_size))
+    # Rate limited calls are retried by slack_async_api against the
+    # gateway's buckets rather than by the client
+    client = AsyncWebClient(token=settings.SLACK_BOT_TOKEN, session=session)
+    slack_async_api.bind(client)
+
+    try:
+        handler = BridgedSocketModeHandler(
+            build_app(client), sync_app, app_token
+        )
+        await handler.start_async()
+    finally:
+        slack_async_api.unbind()
+        await session.close()
+
+
+def start(app_token: str) -> threading.Thread:
+    """
+    Run the async runtime on its own event loop in a background thread
+
+    Parameters:
+        app_token (str): App-level token starting with xapp-
+    """
+
+    logger.info("Starting async Slack runtime...")
+
+    thread = threading.Thread(
+        target=asyncio.run,
+        args=(serve(app_token),),
+        name="slack-async-runtime",
+        daemon=True,
+    )
+    thread.start()
+
+    return thread
@@ -1,168 +1,154 @@
 import datetime
-import json
-import time
+import os
+import re
+import tempfile
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
 from incidentbot.configuration.settings import settings
-from incidentbot.exceptions import IndexNotFoundError
+from incidentbot.exceptions import IndexNotFoundError, SnapshotError
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, ApplicationData
-from incidentbot.util import gen
+from incidentbot.models.database import engine, SlackChannel, SlackUser
+from incidentbot.slack.directory import (
+    channel_directory,
+    channel_member_cache,
+    user_directory,
+    usergroup_directory,
+)
+from incidentbot.slack.gateway import AsyncSlackApi, SlackApiGateway
+from incidentbot.util.snapshot import read_snapshot, write_snapshot
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-from sqlalchemy import update
-from sqlmodel import Session, select
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, col, select
 
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-# Initialize Slack clients
+# Initialize Slack clients - no API calls are made until they are needed
 slack_web_client = WebClient(token=settings.SLACK_BOT_TOKEN)
-slack_web_client_auth_test = slack_web_client.auth_test()
+
+# Rate limit aware access to the Slack Web API
+slack_api = SlackApiGateway(slack_web_client)
+
+# Awaitable access for async code, see incidentbot.slack.async_runtime
+slack_async_api = AsyncSlackApi(slack_api)
 
 """
 Reusable variables
 """
 
-all_workspace_groups = (
-    slack_web_client.usergroups_list()
-    if not settings.IS_TEST_ENVIRONMENT
-    else []
-)
+# Users to skip invites for
+skip_invite_for_users = ["api", "web"]
 
-bot_user_id = (
-    slack_web_client_auth_test.get("user_id")
-    if not settings.IS_TEST_ENVIRONMENT
-    else "test"
+# Maximum number of users Slack accepts in a single conversations.invite call
+invite_chunk_size = 1000
+
+# conversations.invite errors caused by one of the users being invited rather
+# than by the channel or the token, which are the only ones worth retrying the
+# rest of a chunk for
+invite_user_errors = (
+    "already_in_channel",
+    "cant_invite",
+    "cant_invite_self",
+    "no_user",
+    "ura_max_channels",
+    "user_is_restricted",
+    "user_is_ultra_restricted",
+    "user_not_found",
 )
 
-bot_user_name = (
-    slack_web_client_auth_test.get("user")
-    if not settings.IS_TEST_ENVIRONMENT
-    else "test"
-)
+# Number of threads to fetch replies for at once when exporting history
+thread_reply_workers = 8
 
-slack_workspace_id = (
-    slack_web_client_auth_test.get("url").replace("https://", "").split(".")[0]
-    if not settings.IS_TEST_ENVIRONMENT
-    else "test"
-)
+# User mentions in message text, e.g. <@U012AB3CD> or <@U012AB3CD|name>
+mention_pattern = re.compile(r"<@([A-Z0-9]+)(?:\|[^>]*)?>")
 
-# Users to skip invites for
-skip_invite_for_users = ["api", "web"]
+# Guard the initial load of the directories from the database
+_channel_directory_lock = threading.Lock()
+_channel_member_lock = threading.Lock()
+_user_directory_lock = threading.Lock()
+_usergroup_directory_lock = threading.Lock()
+
+# Workspace metadata, fetched on first use
+_metadata_lock = threading.Lock()
+_auth_test: dict[str, Any] | None = None
 
 
 """
-Conversations
+Workspace
 """
 
 
-def get_channel_history(channel_id: str) -> str:
+def get_auth_test(refresh: bool = False) -> dict[str, Any]:
     """
-    Return the history of a Slack channel as a json string object
+    Return the result of auth.test for the bot token
+
+    The API is only called the first time, later calls return the same result
 
     Parameters:
-        channel_id (str): The ID of the Slack channel to retrieve history from
+        refresh (bool): Call the API even if there is a result already
     """
 
-    history_dict_list = []
+    global _auth_test
 
-    try:
-        res = slack_web_client.conversations_history(
-            channel=channel_id, limit=200
-        )
+    with _metadata_lock:
+        if _auth_test is None or refresh:
+            _auth_test = (
+                slack_api.auth_test().data
+                if not settings.IS_TEST_ENVIRONMENT
+                else {
+                    "url": "https://test.slack.com/",
+                    "user": "test",
+                    "user_id": "test",
+                }
+            )
 
-        while res:
-            history_dict_list += res.get("messages")
+        return _auth_test
 
-            if res.get("has_more"):
-                res = slack_web_client.conversations_history(
-                    channel=channel_id,
-                    limit=200,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_history(
-                channel=channel_id, limit=200
-            )
 
-            while res:
-                history_dict_list += res.get("messages")
+def get_bot_user_id() -> str:
+    """
+    Return the user ID of the bot user
+    """
 
-                if res.get("has_more"):
-                    res = slack_web_client.conversations_history(
-                        channel=channel_id,
-                        limit=200,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                    )
-                else:
-                    res = None
-        else:
-            raise error
+    return get_auth_test().get("user_id")
 
-    history_dict_reversed = []
 
-    for item in reversed(history_dict_list):
-        history_dict_reversed.append(item)
+def get_bot_user_name() -> str:
+    """
+    Return the name of the bot user
+    """
 
-    return json.dumps(history_dict_reversed)
+    return get_auth_test().get("user")
 
 
-def get_channel_list() -> dict[str, str]:
+def get_workspace_id() -> str:
     """
-    Return a list of Slack channels
+    Return the workspace subdomain, e.g. example for example.slack.com
     """
 
-    channels = []
+    return get_auth_test().get("url").replace("https://", "").split(".")[0]
 
-    try:
-        res = slack_web_client.conversations_list(
-            exclude_archived=True,
-            limit=1000,
-        )
 
-        while res:
-            channels += res.get("channels")
+"""
+Conversations
+"""
 
-            if res.get("response_metadata").get("next_cursor") != "":
-                res = slack_web_client.conversations_list(
-                    exclude_archived=True,
-                    limit=1000,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_list(
-                exclude_archived=True,
-                limit=1000,
-            )
 
-            while res:
-                channels += res.get("channels")
+def get_channel_list() -> dict[str, str]:
+    """
+    Return a list of Slack channels
+    """
 
-                if res.get("response_metadata").get("next_cursor") != "":
-                    res = slack_web_client.conversations_list(
-                        exclude_archived=True,
-                        limit=1000,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                    )
-                else:
-                    res = None
-        else:
-            raise error
+    channels = list(
+        slack_api.paginate(
+            "conversations_list",
+            "channels",
+            exclude_archived=True,
+            limit=1000,
+        )
+    )
 
     logger.info(f"Found {len(channels)} Slack channels")
 
@@ -177,13 +163,15 @@ def get_channel_name(channel_id: str) -> str:
         channel_id (str): Channel ID
     """
 
-    channels = get_slack_channel_list_db()
-    index = gen.find_index_in_list(channels, "id", channel_id)
-    if index == -1:
+    if not channel_directory.loaded:
+        load_slack_channel_directory()
+
+    channel = channel_directory.get_by_id(channel_id)
+    if channel is None:
         raise IndexNotFoundError(
             "Could not find index for channel in Slack conversations list"
         )
-    return channels[index].get("name")
+    return channel.get("name")
 
 
 def get_digest_channel_id() -> str:
@@ -191,144 +179,177 @@ def get_digest_channel_id() -> str:
     Get channel id of the incidents digest channel to send updates to
     """
 
-    channels = get_slack_channel_list_db()
-    index = gen.find_index_in_list(channels, "name", settings.digest_channel)
-    if index == -1:
+    if not channel_directory.loaded:
+        load_slack_channel_directory()
+
+    digest_channel_id = channel_directory.digest_channel_id(
+        settings.digest_channel
+    )
+    if digest_channel_id is None:
         raise IndexNotFoundError(
             "Could not find index for digest channel in Slack conversations list"
         )
-    return channels[index].get("id")
+    return digest_channel_id
 
 
-def get_formatted_channel_history(channel_id: str, channel_name: str) -> str:
+def iter_formatted_channel_history(
+    channel_id: str, channel_name: str
+) -> Iterator[str]:
     """
-    Return the history of a Slack channel as a formatted string
+    Yield the history of a Slack channel as formatted lines, oldest first
+
+    User ids, both as message authors and as mentions, are resolved against
+    the user directory as each line is formatted
 
     Parameters:
         channel_id (str): The ID of the Slack channel to retrieve history from
         channel_name (str): The name of the Slack channel to retrieve history from
     """
 
-    try:
-        users = slack_web_client.users_list()["members"]
-        replaced_messages_string = replace_user_ids(
-            get_channel_history(channel_id), users
-        )
+    if not user_directory.loaded:
+        load_slack_user_directory()
+
+    def display_name(user_id: str) -> str:
+        user = user_directory.get_by_id(user_id)
+        if user is None:
+            return user_id
+
+        return user.get("real_name") or user.get("name")
 
-        formatted_channel_history = str()
-        formatted_channel_history += (
-            f"Slack channel history for incident {channel_name}\n"
+    messages = list(
+        slack_api.paginate(
+            "conversations_history",
+            "messages",
+            channel=channel_id,
+            limit=200,
         )
+    )
+    messages.extend(get_thread_replies(channel_id, messages))
 
-        for message in replaced_messages_string:
-            user = message["user"]
-            text = message["text"]
-            timestamp = datetime.datetime.fromtimestamp(
-                int(message["ts"].split(".")[0])
-            )
-            prefix = f"* {timestamp}"
-            if "has joined the channel" in text:
-                formatted_channel_history += (
-                    f"{prefix} {user} joined the channel\n"
-                )
-            elif "set the channel topic" in text:
-                formatted_channel_history += f"{prefix} {user} {text}\n"
-            elif "This content can't be displayed." in text:
-                pass
-            else:
-                formatted_channel_history += f"{prefix} {user}: {text}\n"
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            users = slack_web_client.users_list()["members"]
-            replaced_messages_string = replace_user_ids(
-                get_channel_history(channel_id), users
-            )
+    # Slack returns history newest first, and replies follow their parents
+    messages.sort(key=lambda message: float(message["ts"]))
 
-            formatted_channel_history = str()
-            formatted_channel_history += (
-                f"Slack channel history for incident {channel_name}\n"
-            )
+    yield f"Slack channel history for incident {channel_name}\n"
 
-            for message in replaced_messages_string:
-                user = message["user"]
-                text = message["text"]
-                timestamp = datetime.datetime.fromtimestamp(
-                    int(message["ts"].split(".")[0])
-                )
-                prefix = f"* {timestamp}"
-                if "has joined the channel" in text:
-                    formatted_channel_history += (
-                        f"{prefix} {user} joined the channel\n"
-                    )
-                elif "set the channel topic" in text:
-                    formatted_channel_history += f"{prefix} {user} {text}\n"
-                elif "This content can't be displayed." in text:
-                    pass
-                else:
-                    formatted_channel_history += f"{prefix} {user}: {text}\n"
+    for message in messages:
+        user = display_name(message.get("user") or message.get("bot_id"))
+        text = mention_pattern.sub(
+            lambda match: display_name(match.group(1)),
+            message.get("text", ""),
+        )
+        timestamp = datetime.datetime.fromtimestamp(
+            int(message["ts"].split(".")[0])
+        )
+        prefix = f"* {timestamp}"
+        if message.get("thread_ts") not in (None, message["ts"]):
+            prefix += " (thread)"
+
+        if "has joined the channel" in text:
+            yield f"{prefix} {user} joined the channel\n"
+        elif "set the channel topic" in text:
+            yield f"{prefix} {user} {text}\n"
+        elif "This content can't be displayed." in text:
+            continue
         else:
-            raise error
+            yield f"{prefix} {user}: {text}\n"
 
-    return formatted_channel_history
 
-
-def get_conversation_members(channel_id: str) -> list[str]:
+def get_thread_replies(
+    channel_id: str, messages: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
     """
-    Retrieves Slack users as members of a channel (conversation)
+    Return the replies to every threaded message in a list of messages
+
+    Threads are fetched concurrently, each call still waiting its turn for
+    the conversations.replies rate limit
 
     Parameters:
-        channel_id (str): Channel ID
+        channel_id (str): The ID of the Slack channel the messages are from
+        messages (list[dict[str, Any]]): Messages from conversations.history
     """
 
-    members = []
+    parents = [
+        message["ts"]
+        for message in messages
+        if message.get("reply_count")
+        and message.get("thread_ts") == message["ts"]
+    ]
 
-    try:
-        res = slack_web_client.conversations_members(
-            channel=channel_id, limit=200
-        )
+    def replies(ts: str) -> list[dict[str, Any]]:
+        return [
+            reply
+            for reply in slack_api.paginate(
+                "conversations_replies",
+                "messages",
+                channel=channel_id,
+                ts=ts,
+                limit=200,
+            )
+            # The parent is returned as the first message of the thread
+            if reply["ts"] != ts
+        ]
 
-        while res:
-            members += res.get("members")
+    if not parents:
+        return []
 
-            if res.get("response_metadata").get("next_cursor") != "":
-                res = slack_web_client.conversations_members(
-                    channel=channel_id,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                    limit=200,
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_members(
-                channel=channel_id, limit=200
+    with ThreadPoolExecutor(
+        max_workers=min(thread_reply_workers, len(parents))
+    ) as executor:
+        return [
+            reply
+            for thread in executor.map(replies, parents)
+            for reply in thread
+        ]
+
+
+def write_formatted_channel_history(channel_id: str, channel_name: str) -> str:
+    """
+    Write the formatted history of a Slack channel to a temporary file and
+    return its path
+
+    The caller is responsible for removing the file. If the history can't be
+    retrieved, the partial file is removed before the error is raised.
+
+    Parameters:
+        channel_id (str): The ID of the Slack channel to retrieve history from
+        channel_name (str): The name of the Slack channel to retrieve history from
+    """
+
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        encoding="utf-8",
+        prefix=f"{channel_name}-",
+        suffix=".txt",
+        delete=False,
+    ) as f:
+        try:
+            f.writelines(
+                iter_formatted_channel_history(channel_id, channel_name)
             )
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
 
-            while res:
-                members += res.get("members")
+    return f.name
 
-                if res.get("response_metadata").get("next_cursor") != "":
-                    res = slack_web_client.conversations_members(
-                        channel=channel_id,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                        limit=200,
-                    )
-                else:
-                    res = None
-        else:
-            raise error
 
-    return members
+def get_conversation_members(channel_id: str) -> list[str]:
+    """
+    Retrieves Slack users as members of a channel (conversation)
+
+    Parameters:
+        channel_id (str): Channel ID
+    """
+
+    return list(
+        slack_api.paginate(
+            "conversations_members",
+            "members",
+            channel=channel_id,
+            limit=200,
+        )
+    )
 
 
 def get_message_content(conversation_id: str, ts: str):
@@ -341,22 +362,9 @@ def get_message_content(conversation_id: str, ts: str):
         ts (str): Timestamp field
     """
 
-    try:
-        result = slack_web_client.conversations_history(
-            channel=conversation_id, inclusive=True, oldest=ts, limit=1
-        )
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            result = slack_web_client.conversations_history(
-                channel=conversation_id, inclusive=True, oldest=ts, limit=1
-            )
-        else:
-            raise error
+    result = slack_api.conversations_history(
+        channel=conversation_id, inclusive=True, oldest=ts, limit=1
+    )
 
     return result["messages"][0]
 
@@ -368,18 +376,36 @@ def get_slack_channel_list_db() -> list[dict]:
 
     try:
         with Session(engine) as session:
-            record = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_channels"
-                )
-            ).first()
+            channels = session.exec(
+                select(SlackChannel).order_by(SlackChannel.name)
+            )
 
-            return record.json_data
+            return [
+                {"id": channel.id, "name": channel.name}
+                for channel in channels
+            ]
     except Exception as error:
         logger.error(
             f"Error retrieving list of Slack channels from db: {error}"
         )
 
+        return []
+
+
+def load_slack_channel_directory():
+    """
+    Populate the in-memory channel directory from the local database
+    """
+
+    with _channel_directory_lock:
+        if channel_directory.loaded:
+            return
+
+        channels = get_slack_channel_list_db()
+
+        if channels:
+            channel_directory.rebuild(channels)
+
 
 def invite_user_to_channel(channel_id: str, user: str):
     """
@@ -390,70 +416,207 @@ def invite_user_to_channel(channel_id: str, user: str):
         user (str): User ID
     """
 
-    if (
-        user not in get_conversation_members(channel_id)
-        and user not in skip_invite_for_users
-    ):
+    error = invite_users_to_channel(channel_id, [user]).get(user)
+
+    if error:
+        raise SlackApiError(
+            f"Could not invite {user} to {channel_id}", {"error": error}
+        )
+
+
+def invite_users_to_channel(
+    channel_id: str, users: Iterable[str]
+) -> dict[str, str | None]:
+    """
+    Invite many users to a Slack channel at once
+
+    Duplicates and users already in the channel are skipped, the rest are
+    invited in chunks of invite_chunk_size. When Slack rejects a chunk because
+    of some of its users, they are set aside and only the remainder is
+    retried. Errors with the channel or the token fail every user at once.
+
+    Returns the result for each user: None if they were invited or were
+    already in the channel, otherwise the error from Slack
+
+    Parameters:
+        channel_id (str): Channel ID
+        users (Iterable[str]): User IDs
+    """
+
+    targets = sorted(set(users) - set(skip_invite_for_users))
+
+    if channel_id not in channel_member_cache:
+        with _channel_member_lock:
+            if channel_id not in channel_member_cache:
+                channel_member_cache.seed(
+                    channel_id, get_conversation_members(channel_id)
+                )
+
+    results = {
+        user: None
+        for user in targets
+        if channel_member_cache.has_member(channel_id, user)
+    }
+    pending = [user for user in targets if user not in results]
+
+    chunks = [
+        pending[i : i + invite_chunk_size]
+        for i in range(0, len(pending), invite_chunk_size)
+    ]
+
+    while chunks:
+        chunk = chunks.pop()
+
         try:
-            slack_web_client.conversations_invite(
-                channel=channel_id,
-                users=user,
+            resp = slack_api.conversations_invite(
+                channel=channel_id, users=",".join(chunk), force=True
             )
+            errors = resp.get("errors") or []
         except SlackApiError as error:
-            if error.response.status_code == 429:
-                delay = int(error.response.headers["Retry-After"])
-                logger.warning(
-                    f"Rate limited by Slack API. Retrying in {delay} seconds..."
-                )
-                time.sleep(delay)
-                slack_web_client.conversations_invite(
-                    channel=channel_id,
-                    users=user,
-                )
+            reason = error.response.get("error")
+            errors = [
+                e
+                for e in error.response.get("errors") or []
+                if e.get("user") in chunk
+            ]
+
+            if not errors:
+                if reason not in invite_user_errors:
+                    # Nobody in the batch can be invited, so don't retry
+                    logger.error(
+                        f"Error inviting users to channel {channel_id}: {reason}"
+                    )
+                    for user in chunk + [u for c in chunks for u in c]:
+                        results[user] = reason
+
+                    break
+
+                # Without per user errors there's no telling who was
+                # rejected, so split the chunk until they are on their own
+                if len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    chunks.extend([chunk[:middle], chunk[middle:]])
+                else:
+                    results[chunk[0]] = reason
+
+                continue
+
+            # The call failed as a whole, so retry everyone Slack didn't
+            # name rather than assuming they were invited
+            failed = {e.get("user") for e in errors}
+            retry = [user for user in chunk if user not in failed]
+            if retry:
+                chunks.append(retry)
+
+            chunk = []
+
+        for e in errors:
+            if not e.get("user"):
+                continue
+
+            if e.get("error") == "already_in_channel":
+                results[e.get("user")] = None
+                channel_member_cache.add(channel_id, e.get("user"))
             else:
-                raise error
+                results[e.get("user")] = e.get("error")
+
+        for user in chunk:
+            if user not in results:
+                results[user] = None
+                channel_member_cache.add(channel_id, user)
+
+    return results
+
+
+def record_channel_member_joined(channel_id: str, user: str):
+    """
+    Keep the cached members of a channel current when a user joins it
+
+    Parameters:
+        channel_id (str): Channel ID
+        user (str): User ID
+    """
+
+    channel_member_cache.add(channel_id, user)
+
+
+def record_channel_member_left(channel_id: str, user: str):
+    """
+    Keep the cached members of a channel current when a user leaves it
+
+    Parameters:
+        channel_id (str): Channel ID
+        user (str): User ID
+    """
+
+    channel_member_cache.discard(channel_id, user)
 
 
 def store_slack_channel_list_db():
     """
     Retrieves information about Slack channels for a workspace and stores
     it in the database
+
+    Channels are kept up to date by Slack events as they change, so this only
+    needs to run occasionally to reconcile anything that was missed
     """
 
     logger.info("[running task update_slack_channel_list]")
 
+    channels = [
+        {"id": channel["id"], "name": channel["name"]}
+        for channel in get_channel_list()
+    ]
+
+    with Session(engine) as session:
+        changed, removed = _sync_rows(session, SlackChannel, channels)
+        session.commit()
+        logger.info(
+            f"Stored current Slack channels in database ({changed} changed, {removed} removed)..."
+        )
+
+    channel_directory.rebuild(channels)
+
+
+def store_slack_channel(channel: dict[str, Any]):
+    """
+    Store a single channel, e.g. when one is created or renamed
+
+    Parameters:
+        channel (dict[str, Any]): Channel object from a Slack event
+    """
+
+    channel = {"id": channel["id"], "name": channel["name"]}
+
     try:
         with Session(engine) as session:
-            record_name = "slack_channels"
+            _upsert_rows(session, SlackChannel, [channel])
+            session.commit()
 
-            # Create the row if it doesn't exist
-            if not session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == record_name
-                )
-            ).all():
-                try:
-                    row = ApplicationData(name=record_name)
-                    session.add(row)
-                    session.commit()
-                except Exception as error:
-                    logger.error(
-                        f"ApplicationData row create failed for {record_name}: {error}"
-                    )
+        channel_directory.upsert(channel)
+    except Exception as error:
+        logger.error(f"Error storing Slack channel {channel['id']}: {error}")
+
+
+def delete_slack_channel(channel_id: str):
+    """
+    Remove a single channel, e.g. when one is archived or deleted
+
+    Parameters:
+        channel_id (str): Channel ID
+    """
 
+    try:
+        with Session(engine) as session:
             session.exec(
-                update(ApplicationData)
-                .where(ApplicationData.name == record_name)
-                .values(
-                    json_data=get_channel_list(),
-                )
+                delete(SlackChannel).where(SlackChannel.id == channel_id)
             )
             session.commit()
-            logger.info("Stored current Slack channels in database...")
+
+        channel_directory.remove(channel_id)
+        channel_member_cache.forget(channel_id)
     except Exception as error:
-        logger.error(
-            f"ApplicationData row edit failed for {record_name}: {error}"
-        )
+        logger.error(f"Error removing Slack channel {channel_id}: {error}")
 
 
 """
@@ -468,37 +631,11 @@ def check_bot_user_in_digest_channel():
 
     digest_channel_id = get_digest_channel_id()
 
-    try:
-        if (
-            bot_user_id
-            not in slack_web_client.conversations_members(
-                channel=digest_channel_id
-            )["members"]
-        ):
-            slack_web_client.conversations_join(channel=digest_channel_id)
-            logger.info(
-                f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
-            )
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-
-            if (
-                bot_user_id
-                not in slack_web_client.conversations_members(
-                    channel=digest_channel_id
-                )["members"]
-            ):
-                slack_web_client.conversations_join(channel=digest_channel_id)
-                logger.info(
-                    f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
-                )
-        else:
-            raise error
+    if get_bot_user_id() not in get_conversation_members(digest_channel_id):
+        slack_api.conversations_join(channel=digest_channel_id)
+        logger.info(
+            f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
+        )
     else:
         logger.info(
             f"Bot user is already present in digest channel #{get_channel_name(channel_id=digest_channel_id)}"
@@ -515,140 +652,143 @@ def check_user_in_group(user_id: str, group_name: str) -> bool:
         group_name (str): Name of the group
     """
 
-    all_groups = all_workspace_groups.get("usergroups")
+    if not usergroup_directory.loaded:
+        load_slack_usergroup_directory()
 
-    try:
-        target_group = [g for g in all_groups if g["handle"] == group_name]
-
-        if len(target_group) == 0:
-            logger.error(f"Couldn't find group {group_name}")
-            return False
-
-        target_group_members = slack_web_client.usergroups_users_list(
-            usergroup=target_group[0].get("id"),
-        ).get("users")
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            target_group = [g for g in all_groups if g["handle"] == group_name]
+    if usergroup_directory.get_by_handle(group_name) is None:
+        logger.error(f"Couldn't find group {group_name}")
+        return False
 
-            if len(target_group) == 0:
-                logger.error(f"Couldn't find group {group_name}")
-                return False
+    return user_id in usergroup_directory.members(group_name)
 
-            target_group_members = slack_web_client.usergroups_users_list(
-                usergroup=target_group[0].get("id"),
-            ).get("users")
-        else:
-            raise error
 
-    if user_id in target_group_members:
-        return True
+def get_usergroup_members(group_name: str) -> frozenset[str]:
+    """
+    Return the IDs of the members of a user group
+
+    Parameters:
+        group_name (str): Handle of the group
+    """
+
+    if not usergroup_directory.loaded:
+        load_slack_usergroup_directory()
 
-    return False
+    return usergroup_directory.members(group_name)
 
 
 def get_slack_user(user_id: str) -> dict | None:
     """
     Get a single user object by id
 
-    This is done against the local database so it won't work unless the job to store
-    slack user data has been run
+    This is served from the in-memory user directory, which is loaded from the
+    local database so it won't work unless the job to store slack user data
+    has been run
 
     Parameters:
         user_id (str): User ID
     """
 
-    with Session(engine) as session:
-        ulist = session.exec(
-            select(ApplicationData).filter(
-                ApplicationData.name == "slack_users"
-            )
-        ).first()
-
-    for obj in ulist.json_data:
-        if user_id in obj.values():
-            return obj
+    if not user_directory.loaded:
+        load_slack_user_directory()
 
-    return None
+    return user_directory.get(user_id)
 
 
-def get_slack_users() -> list[dict[str, Any]]:
+def load_slack_user_directory():
     """
-    Retrieves Slack users from a workspace using pagination
+    Populate the in-memory user directory from the local database
     """
 
-    users = []
+    with _user_directory_lock:
+        if user_directory.loaded:
+            return
 
-    try:
-        res = slack_web_client.users_list()
+        users = get_slack_user_list_db()
 
-        while res:
-            users += res.get("members")
+        if users:
+            user_directory.rebuild(users)
 
-            if res.get("response_metadata").get("next_cursor") != "":
-                res = slack_web_client.users_list(
-                    cursor=res.get("response_metadata").get("next_cursor")
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.users_list()
 
-            while res:
-                users += res.get("members")
+def load_slack_usergroup_directory(refresh: bool = False):
+    """
+    Populate the in-memory user group directory from the Slack API
 
-                if res.get("response_metadata").get("next_cursor") != "":
-                    res = slack_web_client.users_list(
-                        cursor=res.get("response_metadata").get("next_cursor")
-                    )
-                else:
-                    res = None
-        else:
-            raise error
-
-    users_array = [
-        {
-            "name": user["name"],
-            "real_name": user["profile"]["real_name"],
-            "email": user["profile"].get("email"),
-            "id": user["id"],
-        }
-        for user in users
-    ]
+    User groups are kept up to date by Slack events as they change, so this
+    only needs to run occasionally to reconcile anything that was missed
 
-    jdata = sorted(users_array, key=lambda d: d["name"])
+    Parameters:
+        refresh (bool): Reload the directory even if it is populated already
+    """
 
-    logger.info(f"Found {len(users_array)} Slack users")
+    with _usergroup_directory_lock:
+        if usergroup_directory.loaded and not refresh:
+            return
 
-    return jdata
+        groups = (
+            slack_api.usergroups_list(include_users=True).get("usergroups")
+            if not settings.IS_TEST_ENVIRONMENT
+            else []
+        )
+
+        usergroup_directory.rebuild(groups)
+
+        logger.info(f"Found {len(usergroup_directory)} Slack user groups")
 
 
-def replace_user_ids(json_string: str, user_list: dict[str, str]) -> str:
+def get_slack_user_list_db() -> list[dict[str, Any]]:
     """
-    Replace a user's ID with their name and return a json string object
+    Get Slack user list from database
+    """
+
+    try:
+        with Session(engine) as session:
+            users = session.exec(select(SlackUser).order_by(SlackUser.name))
+
+            return [
+                {
+                    "name": user.name,
+                    "real_name": user.real_name,
+                    "email": user.email,
+                    "id": user.id,
+                }
+                for user in users
+            ]
+    except Exception as error:
+        logger.error(f"Error retrieving list of Slack users from db: {error}")
+
+        return []
+
+
+def format_slack_user(user: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the fields of a Slack user object that are stored locally
 
     Parameters:
-        json_string (str): String to replace ID
-        user_list (dict[str, str]): User list for reference
+        user (dict[str, Any]): User object from the Slack API or an event
+    """
+
+    return {
+        "name": user["name"],
+        "real_name": user["profile"]["real_name"],
+        "email": user["profile"].get("email"),
+        "id": user["id"],
+    }
+
+
+def get_slack_users() -> list[dict[str, Any]]:
     """
+    Retrieves Slack users from a workspace using pagination
+    """
+
+    users = list(slack_api.paginate("users_list", "members", limit=200))
 
-    for user in user_list:
-        real_name = user["profile"]["real_name"]
-        user_id = user["id"]
-        json_string = json_string.replace(user_id, real_name)
+    users_array = [format_slack_user(user) for user in users]
 
-    return json.loads(json_string)
+    jdata = sorted(users_array, key=lambda d: d["name"])
+
+    logger.info(f"Found {len(users_array)} Slack users")
+
+    return jdata
 
 
 def store_slack_user_list_db():
@@ -656,36 +796,214 @@ def store_slack_user_list_db():
     Retrieves list of users from Slack organization and stores them using a clean format
     to be retrieved locally to avoid querying the Slack API every time this data
     is desired
+
+    Only users that were added, changed or removed since the last run are written.
+    Users are kept up to date by Slack events as they change, so this only needs
+    to run occasionally to reconcile anything that was missed
     """
 
     logger.info("[running task update_slack_user_list]")
 
+    users = get_slack_users()
+
+    with Session(engine) as session:
+        changed, removed = _sync_rows(session, SlackUser, users)
+        session.commit()
+        logger.info(
+            f"Stored current Slack users in database ({changed} changed, {removed} removed)..."
+        )
+
+    user_directory.rebuild(users)
+
+
+def store_slack_user(user: dict[str, Any]):
+    """
+    Store a single user, e.g. when one joins or changes their profile
+
+    Parameters:
+        user (dict[str, Any]): User object from a Slack event
+    """
+
     try:
-        with Session(engine) as session:
-            # Delete if exists
-            if session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
-                )
-            ).first():
-                existing = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).first()
-                session.delete(existing)
-                session.commit()
-
-            # Store
-            row = ApplicationData(
-                name="slack_users",
-                json_data=get_slack_users(),
-            )
+        user = format_slack_user(user)
 
-            session.add(row)
+        with Session(engine) as session:
+            _upsert_rows(session, SlackUser, [user])
             session.commit()
-            logger.info("Stored current Slack users in database...")
+
+        user_directory.upsert(user)
     except Exception as error:
-        logger.error(
-            f"ApplicationData row create failed for slack_users: {error}"
+        logger.error(f"Error storing Slack user {user.get('id')}: {error}")
+
+
+def store_slack_usergroup(group: dict[str, Any]):
+    """
+    Add or update a single user group, e.g. from a subteam event
+
+    Parameters:
+        group (dict[str, Any]): User group object from the event
+    """
+
+    usergroup_directory.upsert(group)
+
+
+def update_slack_usergroup_members(
+    group_id: str, added: list[str], removed: list[str]
+):
+    """
+    Apply a change to the members of a user group
+
+    Parameters:
+        group_id (str): User group ID
+        added (list[str]): IDs of users added to the group
+        removed (list[str]): IDs of users removed from the group
+    """
+
+    usergroup_directory.update_members(group_id, added, removed)
+
+
+"""
+Snapshot
+"""
+
+
+def load_cache_snapshot() -> list[str]:
+    """
+    Populate the directories and workspace metadata from the snapshot file
+    written by save_cache_snapshot
+
+    Returns the names of the sections that were loaded, so nothing if there
+    is no usable snapshot
+    """
+
+    global _auth_test
+
+    path = settings.options.cache_snapshot_path
+    if not path or not os.path.exists(path):
+        return []
+
+    try:
+        sections = read_snapshot(path)
+    except (OSError, SnapshotError, ValueError) as error:
+        logger.error(f"Error reading cache snapshot {path}: {error}")
+
+        return []
+
+    if "channels" in sections:
+        with _channel_directory_lock:
+            channel_directory.rebuild(sections["channels"])
+
+    if "users" in sections:
+        with _user_directory_lock:
+            user_directory.rebuild(sections["users"])
+
+    if "usergroups" in sections:
+        with _usergroup_directory_lock:
+            usergroup_directory.rebuild(sections["usergroups"])
+
+    with _metadata_lock:
+        _auth_test = sections.get("auth_test", _auth_test)
+
+    logger.info(
+        f"Loaded cache snapshot with {len(channel_directory)} channels and {len(user_directory)} users"
+    )
+
+    return list(sections)
+
+
+def save_cache_snapshot():
+    """
+    Write the directories and workspace metadata to the snapshot file so the
+    next start can serve lookups before reconciling with Slack
+    """
+
+    path = settings.options.cache_snapshot_path
+    if not path:
+        return
+
+    sections = {
+        "auth_test": _auth_test,
+        "channels": (
+            channel_directory.all() if channel_directory.loaded else None
+        ),
+        "usergroups": (
+            usergroup_directory.all() if usergroup_directory.loaded else None
+        ),
+        "users": user_directory.all() if user_directory.loaded else None,
+    }
+
+    write_snapshot(path, {k: v for k, v in sections.items() if v is not None})
+
+
+"""
+Storage
+"""
+
+
+def _sync_rows(
+    session: Session, model: type[SlackChannel | SlackUser], rows: list[dict]
+) -> tuple[int, int]:
+    """
+    Make a table match a full listing from Slack, writing only the rows
+    that were added, changed or removed
+
+    Returns the number of rows upserted and deleted
+
+    Parameters:
+        session (Session): Database session, committed by the caller
+        model (type[SlackChannel | SlackUser]): Table to sync
+        rows (list[dict]): Every row that should be present
+    """
+
+    fields = [field for field in rows[0] if field != "id"] if rows else []
+
+    existing = {
+        row.id: tuple(getattr(row, field) for field in fields)
+        for row in session.exec(select(model))
+    }
+
+    changed = [
+        row
+        for row in rows
+        if existing.get(row["id"]) != tuple(row[field] for field in fields)
+    ]
+    removed = existing.keys() - {row["id"] for row in rows}
+
+    _upsert_rows(session, model, changed)
+
+    if removed:
+        session.exec(delete(model).where(col(model.id).in_(removed)))
+
+    return len(changed), len(removed)
+
+
+def _upsert_rows(
+    session: Session, model: type[SlackChannel | SlackUser], rows: list[dict]
+):
+    """
+    Insert rows, updating any that already exist by id
+
+    Parameters:
+        session (Session): Database session, committed by the caller
+        model (type[SlackChannel | SlackUser]): Table to write to
+        rows (list[dict]): Rows to write
+    """
+
+    # Upsert in batches to stay well under the bind parameter limit
+    for i in range(0, len(rows), 1000):
+        stmt = insert(model).values(
+            [{**row, "updated_at": func.now()} for row in rows[i : i + 1000]]
+        )
+        session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=[model.id],
+                set_={
+                    **{
+                        field: stmt.excluded[field]
+                        for field in rows[0]
+                        if field != "id"
+                    },
+                    "updated_at": func.now(),
+                },
+            )
         )
@@ -285,7 +285,7 @@ def show_responders(ack, body):
     ack()
 
     channel_id = body.get("channel").get("id")
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     try:
         slack_web_client.chat_postMessage(
@@ -338,7 +338,7 @@ def show_modal(ack, body, client):
     ack()
 
     channel_id = body.get("channel").get("id")
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     client.views_open(
         trigger_id=body["trigger_id"],
@@ -393,7 +393,7 @@ def show_modal(ack, body, client):  # noqa: F811
     ack()
 
     channel_id = body.get("channel").get("id")
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     client.views_open(
         trigger_id=body["trigger_id"],
@@ -449,7 +449,7 @@ def show_responders(ack, body):  # noqa: F811
     ack()
 
     channel_id = body.get("channel").get("id")
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
     responders = IncidentDatabaseInterface.list_participants(incident=record)
     user = User(**body.get("user"))
 
@@ -476,7 +476,7 @@ def show_tasks(ack, body):
     ack()
 
     channel_id = body.get("channel").get("id")
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
     user = User(**body.get("user"))
 
     jobs = []
@@ -0,0 +1,579 @@
+import threading
+
+from typing import Any
+
+
+class SlackUserDirectory:
+    """
+    Process-wide, in-memory index of Slack users
+
+    Users are indexed by id, handle (name), real name and email so that lookups
+    are constant time. Full rebuilds are made off to the side and swapped in
+    with a single assignment, while single users are updated in place one key
+    at a time, so readers never observe a partial directory.
+    """
+
+    def __init__(self):
+        self._indexes: dict[str, dict[str, dict[str, Any]]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether or not the directory has been populated, which it may have
+        been with no users at all
+        """
+
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._indexes.get("id", {}))
+
+    def rebuild(self, users: list[dict[str, Any]]):
+        """
+        Replace the contents of the directory
+
+        Parameters:
+            users (list[dict[str, Any]]): Users in the format stored by
+                store_slack_user_list_db
+        """
+
+        with self._write_lock:
+            self._rebuild(users)
+
+    def upsert(self, user: dict[str, Any]):
+        """
+        Add a user to the directory or replace an existing one with the same id
+
+        Nothing is done until the directory has been loaded, as the user will
+        be read from the database along with everyone else when it is.
+
+        Parameters:
+            user (dict[str, Any]): User in the format stored by
+                store_slack_user_list_db
+        """
+
+        with self._write_lock:
+            if not self._loaded:
+                return
+
+            previous = self._indexes["id"].get(user.get("id"))
+
+            for key, index in self._indexes.items():
+                _replace(index, previous, user, key)
+
+    def clear(self):
+        """
+        Empty the directory so that the next lookup reloads it
+        """
+
+        self._indexes = {}
+        self._loaded = False
+
+    def _rebuild(self, users: list[dict[str, Any]]):
+        indexes = {"id": {}, "name": {}, "real_name": {}, "email": {}}
+
+        for user in users:
+            for key, index in indexes.items():
+                value = user.get(key)
+                if value and value not in index:
+                    index[value] = user
+
+        self._indexes = indexes
+        self._loaded = True
+
+    def get(self, value: str) -> dict[str, Any] | None:
+        """
+        Return a user matching an id, handle, real name or email
+
+        Parameters:
+            value (str): The value to look up
+        """
+
+        indexes = self._indexes
+
+        for key in ("id", "name", "real_name", "email"):
+            user = indexes.get(key, {}).get(value)
+            if user is not None:
+                self._count(hit=True)
+                return user
+
+        self._count(hit=False)
+        return None
+
+    def get_by_id(self, user_id: str) -> dict[str, Any] | None:
+        """
+        Return a user by Slack user id
+
+        Parameters:
+            user_id (str): User ID
+        """
+
+        user = self._indexes.get("id", {}).get(user_id)
+        self._count(hit=user is not None)
+
+        return user
+
+    def all(self) -> list[dict[str, Any]]:
+        """
+        Return every user in the directory
+        """
+
+        return list(self._indexes.get("id", {}).values())
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return size and hit/miss counters for the directory
+        """
+
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class SlackChannelDirectory:
+    """
+    Process-wide, in-memory index of Slack channels keyed by id and by name
+
+    The id of the digest channel is resolved once per rebuild and cached.
+    """
+
+    def __init__(self):
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._by_name: dict[str, dict[str, Any]] = {}
+        self._digest_channel_id: str | None = None
+        self._loaded = False
+        self._write_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether or not the directory has been populated, which it may have
+        been with no channels at all
+        """
+
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def rebuild(self, channels: list[dict[str, Any]]):
+        """
+        Replace the contents of the directory
+
+        Parameters:
+            channels (list[dict[str, Any]]): Channels as returned by
+                conversations.list
+        """
+
+        with self._write_lock:
+            self._rebuild(channels)
+
+    def upsert(self, channel: dict[str, Any]):
+        """
+        Add a channel to the directory or replace an existing one with the same
+        id, e.g. after it has been renamed
+
+        Nothing is done until the directory has been loaded, as the channel
+        will be read from the database along with the rest when it is.
+
+        Parameters:
+            channel (dict[str, Any]): Channel with at least an id and name
+        """
+
+        with self._write_lock:
+            if not self._loaded:
+                return
+
+            channel_id = channel.get("id")
+            previous = self._by_id.get(channel_id)
+
+            _replace(self._by_id, previous, channel, "id")
+            _replace(self._by_name, previous, channel, "name", overwrite=True)
+            self._forget_digest_channel(channel_id)
+
+    def remove(self, channel_id: str):
+        """
+        Remove a channel from the directory
+
+        Parameters:
+            channel_id (str): Channel ID
+        """
+
+        with self._write_lock:
+            previous = self._by_id.pop(channel_id, None)
+            if previous is not None:
+                _replace(self._by_name, previous, None, "name")
+
+            self._forget_digest_channel(channel_id)
+
+    def clear(self):
+        """
+        Empty the directory so that the next lookup reloads it
+        """
+
+        self._by_id, self._by_name, self._digest_channel_id = {}, {}, None
+        self._loaded = False
+
+    def _rebuild(self, channels: list[dict[str, Any]]):
+        by_id = {}
+        by_name = {}
+
+        for channel in channels:
+            by_id[channel.get("id")] = channel
+            by_name[channel.get("name")] = channel
+
+        self._by_id, self._by_name, self._digest_channel_id = (
+            by_id,
+            by_name,
+            None,
+        )
+        self._loaded = True
+
+    def _forget_digest_channel(self, channel_id: str):
+        # Only forget the digest channel if it is the one that changed
+        if self._digest_channel_id == channel_id:
+            self._digest_channel_id = None
+
+    def get_by_id(self, channel_id: str) -> dict[str, Any] | None:
+        """
+        Return a channel by id
+
+        Parameters:
+            channel_id (str): Channel ID
+        """
+
+        return self._by_id.get(channel_id)
+
+    def get_by_name(self, name: str) -> dict[str, Any] | None:
+        """
+        Return a channel by name
+
+        Parameters:
+            name (str): Channel name
+        """
+
+        return self._by_name.get(name)
+
+    def digest_channel_id(self, name: str) -> str | None:
+        """
+        Return the id of the digest channel, resolving it only once
+
+        Parameters:
+            name (str): Name of the digest channel
+        """
+
+        if self._digest_channel_id is None:
+            channel = self.get_by_name(name)
+            if channel:
+                self._digest_channel_id = channel.get("id")
+
+        return self._digest_channel_id
+
+    def all(self) -> list[dict[str, Any]]:
+        """
+        Return every channel in the directory
+        """
+
+        return list(self._by_id.values())
+
+
+class SlackUserGroupDirectory:
+    """
+    Process-wide, in-memory index of Slack user groups keyed by id and by
+    handle, with the members of each group held as a set so that membership
+    checks are constant time
+    """
+
+    def __init__(self):
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._by_handle: dict[str, dict[str, Any]] = {}
+        self._members: dict[str, frozenset[str]] = {}
+        self._loaded = False
+        self._write_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether or not the directory has been populated, which it may have
+        been with no groups at all
+        """
+
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def rebuild(self, groups: list[dict[str, Any]]):
+        """
+        Replace the contents of the directory
+
+        Parameters:
+            groups (list[dict[str, Any]]): User groups as returned by
+                usergroups.list with include_users
+        """
+
+        with self._write_lock:
+            self._rebuild(groups)
+
+    def upsert(self, group: dict[str, Any]):
+        """
+        Add a group to the directory or replace an existing one with the same
+        id, keeping its current members if the group has no users field
+
+        Nothing is done until the directory has been loaded, as the group will
+        be fetched along with the rest when it is.
+
+        Parameters:
+            group (dict[str, Any]): User group, e.g. from a subteam event
+        """
+
+        with self._write_lock:
+            if not self._loaded:
+                return
+
+            group_id = group.get("id")
+            entry = {
+                "handle": group.get("handle"),
+                "id": group_id,
+                "name": group.get("name"),
+            }
+            previous = self._by_id.get(group_id)
+
+            # Members first, so the group is never found without them
+            if "users" in group:
+                self._members[group_id] = frozenset(group.get("users") or [])
+            else:
+                self._members.setdefault(group_id, frozenset())
+
+            _replace(self._by_id, previous, entry, "id")
+            _replace(
+                self._by_handle, previous, entry, "handle", overwrite=True
+            )
+
+    def update_members(
+        self, group_id: str, added: list[str], removed: list[str]
+    ):
+        """
+        Add and remove members of a group
+
+        Parameters:
+            group_id (str): User group ID
+            added (list[str]): IDs of users added to the group
+            removed (list[str]): IDs of users removed from the group
+        """
+
+        with self._write_lock:
+            if group_id not in self._by_id:
+                return
+
+            self._members[group_id] = (
+                self._members.get(group_id, frozenset()) | set(added)
+            ) - set(removed)
+
+    def clear(self):
+        """
+        Empty the directory so that the next lookup reloads it
+        """
+
+        self._by_id, self._by_handle, self._members = {}, {}, {}
+        self._loaded = False
+
+    def _rebuild(self, groups: list[dict[str, Any]]):
+        by_id = {}
+        by_handle = {}
+        members = {}
+
+        for group in groups:
+            entry = {
+                "handle": group.get("handle"),
+                "id": group.get("id"),
+                "name": group.get("name"),
+            }
+            by_id[entry["id"]] = entry
+            by_handle[entry["handle"]] = entry
+            members[entry["id"]] = frozenset(group.get("users") or [])
+
+        self._by_id, self._by_handle, self._members = (
+            by_id,
+            by_handle,
+            members,
+        )
+        self._loaded = True
+
+    def get_by_handle(self, handle: str) -> dict[str, Any] | None:
+        """
+        Return a group by handle
+
+        Parameters:
+            handle (str): Group handle, e.g. sre for @sre
+        """
+
+        return self._by_handle.get(handle)
+
+    def get_by_id(self, group_id: str) -> dict[str, Any] | None:
+        """
+        Return a group by id
+
+        Parameters:
+            group_id (str): User group ID
+        """
+
+        return self._by_id.get(group_id)
+
+    def members(self, handle: str) -> frozenset[str]:
+        """
+        Return the IDs of the members of a group
+
+        Parameters:
+            handle (str): Group handle
+        """
+
+        group = self._by_handle.get(handle)
+        if group is None:
+            return frozenset()
+
+        return self._members.get(group.get("id"), frozenset())
+
+    def all(self) -> list[dict[str, Any]]:
+        """
+        Return every group in the directory along with its members
+        """
+
+        members = self._members
+
+        return [
+            {**group, "users": sorted(members.get(group_id, []))}
+            for group_id, group in self._by_id.items()
+        ]
+
+
+class SlackChannelMemberCache:
+    """
+    Process-wide, in-memory sets of the members of channels the bot works
+    in, e.g. incident channels
+
+    A channel is seeded from the API once and then kept current from member
+    events, so membership checks never need to call Slack again.
+    """
+
+    def __init__(self):
+        self._members: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._members
+
+    def seed(self, channel_id: str, members: list[str]):
+        """
+        Set the members of a channel
+
+        Parameters:
+            channel_id (str): Channel ID
+            members (list[str]): IDs of the users in the channel
+        """
+
+        with self._lock:
+            self._members[channel_id] = set(members)
+
+    def add(self, channel_id: str, user_id: str):
+        """
+        Record a user joining a channel, if the channel has been seeded
+
+        Parameters:
+            channel_id (str): Channel ID
+            user_id (str): User ID
+        """
+
+        with self._lock:
+            if channel_id in self._members:
+                self._members[channel_id].add(user_id)
+
+    def discard(self, channel_id: str, user_id: str):
+        """
+        Record a user leaving a channel
+
+        Parameters:
+            channel_id (str): Channel ID
+            user_id (str): User ID
+        """
+
+        with self._lock:
+            if channel_id in self._members:
+                self._members[channel_id].discard(user_id)
+
+    def forget(self, channel_id: str):
+        """
+        Drop a channel, e.g. once it has been archived
+
+        Parameters:
+            channel_id (str): Channel ID
+        """
+
+        with self._lock:
+            self._members.pop(channel_id, None)
+
+    def has_member(self, channel_id: str, user_id: str) -> bool | None:
+        """
+        Return whether or not a user is in a channel, or None if the channel
+        has not been seeded
+
+        Parameters:
+            channel_id (str): Channel ID
+            user_id (str): User ID
+        """
+
+        with self._lock:
+            members = self._members.get(channel_id)
+
+            return None if members is None else user_id in members
+
+
+def _replace(
+    index: dict[str, dict[str, Any]],
+    previous: dict[str, Any] | None,
+    entry: dict[str, Any] | None,
+    key: str,
+    overwrite: bool = False,
+):
+    """
+    Point one index at a new version of an entry, touching only the keys of
+    that entry so that an update costs the same however large the index is
+
+    Parameters:
+        index (dict[str, dict[str, Any]]): The index to update
+        previous (dict[str, Any]): The entry being replaced, if any
+        entry (dict[str, Any]): The new entry, or None to remove previous
+        key (str): The field of the entries the index is keyed by
+        overwrite (bool): Whether or not the new entry takes a key already
+            held by another entry, rather than leaving it to the first
+    """
+
+    old = previous.get(key) if previous is not None else None
+    value = entry.get(key) if entry is not None else None
+
+    if old and index.get(old) is previous:
+        if old == value:
+            # Swap the entry under an unchanged key in a single assignment
+            index[old] = entry
+            return
+
+        del index[old]
+
+    if value and (overwrite or value not in index):
+        index[value] = entry
+
+
+channel_directory = SlackChannelDirectory()
+channel_member_cache = SlackChannelMemberCache()
+user_directory = SlackUserDirectory()
+usergroup_directory = SlackUserGroupDirectory()
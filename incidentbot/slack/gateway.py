@@ -0,0 +1,344 @@
+import asyncio
+import random
+import threading
+import time
+
+from collections import deque
+from functools import partial
+from incidentbot.logging import logger
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+from typing import Any, Iterator
+
+"""
+Rate limits
+"""
+
+# Requests per minute allowed by each of Slack's Web API rate limit tiers
+# https://api.slack.com/apis/rate-limits
+tier_limits = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier for each client method used by the application - anything not listed
+# here is treated as Tier 3
+method_tiers = {
+    "auth_test": 4,
+    "bookmarks_add": 2,
+    "chat_delete": 3,
+    "chat_postEphemeral": 4,
+    "chat_postMessage": 4,
+    "chat_update": 3,
+    "conversations_archive": 2,
+    "conversations_create": 2,
+    "conversations_history": 3,
+    "conversations_info": 3,
+    "conversations_invite": 3,
+    "conversations_join": 3,
+    "conversations_list": 2,
+    "conversations_members": 4,
+    "conversations_rename": 2,
+    "conversations_replies": 3,
+    "conversations_setTopic": 2,
+    "files_upload_v2": 4,
+    "pins_add": 2,
+    "reactions_add": 3,
+    "usergroups_list": 2,
+    "usergroups_users_list": 2,
+    "users_info": 4,
+    "users_list": 2,
+    "views_open": 4,
+    "views_publish": 4,
+    "views_update": 4,
+}
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out tokens to waiting callers in arrival order
+
+    Parameters:
+        per_minute (int): Sustained number of requests allowed per minute
+        burst (int): Number of requests that may be made back to back
+    """
+
+    def __init__(self, per_minute: int, burst: int | None = None):
+        self.rate = per_minute / 60
+        self.capacity = burst or max(1, per_minute // 10)
+        self.tokens = float(self.capacity)
+        self.paused_until = 0.0
+
+        self._cond = threading.Condition()
+        self._updated = time.monotonic()
+        self._waiters = deque()
+
+    def acquire(self):
+        """
+        Wait for a token
+
+        Callers are served first come, first served so that a burst of
+        requests drains smoothly instead of racing for tokens
+        """
+
+        ticket = object()
+
+        with self._cond:
+            self._waiters.append(ticket)
+
+            try:
+                while True:
+                    wait = None
+
+                    if self._waiters[0] is ticket:
+                        now = time.monotonic()
+                        self._refill(now)
+
+                        if now >= self.paused_until and self.tokens >= 1:
+                            self.tokens -= 1
+                            return
+
+                        wait = max(
+                            self.paused_until - now,
+                            (1 - self.tokens) / self.rate,
+                        )
+
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for a period of time, e.g. after a 429
+
+        Parameters:
+            seconds (float): How long to pause for
+        """
+
+        with self._cond:
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + seconds
+            )
+            self.tokens = 0
+            self._cond.notify_all()
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+
+"""
+Gateway
+"""
+
+
+class SlackApiGateway:
+    """
+    Routes Slack Web API calls through per-method token buckets
+
+    Calls that are rate limited by Slack pause the bucket for the method,
+    queueing any other callers behind it, and are retried with bounded
+    exponential backoff. Any client method can be called on the gateway
+    directly, e.g. gateway.chat_postMessage(...)
+
+    Parameters:
+        client (WebClient): The Slack client to wrap
+        max_retries (int): How many times to retry a rate limited call
+        max_backoff (int): Upper bound, in seconds, for a single backoff
+    """
+
+    def __init__(
+        self,
+        client: WebClient,
+        max_retries: int = 5,
+        max_backoff: int = 60,
+    ):
+        self.client = client
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        return partial(self.call, method)
+
+    def bucket(self, method: str) -> TokenBucket:
+        """
+        Return the token bucket for a client method
+
+        Parameters:
+            method (str): Name of the WebClient method, e.g. users_list
+        """
+
+        with self._lock:
+            if method not in self._buckets:
+                self._buckets[method] = TokenBucket(
+                    tier_limits[method_tiers.get(method, 3)]
+                )
+
+            return self._buckets[method]
+
+    def call(self, method: str, **kwargs) -> SlackResponse:
+        """
+        Call a client method, retrying if rate limited
+
+        Parameters:
+            method (str): Name of the WebClient method, e.g. users_list
+            kwargs: Arguments for the method
+        """
+
+        bucket = self.bucket(method)
+        attempt = 0
+
+        while True:
+            bucket.acquire()
+
+            try:
+                return getattr(self.client, method)(**kwargs)
+            except SlackApiError as error:
+                if (
+                    error.response.status_code != 429
+                    or attempt >= self.max_retries
+                ):
+                    raise
+
+                delay = self.backoff(attempt, error.response.headers)
+                logger.warning(
+                    f"Rate limited by Slack API on {method}. Retrying in {delay:.1f} seconds..."
+                )
+                bucket.pause(delay)
+                attempt += 1
+
+    def paginate(self, method: str, key: str, **kwargs) -> Iterator[Any]:
+        """
+        Yield items from every page of a paginated client method
+
+        A rate limited page is retried on its own rather than restarting
+        from the first page
+
+        Parameters:
+            method (str): Name of the WebClient method, e.g. users_list
+            key (str): Response field holding the items, e.g. members
+            kwargs: Arguments for the method
+        """
+
+        cursor = None
+
+        while True:
+            if cursor:
+                kwargs["cursor"] = cursor
+
+            res = self.call(method, **kwargs)
+
+            yield from res.get(key) or []
+
+            cursor = (res.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+
+    def backoff(self, attempt: int, headers: dict[str, Any]) -> float:
+        """
+        Return how long to wait before retrying a rate limited call
+
+        Parameters:
+            attempt (int): Number of retries made so far
+            headers (dict[str, Any]): Headers of the rate limited response
+        """
+
+        retry_after = None
+        for name, value in (headers or {}).items():
+            if name.lower() == "retry-after":
+                retry_after = float(value)
+
+        # Slack expects Retry-After to be honored as given
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1)
+
+        return min(self.max_backoff, 2**attempt + random.uniform(0, 1))
+
+
+class AsyncSlackApi:
+    """
+    Awaitable access to the Slack Web API for async code
+
+    Once bound to an AsyncWebClient, calls made from the event loop it was
+    bound on go straight through that client and its pooled connections.
+    Calls made anywhere else, e.g. from a short lived asyncio.run loop, are run
+    on a worker thread through the gateway so they never block the loop.
+
+    Parameters:
+        gateway (SlackApiGateway): Gateway to fall back to
+    """
+
+    def __init__(self, gateway: SlackApiGateway):
+        self.gateway = gateway
+
+        self._client = None
+        self._loop = None
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        return partial(self.call, method)
+
+    def bind(self, client):
+        """
+        Route calls made from the running event loop through an async client
+
+        Parameters:
+            client (AsyncWebClient): Client to use for the running loop
+        """
+
+        self._client, self._loop = client, asyncio.get_running_loop()
+
+    def unbind(self):
+        """
+        Stop using the bound async client
+        """
+
+        self._client, self._loop = None, None
+
+    async def call(self, method: str, **kwargs) -> SlackResponse:
+        """
+        Call a client method
+
+        Parameters:
+            method (str): Name of the WebClient method, e.g. users_list
+            kwargs: Arguments for the method
+        """
+
+        if (
+            self._client is None
+            or self._loop is not asyncio.get_running_loop()
+        ):
+            return await asyncio.to_thread(self.gateway.call, method, **kwargs)
+
+        # Share the gateway's buckets so async and sync callers are limited
+        # together, waiting for a token on a worker thread
+        bucket = self.gateway.bucket(method)
+        attempt = 0
+
+        while True:
+            await asyncio.to_thread(bucket.acquire)
+
+            try:
+                return await getattr(self._client, method)(**kwargs)
+            except SlackApiError as error:
+                if (
+                    error.response.status_code != 429
+                    or attempt >= self.gateway.max_retries
+                ):
+                    raise
+
+                delay = self.gateway.backoff(attempt, error.response.headers)
+                logger.warning(
+                    f"Rate limited by Slack API on {method}. Retrying in {delay:.1f} seconds..."
+                )
+                bucket.pause(delay)
+                attempt += 1
@@ -1,9 +1,11 @@
 import asyncio
-import re
 import requests
 import slack_sdk
 
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from incidentbot.configuration.settings import settings, __version__
+from incidentbot.exceptions import UnitOfWorkError
 from incidentbot.incident.actions import (
     archive_incident_channel,
     export_chat_logs,
@@ -14,27 +16,102 @@ from incidentbot.incident.actions import (
 )
 from incidentbot.incident.event import EventLogHandler
 from incidentbot.logging import logger
-from incidentbot.models.database import ApplicationData, engine
 from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.maintenance_window import (
     MaintenanceWindowDatabaseInterface,
 )
 from incidentbot.models.slack import SlackBlockActionsResponse
+from incidentbot.models.unit_of_work import unit_of_work
 from incidentbot.slack.client import (
+    delete_slack_channel,
     get_slack_user,
+    record_channel_member_joined,
+    record_channel_member_left,
     slack_web_client,
+    store_slack_channel,
+    store_slack_user,
+    store_slack_usergroup,
+    update_slack_usergroup_members,
 )
 from incidentbot.slack.messages import (
     BlockBuilder,
 )
+from incidentbot.slack.mrkdwn import parse_pinned_message_content
 from incidentbot.slack.util import handle_comms_reminder
+from incidentbot.storage.blob import chunk_size, get_blob_store
 from incidentbot.util import gen
 from slack_bolt import App
+from slack_bolt.request.internals import extract_channel_id, extract_user_id
 from slack_sdk.errors import SlackApiError
-from sqlmodel import Session, select
+
+# Body of the request being dispatched on this thread, set by middleware
+# before its listener is handed to the executor
+_request_body: ContextVar[dict | None] = ContextVar(
+    "slack_request_body", default=None
+)
+
+
+class UnitOfWorkExecutor(ThreadPoolExecutor):
+    """
+    Runs each listener in its own unit of work, so incidents looked up while
+    handling one event are cached and their updates written together
+
+    Updates that can't be written are passed to the app's error handler and
+    the user who made the request is told
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        body = _request_body.get()
+
+        def run():
+            try:
+                with unit_of_work():
+                    return fn(*args, **kwargs)
+            except UnitOfWorkError as error:
+                report_unit_of_work_error(error, body)
+
+        return super().submit(run)
+
+
+def report_unit_of_work_error(error: UnitOfWorkError, body: dict | None):
+    """
+    Report updates from handling a request that couldn't be written
+
+    Parameters:
+        error (UnitOfWorkError): The error from the commit
+        body (dict | None): Body of the request
+    """
+
+    custom_error_handler(error, body, logger)
+
+    channel_id = extract_channel_id(body) if body else None
+    user_id = extract_user_id(body) if body else None
+    if not (channel_id and user_id):
+        return
+
+    try:
+        slack_web_client.chat_postEphemeral(
+            channel=channel_id,
+            user=user_id,
+            text=":warning: Some of your changes to this incident couldn't be saved. Please try again.",
+        )
+    except SlackApiError as error:
+        logger.error(
+            f"error sending message back to user about failed updates: {error}"
+        )
+
 
 ## The xoxb oauth token for the bot is called here to provide bot privileges.
-app = App(token=settings.SLACK_BOT_TOKEN)
+app = App(
+    token=settings.SLACK_BOT_TOKEN,
+    listener_executor=UnitOfWorkExecutor(max_workers=5),
+)
+
+# Pooled connections for downloading pinned files from Slack
+file_session = requests.Session()
+file_session.headers.update(
+    {"Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}"}
+)
 
 
 @app.error
@@ -43,6 +120,12 @@ def custom_error_handler(error, body, logger):
     logger.debug(f"Request body: {body}")
 
 
+@app.middleware
+def remember_request_body(body, next):
+    _request_body.set(body)
+    next()
+
+
 from . import command  # noqa: F401 E402
 from . import modals  # noqa: F401 E402
 
@@ -53,6 +136,72 @@ def handle_message_events(body, logger):
     pass
 
 
+"""
+Directory Events
+"""
+
+
+@app.event("channel_archive")
+def handle_channel_archive(body, logger):
+    delete_slack_channel(body["event"]["channel"])
+
+
+@app.event("channel_created")
+def handle_channel_created(body, logger):
+    store_slack_channel(body["event"]["channel"])
+
+
+@app.event("channel_deleted")
+def handle_channel_deleted(body, logger):
+    delete_slack_channel(body["event"]["channel"])
+
+
+@app.event("channel_rename")
+def handle_channel_rename(body, logger):
+    store_slack_channel(body["event"]["channel"])
+
+
+@app.event("member_joined_channel")
+def handle_member_joined_channel(body, logger):
+    record_channel_member_joined(
+        body["event"]["channel"], body["event"]["user"]
+    )
+
+
+@app.event("member_left_channel")
+def handle_member_left_channel(body, logger):
+    record_channel_member_left(body["event"]["channel"], body["event"]["user"])
+
+
+@app.event("subteam_created")
+def handle_subteam_created(body, logger):
+    store_slack_usergroup(body["event"]["subteam"])
+
+
+@app.event("subteam_members_changed")
+def handle_subteam_members_changed(body, logger):
+    update_slack_usergroup_members(
+        body["event"]["subteam_id"],
+        added=body["event"].get("added_users") or [],
+        removed=body["event"].get("removed_users") or [],
+    )
+
+
+@app.event("subteam_updated")
+def handle_subteam_updated(body, logger):
+    store_slack_usergroup(body["event"]["subteam"])
+
+
+@app.event("team_join")
+def handle_team_join(body, logger):
+    store_slack_user(body["event"]["user"])
+
+
+@app.event("user_change")
+def handle_user_change(body, logger):
+    store_slack_user(body["event"]["user"])
+
+
 """
 Handle Mentions
 """
@@ -445,7 +594,7 @@ def handle_static_action(ack, body, logger):  # noqa: F811
 
     channel_id = parsed_body.channel.id
     interval = int(parsed_body.actions[0].get("text").get("text").rstrip("m"))
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     handle_comms_reminder(
         channel_id=channel_id,
@@ -464,7 +613,7 @@ def handle_static_action(ack, body, logger):  # noqa: F811
 
     channel_id = parsed_body.channel.id
     interval = int(parsed_body.actions[0].get("text").get("text").rstrip("m"))
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     handle_comms_reminder(
         channel_id=channel_id,
@@ -483,7 +632,7 @@ def handle_static_action(ack, body, logger):  # noqa: F811
 
     channel_id = parsed_body.channel.id
     interval = int(parsed_body.actions[0].get("text").get("text").rstrip("m"))
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     handle_comms_reminder(
         channel_id=channel_id,
@@ -501,7 +650,7 @@ def handle_static_action(ack, body, logger):  # noqa: F811
     parsed_body = SlackBlockActionsResponse(**body)
 
     channel_id = parsed_body.channel.id
-    record = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    record = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     handle_comms_reminder(
         channel_id=channel_id,
@@ -578,7 +727,7 @@ def handle_incident_set_severity(ack, body):
             severity=parsed_body.actions[0]
             .get("selected_option")
             .get("value"),
-            ts=parsed_body.message.ts,
+            user=parsed_body.user,
         )
     )
 
@@ -592,9 +741,8 @@ def handle_incident_set_status(ack, body):
     asyncio.run(
         set_incident_status(
             channel_id=parsed_body.channel.id,
-            selected_user=parsed_body.user,
             status=parsed_body.actions[0].get("selected_option").get("value"),
-            ts=parsed_body.message.ts,
+            user=parsed_body.user,
         )
     )
 
@@ -670,7 +818,7 @@ def reaction_added(event, say):
     channel_id = event.get("item").get("channel")
     message_timestamp = event.get("item").get("ts")
 
-    incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     # Pinned content for incidents
     if reacji == settings.pin_content_reacji:
@@ -705,18 +853,29 @@ def reaction_added(event, say):
                                             f"Error preparing pinned file for copy: {error}"
                                         )
 
-                                # Copy the attachment into the database
+                                # Copy the attachment into the blob store
                                 pub_secret = file["permalink_public"].split(
                                     "-"
                                 )[3]
 
-                                response = requests.get(
-                                    file["url_private"],
-                                    headers={
-                                        "Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}"
-                                    },
-                                    params={"pub_secret": pub_secret},
-                                )
+                                image_ref = None
+
+                                try:
+                                    with file_session.get(
+                                        file["url_private"],
+                                        params={"pub_secret": pub_secret},
+                                        stream=True,
+                                    ) as response:
+                                        response.raise_for_status()
+                                        image_ref = get_blob_store().put(
+                                            response.iter_content(
+                                                chunk_size=chunk_size
+                                            )
+                                        )
+                                except Exception as error:
+                                    logger.error(
+                                        f"Error copying pinned file {file['id']}: {error}"
+                                    )
 
                                 # Revoke public access
                                 try:
@@ -730,8 +889,13 @@ def reaction_added(event, say):
                                     )
 
                                 try:
+                                    if not image_ref:
+                                        raise Exception(
+                                            "the file could not be copied"
+                                        )
+
                                     result = EventLogHandler.create(
-                                        image=response.content,
+                                        image_ref=image_ref,
                                         incident_id=incident.id,
                                         incident_slug=incident.slug,
                                         message_ts=message["ts"],
@@ -807,69 +971,6 @@ def reaction_added(event, say):
                 )
 
 
-def parse_pinned_message_content(message: str) -> str:
-    """
-    Replace components in pinned message
-
-    Args:
-        message (str): The message content to parse
-    """
-
-    channel_pattern = r"<#([A-Z0-9]+)\|?.*?>"
-    url_patterns = [
-        r"<(https?://[^|]+)\|([^>]+)>",
-        r"<(https?://[^|]+)>",
-    ]
-    username_pattern = r"<@([A-Z0-9]+)>"
-
-    if re.search(channel_pattern, message):
-        with Session(engine) as session:
-            match = re.search(channel_pattern, message)
-            channel_list = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_channels"
-                )
-            ).one()
-            matched_channel = [
-                channel
-                for channel in channel_list.json_data
-                if channel.get("id") == match.group(1)
-            ][0]
-            message = message.replace(
-                match.group(0),
-                f"#{matched_channel.get("name")}",
-            )
-
-    for pattern in url_patterns:
-        if re.search(pattern, message):
-            with Session(engine) as session:
-                match = re.search(pattern, message)
-                message = message.replace(
-                    match.group(0),
-                    match.group(1),
-                )
-
-    if re.search(username_pattern, message):
-        with Session(engine) as session:
-            match = re.search(username_pattern, message)
-            user_list = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
-                )
-            ).one()
-            matched_user = [
-                user
-                for user in user_list.json_data
-                if user.get("id") == match.group(1)
-            ][0]
-            message = message.replace(
-                match.group(0),
-                f"@{matched_user.get("real_name")}",
-            )
-
-    return message
-
-
 """
 Jira
 """
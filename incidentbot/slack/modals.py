@@ -368,7 +368,7 @@ def handle_submission(ack, body, client):  # noqa: F811
     for character in "#<>":
         channel_id = channel_id.replace(character, "")
 
-    inc = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    inc = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     try:
         client.chat_postMessage(
@@ -1273,7 +1273,7 @@ def show_modal(ack, body, client):  # noqa: F811
 
     user = body.get("user").get("id")
     channel_id = body.get("actions")[0].get("value").split("_")[-1:][0]
-    incident_data = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident_data = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     blocks = [
         {
@@ -1502,7 +1502,7 @@ def handle_submission(ack, body, client, view):  # noqa: F811
 
     ack()
     slug = view["blocks"][2].get("block_id")
-    incident_data = IncidentDatabaseInterface.get_one(slug=slug)
+    incident_data = IncidentDatabaseInterface.get_by_slug(slug)
 
     # Fetch parameters from modal
     parsed = parse_modal_values(body)
@@ -1547,7 +1547,7 @@ def show_modal(ack, body, client):  # noqa: F811
 
     user = body.get("user").get("id")
     channel_id = body.get("channel").get("id")
-    incident_data = IncidentDatabaseInterface.get_one(channel_id=channel_id)
+    incident_data = IncidentDatabaseInterface.get_by_channel_id(channel_id)
 
     record = IncidentDatabaseInterface.get_statuspage_incident_record(
         id=incident_data.id
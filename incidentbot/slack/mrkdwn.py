@@ -0,0 +1,91 @@
+import re
+
+from incidentbot.exceptions import IndexNotFoundError
+from incidentbot.slack.client import (
+    get_channel_name,
+    get_slack_user,
+    load_slack_usergroup_directory,
+)
+from incidentbot.slack.directory import usergroup_directory
+from typing import Callable
+
+# Every Slack mrkdwn token: an optional sigil, the target and an optional
+# label, e.g. <#C123|general>, <@U123>, <!subteam^S123|@team> or <https://x>
+_token = re.compile(r"<([#@!]?)([^<>|]+)(?:\|([^<>]*))?>")
+
+_link_schemes = ("http://", "https://")
+
+
+def _resolve_channel(channel_id: str) -> str | None:
+    try:
+        return get_channel_name(channel_id)
+    except IndexNotFoundError:
+        return None
+
+
+def _resolve_user(user_id: str) -> str | None:
+    user = get_slack_user(user_id)
+
+    return user.get("real_name") if user else None
+
+
+def _resolve_usergroup(group_id: str) -> str | None:
+    if not usergroup_directory.loaded:
+        load_slack_usergroup_directory()
+
+    group = usergroup_directory.get_by_id(group_id)
+
+    return group.get("handle") if group else None
+
+
+def parse_pinned_message_content(
+    message: str,
+    channel: Callable[[str], str | None] = _resolve_channel,
+    user: Callable[[str], str | None] = _resolve_user,
+    usergroup: Callable[[str], str | None] = _resolve_usergroup,
+) -> str:
+    """
+    Replace Slack mrkdwn tokens in a pinned message with readable text
+
+    Every channel, user and user group mention and every link is replaced in
+    a single pass. Names come from the cached directories. Labels Slack
+    included in a token are used when a name can't be found. Tokens that
+    can't be resolved at all are left as they are.
+
+    Parameters:
+        message (str): The message content to parse
+        channel (Callable): Returns a channel name by ID
+        user (Callable): Returns a user's real name by ID
+        usergroup (Callable): Returns a user group handle by ID
+    """
+
+    if "<" not in message:
+        return message
+
+    def replace(match: re.Match) -> str:
+        sigil, target, label = match.groups()
+
+        match sigil:
+            case "#":
+                name = channel(target) or label
+                return f"#{name}" if name else match.group(0)
+            case "@":
+                name = user(target) or label
+                return f"@{name}" if name else match.group(0)
+            case "!":
+                command, _, argument = target.partition("^")
+                if command == "subteam":
+                    handle = usergroup(argument) or (label or "").lstrip("@")
+                    return f"@{handle}" if handle else match.group(0)
+                if command in ("channel", "everyone", "here"):
+                    return f"@{command}"
+                return label if label else match.group(0)
+
+        if target.startswith(_link_schemes):
+            return target
+        if target.startswith("mailto:"):
+            return label or target.removeprefix("mailto:")
+
+        return match.group(0)
+
+    return _token.sub(replace, message)
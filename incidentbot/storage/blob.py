@@ -0,0 +1,355 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+from abc import ABC, abstractmethod
+from incidentbot.configuration.settings import settings
+from incidentbot.exceptions import BlobNotFoundError, ConfigurationError
+from typing import BinaryIO, Iterable, Iterator
+
+# Size of the chunks blobs are read and written in
+chunk_size = 64 * 1024
+
+"""
+Stores
+"""
+
+
+class BlobStore(ABC):
+    """
+    Content-addressed storage for binary data such as pinned images
+
+    Blobs are keyed by the SHA-256 of their content, so storing the same
+    content twice keeps a single copy. Subclasses provide the backend.
+    """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Return whether or not a blob is stored
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """
+        Return a file-like object to read a blob from, raising
+        BlobNotFoundError if it is not stored
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """
+        Return the size of a blob in bytes, raising BlobNotFoundError if it is
+        not stored
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+    @abstractmethod
+    def delete(self, key: str):
+        """
+        Delete a blob if it exists
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+    @abstractmethod
+    def _put_file(self, key: str, path: str):
+        """
+        Move a spooled file into the store under a key
+
+        Parameters:
+            key (str): Key of the blob
+            path (str): Path of the spooled file
+        """
+
+    def _spool_dir(self) -> str | None:
+        return None
+
+    def put(self, chunks: Iterable[bytes]) -> str:
+        """
+        Store content from an iterable of chunks and return its key
+
+        The content is spooled to disk while it is hashed, so it is never
+        held in memory in full
+
+        Parameters:
+            chunks (Iterable[bytes]): The content
+        """
+
+        digest = hashlib.sha256()
+
+        with tempfile.NamedTemporaryFile(
+            dir=self._spool_dir(), delete=False
+        ) as spool:
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        digest.update(chunk)
+                        spool.write(chunk)
+            except BaseException:
+                spool.close()
+                os.remove(spool.name)
+                raise
+
+        key = digest.hexdigest()
+
+        try:
+            if not self.exists(key):
+                self._put_file(key, spool.name)
+        finally:
+            if os.path.exists(spool.name):
+                os.remove(spool.name)
+
+        return key
+
+    def put_bytes(self, data: bytes) -> str:
+        """
+        Store content and return its key
+
+        Parameters:
+            data (bytes): The content
+        """
+
+        return self.put([data])
+
+    def iter(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        """
+        Yield the content of a blob in chunks
+
+        Parameters:
+            key (str): Key of the blob
+            start (int): First byte to read
+            end (int): Last byte to read, inclusive, defaults to the end of
+                the blob
+        """
+
+        with self.open(key) as file:
+            if start:
+                file.seek(start)
+
+            remaining = None if end is None else end - start + 1
+
+            while remaining is None or remaining > 0:
+                chunk = file.read(
+                    chunk_size
+                    if remaining is None
+                    else min(chunk_size, remaining)
+                )
+                if not chunk:
+                    break
+
+                if remaining is not None:
+                    remaining -= len(chunk)
+
+                yield chunk
+
+    def read(self, key: str) -> bytes:
+        """
+        Return the content of a blob
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+        with self.open(key) as file:
+            return file.read()
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Stores blobs in a directory on the local filesystem, fanned out by the
+    first characters of their key
+
+    Parameters:
+        root (str): Directory to store blobs in
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        """
+        Return the path a blob is stored at
+
+        Parameters:
+            key (str): Key of the blob
+        """
+
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"{key} is not a valid blob key")
+
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self.path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"blob {key} not found")
+
+    def size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self.path(key))
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"blob {key} not found")
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _put_file(self, key: str, path: str):
+        destination = self.path(key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(path, destination)
+
+    def _spool_dir(self) -> str:
+        spool = os.path.join(self.root, "tmp")
+        os.makedirs(spool, exist_ok=True)
+
+        return spool
+
+
+class S3BlobStore(BlobStore):
+    """
+    Stores blobs in an S3 compatible bucket
+
+    Credentials are read by boto3 from the environment as usual, e.g.
+    AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY
+
+    Parameters:
+        bucket (str): Bucket to store blobs in
+        prefix (str): Prefix for the key of each blob
+        endpoint_url (str): Endpoint of an S3 compatible service other than
+            AWS
+    """
+
+    def __init__(
+        self, bucket: str, prefix: str = "", endpoint_url: str | None = None
+    ):
+        try:
+            import boto3
+        except ImportError:
+            raise ConfigurationError(
+                "boto3 must be installed to use the s3 blob store backend"
+            )
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.size(key)
+        except BlobNotFoundError:
+            return False
+
+        return True
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(
+                Bucket=self.bucket, Key=self.object_key(key)
+            )["Body"]
+        except self.client.exceptions.ClientError as error:
+            self._raise_missing(key, error)
+
+    def size(self, key: str) -> int:
+        try:
+            return self.client.head_object(
+                Bucket=self.bucket, Key=self.object_key(key)
+            )["ContentLength"]
+        except self.client.exceptions.ClientError as error:
+            self._raise_missing(key, error)
+
+    def _raise_missing(self, key: str, error: Exception):
+        # S3 reports a missing object as 404 for HEAD and NoSuchKey for GET
+        if error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            raise BlobNotFoundError(f"blob {key} not found") from error
+
+        raise error
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def iter(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        # Let S3 serve the range rather than reading past the skipped bytes
+        body = self.client.get_object(
+            Bucket=self.bucket,
+            Key=self.object_key(key),
+            Range=f"bytes={start}-{'' if end is None else end}",
+        )["Body"]
+
+        try:
+            yield from body.iter_chunks(chunk_size=chunk_size)
+        finally:
+            body.close()
+
+    def _put_file(self, key: str, path: str):
+        self.client.upload_file(path, self.bucket, self.object_key(key))
+
+
+"""
+Configured store
+"""
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Return the blob store set by the blob_store setting
+    """
+
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            config = settings.blob_store
+
+            if config is None:
+                raise ConfigurationError(
+                    "blob_store must be configured to store images"
+                )
+
+            match config.backend:
+                case "local":
+                    _store = LocalBlobStore(config.path)
+                case "s3":
+                    if not config.bucket:
+                        raise ConfigurationError(
+                            "blob_store.bucket is required for the s3 backend"
+                        )
+
+                    _store = S3BlobStore(
+                        bucket=config.bucket,
+                        prefix=config.path or "",
+                        endpoint_url=config.endpoint_url,
+                    )
+                case _:
+                    raise ConfigurationError(
+                        f"{config.backend} is not a valid blob store backend"
+                    )
+
+        return _store
@@ -0,0 +1,60 @@
+import io
+import threading
+
+from incidentbot.exceptions import ConfigurationError
+from incidentbot.storage.blob import BlobStore
+
+# Longest edge of a thumbnail in pixels
+thumbnail_size = 320
+
+# Image modes that can be saved as PNG as they are
+png_modes = ("1", "L", "LA", "I", "I;16", "P", "RGB", "RGBA")
+
+_thumbnails: dict[tuple[str, int], str] = {}
+_thumbnails_lock = threading.Lock()
+
+
+def get_thumbnail(
+    store: BlobStore, key: str, size: int = thumbnail_size
+) -> str:
+    """
+    Return the key of a thumbnail of an image, creating it the first time
+
+    Thumbnails are stored in the same blob store as the image they were made
+    from. Pillow is only needed to create them and is installed with the
+    images extra.
+
+    Parameters:
+        store (BlobStore): Store holding the image
+        key (str): Key of the image
+        size (int): Longest edge of the thumbnail in pixels
+    """
+
+    with _thumbnails_lock:
+        if (key, size) in _thumbnails:
+            return _thumbnails[(key, size)]
+
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ConfigurationError(
+            "Pillow must be installed to make thumbnails, "
+            + "e.g. with the images extra"
+        )
+
+    image = Image.open(io.BytesIO(store.read(key)))
+    image.thumbnail((size, size))
+
+    # PNG can't hold every mode, e.g. CMYK from some JPEG uploads
+    if image.mode not in png_modes:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+
+    thumbnail = store.put_bytes(output.getvalue())
+
+    with _thumbnails_lock:
+        _thumbnails[(key, size)] = thumbnail
+
+    return thumbnail
@@ -0,0 +1,131 @@
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from incidentbot.exceptions import StepFailedError
+from incidentbot.logging import logger
+from typing import Any, Callable
+
+
+class Step:
+    """
+    A unit of work for StepRunner
+
+    Parameters:
+        name (str): Unique name of the step, also the key for its result
+        func (Callable[[dict[str, Any]], Any]): Called with the results of
+            the steps completed so far
+        requires (list[str]): Names of the steps that must complete first
+        optional (bool): Whether or not the run can carry on without it
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[dict[str, Any]], Any],
+        requires: list[str] | None = None,
+        optional: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.requires = requires or []
+        self.optional = optional
+
+
+class StepRunner:
+    """
+    Runs a set of steps concurrently, starting each one as soon as the steps
+    it requires have completed
+
+    A failed optional step is logged and anything that requires it is
+    skipped. A failed required step stops any further steps from starting
+    and StepFailedError is raised once the running ones finish.
+
+    Parameters:
+        steps (list[Step]): Steps to run
+        max_workers (int): Maximum number of steps to run at once
+    """
+
+    def __init__(self, steps: list[Step], max_workers: int = 8):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+
+        self.failed: list[str] = []
+        self.results: dict[str, Any] = {}
+        self.timings: dict[str, float] = {}
+
+        for step in steps:
+            for name in step.requires:
+                if name not in self.steps:
+                    raise ValueError(
+                        f"Step {step.name} requires unknown step {name}"
+                    )
+
+    def run(self) -> dict[str, Any]:
+        """
+        Run the steps and return their results keyed by step name
+        """
+
+        pending = dict(self.steps)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Skipping a step can make others skippable, so keep going
+                # until nothing else can be started or skipped
+                changed = True
+                while changed and not error:
+                    changed = False
+
+                    for name, step in list(pending.items()):
+                        if any(r in self.failed for r in step.requires):
+                            del pending[name]
+                            error = self._fail(step, "dependency failed")
+                            changed = True
+                        elif all(r in self.results for r in step.requires):
+                            del pending[name]
+                            running[
+                                executor.submit(
+                                    self._timed, step, self.results
+                                )
+                            ] = step
+
+                        if error:
+                            break
+
+                if not running:
+                    if pending and not error:
+                        raise StepFailedError(
+                            f"Steps {', '.join(pending)} have circular dependencies"
+                        )
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        self.results[step.name] = future.result()
+                    except Exception as exc:
+                        error = error or self._fail(step, exc)
+
+        if error:
+            raise error
+
+        return self.results
+
+    def _fail(self, step: Step, reason: Any) -> StepFailedError | None:
+        self.failed.append(step.name)
+
+        if step.optional:
+            logger.error(f"Optional step {step.name} failed: {reason}")
+            return None
+
+        return StepFailedError(f"Step {step.name} failed: {reason}")
+
+    def _timed(self, step: Step, results: dict[str, Any]) -> Any:
+        start = time.perf_counter()
+
+        try:
+            return step.func(results)
+        finally:
+            self.timings[step.name] = time.perf_counter() - start
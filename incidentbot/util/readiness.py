@@ -0,0 +1,81 @@
+import threading
+
+
+class Readiness:
+    """
+    Tracks the warm-up tasks that have to finish before the application is
+    ready to serve traffic
+
+    Tasks are expected up front and marked done as they finish. Nothing
+    expected means the application is ready. A task that failed is marked
+    degraded instead, which settles it without hiding that it failed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._done: set[str] = set()
+        self._degraded: set[str] = set()
+
+    def expect(self, *names: str):
+        """
+        Record warm-up tasks that have yet to finish
+
+        Parameters:
+            names (str): Names of the tasks
+        """
+
+        with self._lock:
+            self._pending.update(
+                name for name in names if name not in self._done
+            )
+
+    def done(self, name: str):
+        """
+        Mark a warm-up task as finished
+
+        Parameters:
+            name (str): Name of the task
+        """
+
+        with self._lock:
+            self._pending.discard(name)
+            self._degraded.discard(name)
+            self._done.add(name)
+
+    def degraded(self, name: str):
+        """
+        Mark a warm-up task as having failed
+
+        The application is served without it, e.g. with caches that are
+        filled on first use, until the task is marked done again
+
+        Parameters:
+            name (str): Name of the task
+        """
+
+        with self._lock:
+            self._pending.discard(name)
+            self._done.add(name)
+            self._degraded.add(name)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return not self._pending
+
+    def status(self) -> dict[str, bool | list[str]]:
+        """
+        Return whether or not the application is ready along with any
+        warm-up tasks still running or that failed
+        """
+
+        with self._lock:
+            return {
+                "ready": not self._pending,
+                "pending": sorted(self._pending),
+                "degraded": sorted(self._degraded),
+            }
+
+
+readiness = Readiness()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from incidentbot.exceptions import SnapshotError
+from typing import Any
+
+"""
+Format
+
+A snapshot is a header, an index of sections and the sections themselves:
+
+    header   magic, format version, number of sections, sha256 of the rest
+    index    per section: name, offset from the start of the data, length
+    data     each section as compact JSON
+
+Sections are located through the index so a reader can map the file and
+decode only the sections it needs.
+"""
+
+magic = b"IBSNAP"
+max_section_name = 32
+version = 1
+
+_header = struct.Struct("<6sHI32s")
+_index_entry = struct.Struct(f"<{max_section_name}sQQ")
+
+
+def write_snapshot(path: str, sections: dict[str, Any]):
+    """
+    Write a snapshot, replacing any existing one at the same path
+
+    The snapshot is written to a temporary file first and moved into place,
+    so readers only ever see a complete file
+
+    Parameters:
+        path (str): Path to write to
+        sections (dict[str, Any]): JSON serializable sections keyed by name
+    """
+
+    index = b""
+    data = b""
+
+    for name, value in sections.items():
+        encoded_name = name.encode()
+        if len(encoded_name) > max_section_name:
+            raise SnapshotError(f"Section name {name} is too long")
+
+        encoded = json.dumps(value, separators=(",", ":")).encode()
+        index += _index_entry.pack(encoded_name, len(data), len(encoded))
+        data += encoded
+
+    body = index + data
+    header = _header.pack(
+        magic, version, len(sections), hashlib.sha256(body).digest()
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        file.write(header + body)
+
+    os.replace(file.name, path)
+
+
+def read_snapshot(path: str, names: list[str] | None = None) -> dict[str, Any]:
+    """
+    Return the sections of a snapshot keyed by name
+
+    Raises SnapshotError if the file is not a snapshot, was written by a
+    different format version or fails its checksum
+
+    Parameters:
+        path (str): Path to read from
+        names (list[str]): Only decode these sections, defaults to all of them
+    """
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _header.size:
+            raise SnapshotError(f"{path} is not a snapshot")
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return _decode(path, view, names)
+
+
+def _decode(
+    path: str, view: memoryview, names: list[str] | None
+) -> dict[str, Any]:
+    file_magic, file_version, count, digest = _header.unpack_from(view)
+
+    if file_magic != magic:
+        raise SnapshotError(f"{path} is not a snapshot")
+
+    if file_version != version:
+        raise SnapshotError(
+            f"{path} has format version {file_version}, expected {version}"
+        )
+
+    if hashlib.sha256(view[_header.size :]).digest() != digest:
+        raise SnapshotError(f"{path} failed its checksum")
+
+    data_start = _header.size + count * _index_entry.size
+    sections = {}
+
+    for i in range(count):
+        raw_name, offset, length = _index_entry.unpack_from(
+            view, _header.size + i * _index_entry.size
+        )
+        name = raw_name.rstrip(b"\x00").decode()
+
+        if names is None or name in names:
+            start = data_start + offset
+            sections[name] = json.loads(bytes(view[start : start + length]))
+
+    return sections
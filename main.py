@@ -8,12 +8,14 @@ from incidentbot.models.database import (
     ApplicationData,
 )
 from incidentbot.scheduler.core import process as TaskScheduler
+from incidentbot.util.dag import Step, StepRunner
+from incidentbot.util.readiness import readiness
 
 from incidentbot.logging import logger
 from sqlmodel import Session, select
+from threading import Thread
 from uvicorn import run
 
-
 """
 Scheduler
 """
@@ -73,20 +75,13 @@ def startup_tasks():
 
     logger.info("Running startup tasks...")
 
-    match settings.platform:
-        case "slack":
-            from incidentbot.scheduler.core import (
-                update_slack_channel_list,
-                update_slack_user_list,
-            )
-
-            # Store Slack Channels
-            # --------------------
-            update_slack_channel_list()
-
-            # Store Slack Users
-            # --------------------
-            update_slack_user_list()
+    # Pinned images need somewhere to be stored
+    # --------------------
+    if settings.enable_pinned_images and not settings.blob_store:
+        logger.warning(
+            "Pinned images are disabled because blob_store is not configured"
+        )
+        settings.enable_pinned_images = False
 
     # Integration Tests
     # --------------------
@@ -127,16 +122,6 @@ def startup_tasks():
             )
             sys.exit(1)
 
-    if (
-        settings.integrations
-        and settings.integrations.atlassian
-        and settings.integrations.atlassian.opsgenie
-        and settings.integrations.atlassian.opsgenie.enabled
-    ):
-        from incidentbot.scheduler.core import update_opsgenie_oc_data
-
-        update_opsgenie_oc_data()
-
     if (
         settings.integrations
         and settings.integrations.pagerduty
@@ -152,10 +137,6 @@ def startup_tasks():
             )
             sys.exit(1)
 
-        from incidentbot.scheduler.core import update_pagerduty_oc_data
-
-        update_pagerduty_oc_data()
-
         try:
             with Session(engine) as session:
                 if not session.exec(
@@ -173,52 +154,206 @@ def startup_tasks():
             logger.error(f"Error storing auto_page_teams: {error}")
 
 
-if __name__ == "__main__":
-    # Database Check
-    # --------------------
-    db_check()
+def load_snapshot():
+    """
+    Serves lookups from the last cache snapshot, if there is one, while
+    warm-up reconciles with the platform
+    """
 
-    # Startup Tests
-    # --------------------
-    startup_tasks()
+    match settings.platform:
+        case "slack":
+            from incidentbot.slack.client import load_cache_snapshot
 
-    # Startup Message
-    # --------------------
+            loaded = load_cache_snapshot()
+
+            if "channels" in loaded:
+                readiness.done("slack_channels")
+            if "users" in loaded:
+                readiness.done("slack_users")
+            if "usergroups" in loaded:
+                readiness.done("slack_usergroups")
+            if "auth_test" in loaded:
+                readiness.done("slack_workspace")
+
+
+def warm_up_steps() -> list[Step]:
+    """
+    Returns the steps that fill caches and check the platform once the
+    application has started
+    """
+
+    steps = []
 
     match settings.platform:
         case "slack":
             from incidentbot.slack.client import (
-                slack_workspace_id,
+                check_bot_user_in_digest_channel,
+                get_auth_test,
+                get_workspace_id,
+                load_slack_usergroup_directory,
+                save_cache_snapshot,
+                store_slack_channel_list_db,
+                store_slack_user_list_db,
             )
 
-            print(
-                startup_message(provider="Slack", workspace=slack_workspace_id)
+            steps = [
+                Step(
+                    "slack_workspace",
+                    lambda results: get_auth_test(refresh=True),
+                    optional=True,
+                ),
+                Step(
+                    "startup_message",
+                    lambda results: print(
+                        startup_message(
+                            provider="Slack", workspace=get_workspace_id()
+                        )
+                    ),
+                    requires=["slack_workspace"],
+                    optional=True,
+                ),
+                # Always check to make sure the bot user is in the digest
+                # channel
+                Step(
+                    "slack_digest_channel",
+                    lambda results: check_bot_user_in_digest_channel(),
+                    requires=["slack_channels", "slack_workspace"],
+                    optional=True,
+                ),
+                Step(
+                    "slack_channels",
+                    lambda results: store_slack_channel_list_db(),
+                    optional=True,
+                ),
+                Step(
+                    "slack_users",
+                    lambda results: store_slack_user_list_db(),
+                    optional=True,
+                ),
+                Step(
+                    "slack_usergroups",
+                    lambda results: load_slack_usergroup_directory(
+                        refresh=True
+                    ),
+                    optional=True,
+                ),
+                Step(
+                    "cache_snapshot",
+                    lambda results: save_cache_snapshot(),
+                    requires=[
+                        "slack_channels",
+                        "slack_usergroups",
+                        "slack_users",
+                        "slack_workspace",
+                    ],
+                    optional=True,
+                ),
+            ]
+
+    # On-call data is kept in the database, so the last copy is served
+    # until it has been refreshed
+    if (
+        settings.integrations
+        and settings.integrations.atlassian
+        and settings.integrations.atlassian.opsgenie
+        and settings.integrations.atlassian.opsgenie.enabled
+    ):
+        from incidentbot.scheduler.core import update_opsgenie_oc_data
+
+        steps.append(
+            Step(
+                "opsgenie_oc_data",
+                lambda results: update_opsgenie_oc_data(),
+                optional=True,
             )
+        )
 
-    # Always check to make sure the bot user is in the digest channel
-    # --------------------
+    if (
+        settings.integrations
+        and settings.integrations.pagerduty
+        and settings.integrations.pagerduty.enabled
+    ):
+        from incidentbot.scheduler.core import update_pagerduty_oc_data
 
-    match settings.platform:
-        case "slack":
-            from incidentbot.slack.client import (
-                check_bot_user_in_digest_channel,
+        steps.append(
+            Step(
+                "pagerduty_oc_data",
+                lambda results: update_pagerduty_oc_data(),
+                optional=True,
             )
+        )
+
+    return steps
+
+
+def warm_up() -> Thread:
+    """
+    Runs the warm-up steps in the background and reports the application as
+    ready once they have finished, listing any that failed as degraded
+    """
+
+    steps = warm_up_steps()
+    readiness.expect(*[step.name for step in steps])
+
+    def run():
+        runner = StepRunner(steps)
+
+        try:
+            runner.run()
+        finally:
+            # Settle every step so that a failure can't leave the
+            # application unready for good
+            for step in steps:
+                if step.name in runner.results:
+                    readiness.done(step.name)
+                else:
+                    readiness.degraded(step.name)
+
+        logger.info(
+            "Warm-up finished: "
+            + ", ".join(f"{k}={v:.2f}s" for k, v in runner.timings.items())
+        )
 
-            check_bot_user_in_digest_channel()
+    thread = Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+
+    return thread
+
+
+if __name__ == "__main__":
+    # Database Check
+    # --------------------
+    db_check()
+
+    # Startup Tests
+    # --------------------
+    startup_tasks()
+
+    # Warm-up
+    # --------------------
+    load_snapshot()
+    warm_up()
 
     # Platform Integrations
     # --------------------
 
     match settings.platform:
         case "slack":
-            from incidentbot.slack.handler import app as slack_app
-            from slack_bolt.adapter.socket_mode import SocketModeHandler
+            if settings.options.async_runtime:
+                from incidentbot.slack import async_runtime
 
-            handler = SocketModeHandler(slack_app, settings.SLACK_APP_TOKEN)
+                async_runtime.start(settings.SLACK_APP_TOKEN)
+            else:
+                from incidentbot.slack.handler import app as slack_app
+                from slack_bolt.adapter.socket_mode import SocketModeHandler
+
+                handler = SocketModeHandler(
+                    slack_app, settings.SLACK_APP_TOKEN
+                )
+                handler.connect()
 
-    # API and handler Integration
+    # API Integration
     # --------------------
     from incidentbot.api.main import app
 
-    handler.connect()
     run(app, host="0.0.0.0", port=3000)
@@ -0,0 +1,78 @@
+import hashlib
+import pytest
+
+from incidentbot.configuration import settings as settings_module
+from incidentbot.configuration.settings import BlobStore, settings
+from incidentbot.exceptions import ConfigurationError
+from incidentbot.storage import blob
+from incidentbot.storage.blob import LocalBlobStore
+from pydantic import ValidationError
+
+
+class TestLocalBlobStore:
+    def test_round_trip_is_keyed_by_content(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+
+        key = store.put([b"pinned ", b"image"])
+
+        assert key == hashlib.sha256(b"pinned image").hexdigest()
+        assert store.read(key) == b"pinned image"
+        assert store.size(key) == len(b"pinned image")
+        assert b"".join(store.iter(key)) == b"pinned image"
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+
+        first = store.put_bytes(b"image")
+        second = store.put_bytes(b"image")
+
+        assert first == second
+        assert (
+            len([p for p in tmp_path.rglob("*") if p.is_file()]) == 1
+        ), "Duplicate content should not be written twice"
+
+    def test_delete(self, tmp_path):
+        store = LocalBlobStore(str(tmp_path))
+        key = store.put_bytes(b"image")
+
+        store.delete(key)
+        store.delete(key)
+
+        assert not store.exists(key)
+
+
+class TestGetBlobStore:
+    def test_requires_configuration(self, monkeypatch):
+        monkeypatch.setattr(blob, "_store", None)
+        monkeypatch.setattr(settings, "blob_store", None)
+
+        with pytest.raises(ConfigurationError):
+            blob.get_blob_store()
+
+    def test_local_path_must_be_absolute(self, tmp_path):
+        with pytest.raises(ValidationError):
+            BlobStore(backend="local", path="blobs")
+
+        with pytest.raises(ValidationError):
+            BlobStore(backend="local")
+
+        assert BlobStore(backend="local", path=str(tmp_path)).path == str(
+            tmp_path
+        )
+
+    def test_s3_requires_bucket_and_boto3(self, monkeypatch):
+        monkeypatch.setattr(
+            settings_module.importlib.util, "find_spec", lambda name: None
+        )
+
+        with pytest.raises(ConfigurationError):
+            BlobStore(backend="s3", bucket="blobs")
+
+        monkeypatch.setattr(
+            settings_module.importlib.util, "find_spec", lambda name: object()
+        )
+
+        with pytest.raises(ValidationError):
+            BlobStore(backend="s3")
+
+        assert BlobStore(backend="s3", bucket="blobs").path is None
@@ -0,0 +1,338 @@
+import os
+import pytest
+
+from incidentbot.slack import client
+from slack_sdk.errors import SlackApiError
+from incidentbot.slack.directory import (
+    SlackChannelMemberCache,
+    SlackUserDirectory,
+)
+from incidentbot.slack.gateway import SlackApiGateway
+from types import SimpleNamespace
+
+
+class FakeSlackApi:
+    def __init__(self):
+        self.calls = []
+        self.invited = []
+
+    def paginate(self, method, key, **kwargs):
+        self.calls.append(method)
+        return iter(["U001"])
+
+    def conversations_invite(self, **kwargs):
+        self.calls.append("conversations_invite")
+
+        users = kwargs.get("users").split(",")
+        self.invited.append(users)
+
+        if "U404" in users:
+            raise SlackApiError(
+                "user_not_found",
+                {
+                    "ok": False,
+                    "error": "user_not_found",
+                    "errors": [
+                        {
+                            "user": "U404",
+                            "ok": False,
+                            "error": "user_not_found",
+                        }
+                    ],
+                },
+            )
+
+        return {"ok": True}
+
+
+class TestInviteUserToChannel:
+    def test_members_are_fetched_once(self, monkeypatch):
+        api = FakeSlackApi()
+        monkeypatch.setattr(client, "slack_api", api)
+        monkeypatch.setattr(
+            client, "channel_member_cache", SlackChannelMemberCache()
+        )
+
+        client.invite_user_to_channel("C001", "U001")
+        client.invite_user_to_channel("C001", "U002")
+        client.invite_user_to_channel("C001", "U002")
+
+        assert api.calls == [
+            "conversations_members",
+            "conversations_invite",
+        ], "Only the first check and the one missing user should call Slack"
+
+    def test_left_members_are_invited_again(self, monkeypatch):
+        api = FakeSlackApi()
+        monkeypatch.setattr(client, "slack_api", api)
+        monkeypatch.setattr(
+            client, "channel_member_cache", SlackChannelMemberCache()
+        )
+
+        client.invite_user_to_channel("C001", "U001")
+        client.record_channel_member_left("C001", "U001")
+        client.invite_user_to_channel("C001", "U001")
+
+        assert api.calls[-1] == "conversations_invite"
+
+
+class TestInviteUsersToChannel:
+    def test_only_rejected_users_are_left_out(self, monkeypatch):
+        api = FakeSlackApi()
+        monkeypatch.setattr(client, "slack_api", api)
+        monkeypatch.setattr(
+            client, "channel_member_cache", SlackChannelMemberCache()
+        )
+
+        results = client.invite_users_to_channel(
+            "C001", ["U003", "U001", "U404", "U002", "U003"]
+        )
+
+        assert results == {
+            "U001": None,
+            "U002": None,
+            "U003": None,
+            "U404": "user_not_found",
+        }
+        assert api.invited == [
+            ["U002", "U003", "U404"],
+            ["U002", "U003"],
+        ], "Existing members should be skipped and only the rest retried"
+
+
+class FakeHistoryClient:
+    """
+    Serves a channel history over two pages, newest first, with one thread
+    whose replies also span two pages
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def conversations_history(self, **kwargs):
+        self.calls.append(("conversations_history", kwargs.get("cursor")))
+
+        if kwargs.get("cursor") == "page2":
+            return {
+                "messages": [
+                    {
+                        "ts": "1700000000.000100",
+                        "user": "U001",
+                        "text": "<@U001> has joined the channel",
+                    }
+                ],
+                "response_metadata": {},
+            }
+
+        return {
+            "messages": [
+                {
+                    "ts": "1700000300.000100",
+                    "user": "U002",
+                    "text": "Paging <@U001|alice> and <@U999>",
+                },
+                {
+                    "ts": "1700000100.000100",
+                    "thread_ts": "1700000100.000100",
+                    "reply_count": 2,
+                    "user": "U001",
+                    "text": "Looking into it",
+                },
+            ],
+            "response_metadata": {"next_cursor": "page2"},
+        }
+
+    def conversations_replies(self, **kwargs):
+        self.calls.append(("conversations_replies", kwargs.get("cursor")))
+
+        if kwargs.get("cursor") == "page2":
+            return {
+                "messages": [
+                    {
+                        "ts": "1700000400.000100",
+                        "thread_ts": kwargs["ts"],
+                        "user": "U001",
+                        "text": "Fixed",
+                    }
+                ],
+                "response_metadata": {},
+            }
+
+        return {
+            "messages": [
+                {
+                    "ts": kwargs["ts"],
+                    "thread_ts": kwargs["ts"],
+                    "user": "U001",
+                    "text": "Looking into it",
+                },
+                {
+                    "ts": "1700000200.000100",
+                    "thread_ts": kwargs["ts"],
+                    "user": "U002",
+                    "text": "Thanks",
+                },
+            ],
+            "response_metadata": {"next_cursor": "page2"},
+        }
+
+
+class TestChannelHistory:
+    @pytest.fixture
+    def api(self, monkeypatch):
+        fake = FakeHistoryClient()
+        directory = SlackUserDirectory()
+        directory.rebuild(
+            [
+                {
+                    "name": "alice",
+                    "real_name": "Alice Example",
+                    "email": None,
+                    "id": "U001",
+                },
+                {"name": "bob", "real_name": "", "email": None, "id": "U002"},
+            ]
+        )
+
+        monkeypatch.setattr(client, "slack_api", SlackApiGateway(fake))
+        monkeypatch.setattr(client, "user_directory", directory)
+
+        return fake
+
+    def test_pages_and_threads_are_merged_in_order(self, api):
+        lines = list(client.iter_formatted_channel_history("C001", "inc-1"))
+
+        assert lines[0] == "Slack channel history for incident inc-1\n"
+        assert [line.split(" ", 3)[3] for line in lines[1:]] == [
+            "Alice Example joined the channel\n",
+            "Alice Example: Looking into it\n",
+            "(thread) bob: Thanks\n",
+            "bob: Paging Alice Example and U999\n",
+            "(thread) Alice Example: Fixed\n",
+        ], "Replies should be interleaved with the history by timestamp"
+        assert api.calls == [
+            ("conversations_history", None),
+            ("conversations_history", "page2"),
+            ("conversations_replies", None),
+            ("conversations_replies", "page2"),
+        ]
+
+    def test_threads_are_only_fetched_for_parents_with_replies(self, api):
+        replies = client.get_thread_replies(
+            "C001",
+            [
+                {"ts": "1", "thread_ts": "1", "reply_count": 0},
+                {"ts": "3", "thread_ts": "2", "reply_count": 1},
+            ],
+        )
+
+        assert replies == []
+        assert api.calls == []
+
+    def test_history_is_written_to_a_file(self, api):
+        path = client.write_formatted_channel_history("C001", "inc-1")
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+        finally:
+            os.remove(path)
+
+        assert os.path.basename(path).startswith("inc-1-")
+        assert content.startswith("Slack channel history for incident inc-1")
+        assert "bob: Paging Alice Example and U999" in content
+
+    def test_file_is_removed_when_history_fails(self, api, monkeypatch):
+        created = []
+        named_temporary_file = client.tempfile.NamedTemporaryFile
+
+        def record(*args, **kwargs):
+            f = named_temporary_file(*args, **kwargs)
+            created.append(f.name)
+            return f
+
+        def fail(**kwargs):
+            raise SlackApiError(
+                "channel_not_found", SimpleNamespace(status_code=404)
+            )
+
+        monkeypatch.setattr(client.tempfile, "NamedTemporaryFile", record)
+        monkeypatch.setattr(api, "conversations_history", fail)
+
+        with pytest.raises(SlackApiError):
+            client.write_formatted_channel_history("C001", "inc-1")
+
+        assert len(created) == 1
+        assert not os.path.exists(
+            created[0]
+        ), "A partial transcript should not be left behind"
+
+
+class RejectingSlackApi(FakeSlackApi):
+    """
+    Rejects every invite with the same response
+    """
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+    def conversations_invite(self, **kwargs):
+        self.invited.append(kwargs.get("users").split(","))
+
+        raise SlackApiError(self.response["error"], self.response)
+
+
+class TestInviteUsersToChannelErrors:
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        monkeypatch.setattr(client, "invite_chunk_size", 2)
+        monkeypatch.setattr(
+            client, "channel_member_cache", SlackChannelMemberCache()
+        )
+
+    def test_channel_errors_fail_every_user_at_once(self, monkeypatch):
+        api = RejectingSlackApi({"ok": False, "error": "is_archived"})
+        monkeypatch.setattr(client, "slack_api", api)
+
+        results = client.invite_users_to_channel(
+            "C001", ["U002", "U003", "U004", "U005"]
+        )
+
+        assert results == {
+            "U002": "is_archived",
+            "U003": "is_archived",
+            "U004": "is_archived",
+            "U005": "is_archived",
+        }
+        assert len(api.invited) == 1, "The batch should not be split"
+
+    def test_user_errors_are_split_down(self, monkeypatch):
+        api = RejectingSlackApi({"ok": False, "error": "user_not_found"})
+        monkeypatch.setattr(client, "slack_api", api)
+
+        results = client.invite_users_to_channel("C001", ["U002", "U003"])
+
+        assert results == {
+            "U002": "user_not_found",
+            "U003": "user_not_found",
+        }
+        assert api.invited == [["U002", "U003"], ["U003"], ["U002"]]
+
+    def test_errors_without_users_are_not_retried(self, monkeypatch):
+        api = RejectingSlackApi(
+            {
+                "ok": False,
+                "error": "missing_scope",
+                "errors": [{"ok": False, "error": "missing_scope"}],
+            }
+        )
+        monkeypatch.setattr(client, "slack_api", api)
+
+        results = client.invite_users_to_channel("C001", ["U002", "U003"])
+
+        assert results == {
+            "U002": "missing_scope",
+            "U003": "missing_scope",
+        }
+        assert len(api.invited) == 1
@@ -0,0 +1,71 @@
+import pytest
+import threading
+
+from incidentbot.exceptions import StepFailedError
+from incidentbot.util.dag import Step, StepRunner
+
+
+class TestStepRunner:
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_sibling(results):
+            barrier.wait()
+            return results["root"]
+
+        runner = StepRunner(
+            [
+                Step("root", lambda results: 1),
+                Step("a", wait_for_sibling, requires=["root"]),
+                Step("b", wait_for_sibling, requires=["root"]),
+                Step(
+                    "sum",
+                    lambda results: results["a"] + results["b"],
+                    requires=["a", "b"],
+                ),
+            ]
+        )
+
+        assert runner.run()["sum"] == 2
+        assert set(runner.timings) == {"root", "a", "b", "sum"}
+
+    def test_optional_failure_skips_dependents_only(self):
+        def fail(results):
+            raise RuntimeError("boom")
+
+        runner = StepRunner(
+            [
+                Step("root", lambda results: "ok"),
+                Step("flaky", fail, requires=["root"], optional=True),
+                Step(
+                    "after_flaky",
+                    lambda results: "never",
+                    requires=["flaky"],
+                    optional=True,
+                ),
+                Step("other", lambda results: "done", requires=["root"]),
+            ]
+        )
+
+        results = runner.run()
+
+        assert results == {"root": "ok", "other": "done"}
+        assert sorted(runner.failed) == ["after_flaky", "flaky"]
+
+    def test_required_failure_raises(self):
+        def fail(results):
+            raise RuntimeError("boom")
+
+        runner = StepRunner(
+            [
+                Step("root", fail),
+                Step("child", lambda results: 1, requires=["root"]),
+            ]
+        )
+
+        with pytest.raises(StepFailedError):
+            runner.run()
+
+        assert (
+            "child" not in runner.results
+        ), "Steps after a required failure should not run"
@@ -0,0 +1,175 @@
+from incidentbot.slack.directory import (
+    SlackChannelDirectory,
+    SlackUserDirectory,
+    SlackUserGroupDirectory,
+)
+
+users = [
+    {
+        "name": "alice",
+        "real_name": "Alice Example",
+        "email": "alice@example.com",
+        "id": "U001",
+    },
+    {
+        "name": "bob",
+        "real_name": "Bob Example",
+        "email": None,
+        "id": "U002",
+    },
+]
+
+
+class TestSlackUserDirectory:
+    def test_lookup_by_any_key(self):
+        directory = SlackUserDirectory()
+        directory.rebuild(users)
+
+        assert directory.get("U001")["name"] == "alice"
+        assert directory.get("bob")["id"] == "U002"
+        assert directory.get("Alice Example")["id"] == "U001"
+        assert directory.get("alice@example.com")["id"] == "U001"
+        assert (
+            directory.get("U999") is None
+        ), "Unknown users should not be returned"
+
+    def test_counters(self):
+        directory = SlackUserDirectory()
+        directory.rebuild(users)
+
+        directory.get_by_id("U001")
+        directory.get_by_id("U999")
+        directory.get("bob")
+
+        assert directory.stats() == {"size": 2, "hits": 2, "misses": 1}
+
+    def test_rebuild_replaces_contents(self):
+        directory = SlackUserDirectory()
+        directory.rebuild(users)
+        directory.rebuild(users[1:])
+
+        assert directory.get_by_id("U001") is None
+        assert len(directory) == 1
+
+    def test_upsert_replaces_stale_keys(self):
+        directory = SlackUserDirectory()
+        directory.rebuild(users)
+        directory.upsert({**users[0], "name": "alice2"})
+
+        assert directory.get("alice2")["id"] == "U001"
+        assert (
+            directory.get("alice") is None
+        ), "Old handles should not resolve after a user is updated"
+        assert len(directory) == 2
+
+    def test_upsert_updates_in_place(self):
+        directory = SlackUserDirectory()
+        directory.rebuild(users)
+        indexes = directory._indexes
+
+        directory.upsert({**users[1], "email": "bob@example.com"})
+
+        assert (
+            directory._indexes is indexes
+        ), "A single user should not copy the whole directory"
+        assert directory.get("bob@example.com")["id"] == "U002"
+        assert directory.get("bob")["email"] == "bob@example.com"
+        assert directory.get("alice") is users[0]
+
+    def test_upsert_waits_for_load(self):
+        directory = SlackUserDirectory()
+        directory.upsert(users[0])
+
+        assert (
+            not directory.loaded
+        ), "An event before the first load should not mark it as loaded"
+        assert len(directory) == 0
+
+        directory.rebuild([])
+        assert directory.loaded, "An empty workspace should not be reloaded"
+
+
+class TestSlackChannelDirectory:
+    def test_lookup_and_digest_channel(self):
+        directory = SlackChannelDirectory()
+        directory.rebuild(
+            [
+                {"id": "C001", "name": "incidents"},
+                {"id": "C002", "name": "general"},
+            ]
+        )
+
+        assert directory.get_by_id("C002")["name"] == "general"
+        assert directory.get_by_name("incidents")["id"] == "C001"
+        assert directory.digest_channel_id("incidents") == "C001"
+
+        directory.rebuild([{"id": "C003", "name": "incidents"}])
+
+        assert (
+            directory.digest_channel_id("incidents") == "C003"
+        ), "Rebuilding should invalidate the cached digest channel id"
+
+    def test_incremental_updates(self):
+        directory = SlackChannelDirectory()
+        directory.rebuild([{"id": "C001", "name": "incidents"}])
+
+        directory.upsert({"id": "C002", "name": "general"})
+        directory.upsert({"id": "C002", "name": "random"})
+        directory.remove("C001")
+
+        assert directory.get_by_name("random")["id"] == "C002"
+        assert (
+            directory.get_by_name("general") is None
+        ), "Renamed channels should not be found by their old name"
+        assert directory.get_by_id("C001") is None
+
+    def test_incremental_updates_keep_digest_channel(self):
+        directory = SlackChannelDirectory()
+        directory.rebuild([{"id": "C001", "name": "incidents"}])
+        directory.digest_channel_id("incidents")
+
+        directory.upsert({"id": "C002", "name": "general"})
+        assert directory._digest_channel_id == "C001"
+
+        directory.upsert({"id": "C001", "name": "old-incidents"})
+        directory.upsert({"id": "C003", "name": "incidents"})
+        assert (
+            directory.digest_channel_id("incidents") == "C003"
+        ), "Renaming the digest channel should invalidate its cached id"
+
+
+    def test_updates_wait_for_load(self):
+        directory = SlackChannelDirectory()
+        directory.upsert({"id": "C001", "name": "incidents"})
+        directory.remove("C001")
+
+        assert not directory.loaded
+        assert directory.get_by_id("C001") is None
+
+        directory.rebuild([])
+        assert directory.loaded, "An empty workspace should not be reloaded"
+
+
+class TestSlackUserGroupDirectory:
+    def test_membership_follows_events(self):
+        directory = SlackUserGroupDirectory()
+        directory.rebuild(
+            [{"id": "S001", "handle": "sre", "name": "SRE", "users": ["U001"]}]
+        )
+
+        assert "U001" in directory.members("sre")
+
+        directory.update_members("S001", added=["U002"], removed=["U001"])
+        assert directory.members("sre") == {"U002"}
+
+        directory.upsert({"id": "S001", "handle": "oncall", "name": "SRE"})
+        assert directory.get_by_handle("sre") is None
+        assert directory.members("oncall") == {
+            "U002"
+        }, "Renaming a group should keep its members"
+
+    def test_empty_workspace_counts_as_loaded(self):
+        directory = SlackUserGroupDirectory()
+        directory.rebuild([])
+
+        assert directory.loaded, "An empty workspace should not be refetched"
@@ -0,0 +1,92 @@
+import pytest
+
+from incidentbot.incident.event import timeline_query
+from incidentbot.models.database import engine, IncidentEvent, IncidentRecord
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.fixture
+def seeded_connection():
+    """
+    A connection to a throwaway schema holding 50k events across 500
+    incidents, rolled back afterwards
+    """
+
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        pytest.skip("Postgres is not available")
+
+    transaction = connection.begin()
+
+    try:
+        connection.execute(text("CREATE SCHEMA timeline_test"))
+        connection.execute(text("SET LOCAL search_path TO timeline_test"))
+
+        IncidentRecord.metadata.create_all(
+            connection,
+            tables=[IncidentRecord.__table__, IncidentEvent.__table__],
+        )
+
+        connection.execute(text("""
+                INSERT INTO incidentrecord (id, slug, channel_id)
+                SELECT i, 'inc-' || i, 'C' || i
+                FROM generate_series(1, 500) AS i
+                """))
+        connection.execute(text("""
+                INSERT INTO incidentevent
+                    (id, parent, incident_slug, message_ts, source, text)
+                SELECT
+                    gen_random_uuid(),
+                    i % 500 + 1,
+                    'inc-' || (i % 500 + 1),
+                    (1700000000 + i)::text,
+                    'slack',
+                    'event ' || i
+                FROM generate_series(1, 50000) AS i
+                """))
+        connection.execute(text("ANALYZE incidentevent"))
+
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+def explain(connection, query) -> str:
+    compiled = query.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+
+    return "\n".join(connection.execute(text(f"EXPLAIN {compiled}")).scalars())
+
+
+class TestTimelineQuery:
+    def test_requires_a_key(self):
+        with pytest.raises(ValueError):
+            timeline_query(IncidentEvent)
+
+    def test_filters_on_one_key(self):
+        query = str(timeline_query(IncidentEvent, incident_id=1))
+
+        assert "incident_slug =" not in query, "Only parent should be used"
+
+    def test_uses_parent_index(self, seeded_connection):
+        plan = explain(
+            seeded_connection, timeline_query(IncidentEvent, incident_id=42)
+        )
+
+        assert "ix_incidentevent_parent_message_ts" in plan, plan
+        assert "Seq Scan" not in plan, plan
+
+    def test_uses_slug_index(self, seeded_connection):
+        plan = explain(
+            seeded_connection,
+            timeline_query(IncidentEvent, incident_slug="inc-42"),
+        )
+
+        assert "ix_incidentevent_incident_slug_message_ts" in plan, plan
+        assert "Seq Scan" not in plan, plan
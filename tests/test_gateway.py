@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+import time
+
+from incidentbot.slack.gateway import (
+    AsyncSlackApi,
+    SlackApiGateway,
+    TokenBucket,
+)
+from slack_sdk.errors import SlackApiError
+from types import SimpleNamespace
+
+
+class FakeClient:
+    """
+    Serves two pages of users and rate limits the second page once
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.limited = False
+
+    def users_list(self, **kwargs):
+        self.calls.append(kwargs.get("cursor"))
+
+        if kwargs.get("cursor") == "page2" and not self.limited:
+            self.limited = True
+            raise SlackApiError(
+                "ratelimited",
+                SimpleNamespace(status_code=429, headers={"Retry-After": "0"}),
+            )
+
+        if kwargs.get("cursor") == "page2":
+            return {"members": ["U002"], "response_metadata": {}}
+
+        return {
+            "members": ["U001"],
+            "response_metadata": {"next_cursor": "page2"},
+        }
+
+
+class TestSlackApiGateway:
+    def test_paginate_resumes_from_last_cursor(self):
+        client = FakeClient()
+        gateway = SlackApiGateway(client)
+        gateway.backoff = lambda attempt, headers: 0
+
+        members = list(gateway.paginate("users_list", "members"))
+
+        assert members == ["U001", "U002"]
+        assert client.calls == [
+            None,
+            "page2",
+            "page2",
+        ], "Only the rate limited page should be requested again"
+
+    def test_non_rate_limit_errors_are_raised(self):
+        gateway = SlackApiGateway(
+            SimpleNamespace(
+                chat_postMessage=lambda **kwargs: (_ for _ in ()).throw(
+                    SlackApiError(
+                        "channel_not_found",
+                        SimpleNamespace(status_code=200, headers={}),
+                    )
+                )
+            )
+        )
+
+        with pytest.raises(SlackApiError):
+            gateway.chat_postMessage(channel="C001", text="hello")
+
+
+class TestTokenBucket:
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(per_minute=600, burst=2)
+
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        assert (
+            elapsed >= 0.05
+        ), "The third token should wait for the bucket to refill"
+
+
+class FakeAsyncClient:
+    """
+    Rate limits the first call it receives
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat_postMessage(self, **kwargs):
+        self.calls += 1
+
+        if self.calls == 1:
+            raise SlackApiError(
+                "ratelimited",
+                SimpleNamespace(status_code=429, headers={"Retry-After": "0"}),
+            )
+
+        return {"ok": True}
+
+
+class TestAsyncSlackApi:
+    def test_bound_calls_share_gateway_buckets(self):
+        gateway = SlackApiGateway(None)
+        gateway.backoff = lambda attempt, headers: 0
+        api = AsyncSlackApi(gateway)
+        client = FakeAsyncClient()
+
+        async def post():
+            api.bind(client)
+            try:
+                return await api.chat_postMessage(channel="C001", text="hi")
+            finally:
+                api.unbind()
+
+        bucket = gateway.bucket("chat_postMessage")
+        capacity = bucket.capacity
+
+        assert asyncio.run(post()) == {"ok": True}
+        assert client.calls == 2, "A rate limited call should be retried"
+        assert (
+            bucket.tokens < capacity
+        ), "Bound calls should take tokens from the gateway bucket"
@@ -0,0 +1,115 @@
+import asyncio
+import io
+import pytest
+
+from fastapi import HTTPException
+from incidentbot.api.routes import incident
+from incidentbot.storage.blob import LocalBlobStore
+from incidentbot.storage.image import get_thumbnail
+from types import SimpleNamespace
+
+
+def body(response) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+class TestParseRange:
+    def test_ranges(self):
+        assert incident.parse_range("bytes=0-3", 10) == (0, 3)
+        assert incident.parse_range("bytes=4-", 10) == (4, 9)
+        assert incident.parse_range("bytes=-4", 10) == (6, 9)
+        assert incident.parse_range("bytes=5-100", 10) == (5, 9)
+
+    def test_ignored_ranges(self):
+        assert incident.parse_range("items=0-3", 10) is None
+        assert (
+            incident.parse_range("bytes=0-1,4-5", 10) is None
+        ), "Multiple ranges should fall back to the whole content"
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=10-", "bytes=5-2", "bytes=-0", "bytes=a-b"):
+            with pytest.raises(ValueError):
+                incident.parse_range(header, 10)
+
+
+class TestEventImage:
+    @pytest.fixture
+    def image(self, tmp_path, monkeypatch):
+        store = LocalBlobStore(str(tmp_path))
+        key = store.put_bytes(b"0123456789")
+
+        monkeypatch.setattr(incident, "get_blob_store", lambda: store)
+        monkeypatch.setattr(
+            incident.EventLogHandler,
+            "read_one",
+            lambda **kwargs: SimpleNamespace(
+                image_ref=key, mimetype="image/png"
+            ),
+        )
+
+        return key
+
+    def test_raw_content_is_cacheable(self, image):
+        response = incident.get_incident_event_image(slug="inc", id="1")
+
+        assert body(response) == b"0123456789"
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["content-length"] == "10"
+        assert response.headers["etag"] == f'"{image}"'
+        assert "immutable" in response.headers["cache-control"]
+
+        cached = incident.get_incident_event_image(
+            slug="inc", id="1", if_none_match=f'"{image}"'
+        )
+
+        assert cached.status_code == 304
+
+    def test_range(self, image):
+        response = incident.get_incident_event_image(
+            slug="inc", id="1", range_header="bytes=2-5"
+        )
+
+        assert response.status_code == 206
+        assert body(response) == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+        assert response.headers["content-length"] == "4"
+
+        response = incident.get_incident_event_image(
+            slug="inc", id="1", range_header="bytes=20-"
+        )
+
+        assert response.status_code == 416
+
+    def test_missing_blob(self, image, tmp_path):
+        LocalBlobStore(str(tmp_path)).delete(image)
+
+        for thumbnail in (False, True):
+            with pytest.raises(HTTPException) as error:
+                incident.get_incident_event_image(
+                    slug="inc", id="1", thumbnail=thumbnail
+                )
+
+            assert (
+                error.value.status_code == 404
+            ), "A missing blob should not be a server error"
+
+
+class TestThumbnail:
+    def test_cmyk_images(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+
+        upload = io.BytesIO()
+        Image.new("CMYK", (640, 480), (0, 255, 255, 0)).save(
+            upload, format="JPEG"
+        )
+
+        store = LocalBlobStore(str(tmp_path))
+        thumbnail = get_thumbnail(store, store.put_bytes(upload.getvalue()))
+
+        with Image.open(io.BytesIO(store.read(thumbnail))) as result:
+            assert result.format == "PNG"
+            assert result.mode == "RGB"
+            assert max(result.size) == 320
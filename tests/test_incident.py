@@ -0,0 +1,169 @@
+import threading
+import time
+
+from concurrent.futures import Future
+from datetime import datetime
+from incidentbot.incident import core
+from incidentbot.models.database import IncidentRecord, JiraIssueRecord
+from incidentbot.models.incident import (
+    _incident_predicates,
+    IncidentDatabaseInterface,
+)
+from incidentbot.util.dag import StepRunner
+from sqlalchemy import create_engine
+from sqlmodel import Session
+
+
+class TestIncidentPredicates:
+    def test_only_supplied_keys_are_filtered(self):
+        predicates = _incident_predicates(channel_id="C01")
+
+        assert len(predicates) == 1
+        assert "channel_id" in str(
+            predicates[0]
+        ), "Only the supplied key should be in the predicate"
+
+    def test_no_keys(self):
+        assert _incident_predicates() == []
+
+
+class TestIterAll:
+    def test_follows_keyset_pages(self, monkeypatch):
+        incidents = [
+            IncidentRecord(id=i, created_at=datetime(2026, 1, i))
+            for i in range(5, 0, -1)
+        ]
+        calls = []
+
+        def list_page(after=None, limit=100, **filters):
+            calls.append(after)
+            remaining = [
+                i
+                for i in incidents
+                if after is None or (i.created_at, i.id) < after
+            ]
+            return remaining[:limit]
+
+        monkeypatch.setattr(IncidentDatabaseInterface, "list_page", list_page)
+
+        assert [
+            i.id for i in IncidentDatabaseInterface.iter_all(page_size=2)
+        ] == [5, 4, 3, 2, 1]
+        assert calls == [
+            None,
+            (datetime(2026, 1, 4), 4),
+            (datetime(2026, 1, 2), 2),
+        ], "Each page should start after the last incident of the previous"
+
+
+class FakeWebClient:
+    def __init__(self):
+        self.messages = []
+
+    def chat_postMessage(self, **kwargs):
+        self.messages.append(kwargs)
+
+        return {"ts": "1700000000.000100"}
+
+
+class TestCreationSteps:
+    def test_digest_does_not_wait_for_meeting_link(self, monkeypatch):
+        client = FakeWebClient()
+        incident = core.Incident()
+
+        def no_meeting_link(channel_name):
+            raise RuntimeError("zoom is down")
+
+        monkeypatch.setattr(core, "slack_web_client", client, raising=False)
+        monkeypatch.setattr(
+            incident, "create_channel", lambda **kwargs: {"id": "C001"}
+        )
+        monkeypatch.setattr(incident, "generate_meeting_link", no_meeting_link)
+
+        steps = incident.creation_steps(
+            channel_name="inc-1",
+            private=False,
+            record=IncidentRecord(
+                description="Something broke",
+                severity="sev1",
+                slug="inc-1",
+                status="investigating",
+            ),
+        )
+        runner = StepRunner(
+            [
+                step
+                for step in steps
+                if step.name in ("channel", "meeting_link", "digest")
+            ]
+        )
+
+        results = runner.run()
+
+        assert runner.failed == ["meeting_link"]
+        assert (
+            results["digest"] == "1700000000.000100"
+        ), "The digest should go out without a meeting link"
+        assert "digest_channel_meeting" not in str(client.messages[0])
+
+
+class TestOptionalFeatures:
+    def test_calls_are_limited_per_integration(self, monkeypatch):
+        monkeypatch.setattr(core, "integration_concurrency", {"jira": 1})
+        monkeypatch.setattr(core, "_integration_executors", {})
+
+        running = []
+        overlapped = threading.Event()
+
+        def create():
+            running.append(1)
+            if len(running) > 1:
+                overlapped.set()
+            time.sleep(0.05)
+            running.pop()
+
+        executor = core.integration_executor("jira")
+        assert core.integration_executor("jira") is executor
+
+        futures = [executor.submit(create) for _ in range(3)]
+        for future in futures:
+            future.result()
+
+        assert (
+            not overlapped.is_set()
+        ), "Calls to one integration should not exceed its concurrency"
+
+    def test_late_results_are_recorded(self, monkeypatch):
+        engine = create_engine("sqlite://")
+        IncidentRecord.metadata.create_all(
+            engine,
+            tables=[IncidentRecord.__table__, JiraIssueRecord.__table__],
+        )
+
+        with Session(engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1"))
+            session.commit()
+
+        events = []
+
+        monkeypatch.setattr(core, "engine", engine)
+        monkeypatch.setattr(
+            core.EventLogHandler,
+            "create_many",
+            lambda **kwargs: events.extend(kwargs["events"]),
+        )
+
+        future = Future()
+        future.set_result(JiraIssueRecord(key="INC-1", parent=1))
+        core.Incident().apply_late_result(1, "Creating Jira issue", future)
+
+        with Session(engine) as session:
+            assert (
+                session.get(JiraIssueRecord, "INC-1") is not None
+            ), "A slow Jira issue should still be recorded"
+
+        failed = Future()
+        failed.set_exception(RuntimeError("jira is down"))
+        core.Incident().apply_late_result(1, "Creating Jira issue", failed)
+
+        assert events == []
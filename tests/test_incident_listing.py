@@ -0,0 +1,122 @@
+import pytest
+
+from datetime import datetime
+from fastapi import HTTPException
+from incidentbot.api.routes import incident
+from incidentbot.models.database import IncidentRecord
+
+
+class TestCursor:
+    def test_round_trip(self):
+        record = IncidentRecord(id=42, created_at=datetime(2026, 3, 1, 12))
+
+        assert incident.decode_cursor(incident.encode_cursor(record)) == (
+            datetime(2026, 3, 1, 12),
+            42,
+        )
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            incident.decode_cursor("not-a-cursor")
+
+
+class TestGetIncidents:
+    @pytest.fixture
+    def interface(self, monkeypatch):
+        calls = {"count": 0, "pages": []}
+        records = [
+            IncidentRecord(id=i, created_at=datetime(2026, 1, i))
+            for i in range(3, 0, -1)
+        ]
+
+        def list_page(after=None, limit=100, **filters):
+            calls["pages"].append((after, filters))
+            return [
+                r
+                for r in records
+                if after is None or (r.created_at, r.id) < after
+            ][:limit]
+
+        def count(**filters):
+            calls["count"] += 1
+            return len(records)
+
+        monkeypatch.setattr(
+            incident.IncidentDatabaseInterface, "list_page", list_page
+        )
+        monkeypatch.setattr(incident.IncidentDatabaseInterface, "count", count)
+        monkeypatch.setattr(incident, "_total_counts", {})
+
+        return calls
+
+    def test_pages_follow_cursor(self, interface):
+        first = incident.get_incidents(limit=2, statuses=["investigating"])
+
+        assert [r.id for r in first.data] == [3, 2]
+        assert first.count == 3, "count should be the total, not the page"
+        assert first.next_cursor
+
+        second = incident.get_incidents(
+            cursor=first.next_cursor, limit=2, statuses=["investigating"]
+        )
+
+        assert [r.id for r in second.data] == [1]
+        assert second.next_cursor is None
+        assert interface["pages"][1][0] == (datetime(2026, 1, 2), 2)
+        assert interface["pages"][1][1]["statuses"] == ["investigating"]
+        assert interface["count"] == 1, "The total should be reused"
+
+    def test_invalid_cursor_is_rejected(self, interface):
+        with pytest.raises(HTTPException) as error:
+            incident.get_incidents(cursor="bogus")
+
+        assert error.value.status_code == 400
+
+    def test_database_errors_are_not_hidden(self, interface, monkeypatch):
+        def list_page(**kwargs):
+            raise RuntimeError("connection refused")
+
+        monkeypatch.setattr(
+            incident.IncidentDatabaseInterface, "list_page", list_page
+        )
+
+        with pytest.raises(HTTPException) as error:
+            incident.get_incidents()
+
+        assert error.value.status_code == 500
+
+
+class TestCachedTotal:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+
+        monkeypatch.setattr(incident.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(
+            incident.IncidentDatabaseInterface,
+            "count",
+            lambda **filters: 1,
+        )
+        monkeypatch.setattr(incident, "_total_counts", {})
+
+        return now
+
+    def test_expired_counts_are_pruned(self, clock):
+        incident.cached_total({"statuses": ["investigating"]})
+        clock[0] += incident.total_count_ttl + 1
+        incident.cached_total({"statuses": ["resolved"]})
+
+        assert list(incident._total_counts) == [
+            (("statuses", ("resolved",)),)
+        ], "Expired counts should be dropped when a count is stored"
+
+    def test_size_is_bounded(self, clock, monkeypatch):
+        monkeypatch.setattr(incident, "max_total_counts", 2)
+
+        for description in ("a", "b", "c"):
+            incident.cached_total({"description": description})
+
+        assert list(incident._total_counts) == [
+            (("description", "b"),),
+            (("description", "c"),),
+        ], "The oldest count should be evicted"
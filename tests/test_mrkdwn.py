@@ -0,0 +1,41 @@
+from incidentbot.slack.mrkdwn import parse_pinned_message_content
+
+channels = {"C01": "incident-db", "C02": "ops"}
+users = {"U01": "Jane Doe", "U02": "Sam Roe"}
+groups = {"S01": "sre"}
+
+
+def parse(message: str) -> str:
+    return parse_pinned_message_content(
+        message,
+        channel=channels.get,
+        user=users.get,
+        usergroup=groups.get,
+    )
+
+
+class TestParsePinnedMessageContent:
+    def test_replaces_every_occurrence(self):
+        assert (
+            parse("<@U01> and <@U02> moved from <#C01|> to <#C02> with <@U01>")
+            == "@Jane Doe and @Sam Roe moved from #incident-db to #ops with @Jane Doe"
+        ), "Every mention should be replaced, not just the first"
+
+    def test_links(self):
+        assert (
+            parse(
+                "see <https://example.com/a|the dashboard> and <http://x.io>"
+            )
+            == "see https://example.com/a and http://x.io"
+        )
+        assert parse("mail <mailto:sre@example.com|sre>") == "mail sre"
+
+    def test_special_mentions(self):
+        assert (
+            parse("<!here> <!subteam^S01|@old-sre> <!subteam^S09|@other>")
+            == "@here @sre @other"
+        )
+
+    def test_unresolved_tokens_fall_back(self):
+        assert parse("<#C09|general> <@U09>") == "#general <@U09>"
+        assert parse("no tokens here") == "no tokens here"
@@ -0,0 +1,89 @@
+import pytest
+
+from incidentbot.scheduler import core as scheduler
+from incidentbot.slack import client
+from incidentbot.util.readiness import Readiness
+
+
+class TestReadiness:
+    def test_ready_once_expected_tasks_are_done(self):
+        readiness = Readiness()
+
+        assert readiness.ready, "Nothing expected should mean ready"
+
+        readiness.expect("slack_channels", "slack_users")
+        readiness.done("slack_users")
+
+        assert readiness.status() == {
+            "ready": False,
+            "pending": ["slack_channels"],
+            "degraded": [],
+        }
+
+        readiness.done("slack_channels")
+
+        assert readiness.ready
+
+    def test_tasks_done_before_expected_stay_done(self):
+        readiness = Readiness()
+        readiness.done("slack_users")
+        readiness.expect("slack_users")
+
+        assert readiness.ready, "A finished task should not be pending again"
+
+    def test_failed_tasks_settle_as_degraded(self):
+        readiness = Readiness()
+        readiness.expect("slack_channels", "slack_users")
+        readiness.done("slack_users")
+        readiness.degraded("slack_channels")
+
+        assert readiness.status() == {
+            "ready": True,
+            "pending": [],
+            "degraded": ["slack_channels"],
+        }, "A failed task should not keep the application unready"
+
+        readiness.done("slack_channels")
+
+        assert readiness.status()["degraded"] == []
+
+
+class TestScheduledRefresh:
+    @pytest.fixture
+    def readiness(self, monkeypatch):
+        readiness = Readiness()
+        readiness.expect("slack_channels")
+        readiness.degraded("slack_channels")
+
+        monkeypatch.setattr(scheduler, "readiness", readiness)
+
+        return readiness
+
+    def test_sync_failures_are_raised(self, monkeypatch):
+        def unavailable():
+            raise RuntimeError("slack is down")
+
+        monkeypatch.setattr(client, "get_channel_list", unavailable)
+
+        with pytest.raises(RuntimeError):
+            client.store_slack_channel_list_db()
+
+    def test_refresh_clears_degraded(self, readiness, monkeypatch):
+        def unavailable():
+            raise RuntimeError("slack is down")
+
+        monkeypatch.setattr(
+            scheduler, "store_slack_channel_list_db", unavailable
+        )
+        scheduler.update_slack_channel_list()
+
+        assert readiness.status()["degraded"] == [
+            "slack_channels"
+        ], "A failed refresh should leave the task degraded"
+
+        monkeypatch.setattr(
+            scheduler, "store_slack_channel_list_db", lambda: None
+        )
+        scheduler.update_slack_channel_list()
+
+        assert readiness.status()["degraded"] == []
@@ -0,0 +1,31 @@
+import pytest
+
+from incidentbot.exceptions import SnapshotError
+from incidentbot.util.snapshot import read_snapshot, write_snapshot
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "cache.snapshot")
+        sections = {
+            "channels": [{"id": "C001", "name": "general"}],
+            "users": [{"id": "U001", "name": "jdoe", "email": None}],
+        }
+
+        write_snapshot(path, sections)
+
+        assert read_snapshot(path) == sections
+        assert read_snapshot(path, names=["users"]) == {
+            "users": sections.get("users")
+        }, "Only the requested sections should be decoded"
+
+    def test_corrupt_snapshot_is_rejected(self, tmp_path):
+        path = tmp_path / "cache.snapshot"
+        write_snapshot(str(path), {"users": [{"id": "U001"}]})
+
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError):
+            read_snapshot(str(path))
@@ -0,0 +1,126 @@
+import pytest
+import threading
+
+from incidentbot.exceptions import UnitOfWorkError
+from incidentbot.incident.updates import ChannelUpdateQueue
+from incidentbot.models import unit_of_work as uow_module
+from incidentbot.models.database import IncidentRecord
+from incidentbot.models.incident import IncidentDatabaseInterface
+from incidentbot.models.unit_of_work import (
+    current_unit_of_work,
+    unit_of_work,
+    UnitOfWork,
+)
+from sqlalchemy import create_engine
+from sqlmodel import Session
+
+
+class TestUnitOfWork:
+    def test_incidents_are_cached_by_every_key(self):
+        uow = UnitOfWork()
+        incident = IncidentRecord(
+            id=1, channel_id="C001", channel_name="inc-1", slug="inc-1"
+        )
+        uow.add_incident(incident)
+
+        assert uow.get_incident("id", 1) is incident
+        assert uow.get_incident("slug", "inc-1") is incident
+
+    def test_queued_updates_are_visible(self):
+        uow = UnitOfWork()
+        incident = IncidentRecord(id=1, channel_id="C001", channel_name="a")
+        uow.add_incident(incident)
+
+        uow.update_incident("channel_id", "C001", "channel_name", "b")
+
+        assert incident.channel_name == "b"
+        assert uow.get_incident("channel_name", "b") is incident
+        assert (
+            uow.get_incident("channel_name", "a") is None
+        ), "The old value should no longer find the incident"
+
+    def test_queued_updates_apply_to_incidents_cached_later(self):
+        uow = UnitOfWork()
+        uow.update_incident("channel_id", "C001", "channel_name", "b")
+        uow.update_incident("channel_name", "b", "status", "resolved")
+
+        incident = IncidentRecord(
+            id=1, channel_id="C001", channel_name="a", slug="inc-1"
+        )
+        uow.add_incident(incident)
+
+        cached = uow.get_incident("slug", "inc-1")
+
+        assert (
+            cached.channel_name == "b"
+        ), "An incident read after an update was queued should include it"
+        assert cached.status == "resolved"
+        assert uow.get_incident("channel_name", "a") is None
+
+    def test_lookups_are_served_from_the_unit_of_work(self):
+        incident = IncidentRecord(id=1, channel_id="C001", slug="inc-1")
+
+        with unit_of_work() as uow:
+            uow.add_incident(incident)
+
+            assert IncidentDatabaseInterface.get_by_slug("inc-1") is incident
+
+            with unit_of_work() as nested:
+                assert nested is uow, "Nested blocks should join"
+
+        assert current_unit_of_work() is None
+
+    def test_channel_updates_wait_for_commit(self):
+        writes = []
+        written = threading.Event()
+
+        def write(channel_id, targets):
+            writes.append(channel_id)
+            written.set()
+
+        queue = ChannelUpdateQueue(write, window=0.05)
+
+        with unit_of_work() as uow:
+            queue.request("C001", "topic")
+
+            assert not written.wait(0.2)
+            assert uow._on_commit, "The request should wait for the commit"
+
+        assert written.wait(5)
+        assert writes == ["C001"]
+
+
+class TestCommit:
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        engine = create_engine("sqlite://")
+        IncidentRecord.metadata.create_all(
+            engine, tables=[IncidentRecord.__table__]
+        )
+
+        with Session(engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1", status="open"))
+            session.add(IncidentRecord(id=2, slug="inc-2", status="open"))
+            session.commit()
+
+        monkeypatch.setattr(uow_module, "engine", engine)
+
+        return engine
+
+    def test_stale_keys_do_not_undo_other_updates(self, engine):
+        uow = UnitOfWork()
+        committed = []
+        uow.update_incident("slug", "inc-1", "status", "resolved")
+        uow.update_incident("slug", "inc-404", "status", "resolved")
+        uow.update_incident("slug", "inc-2", "status", "resolved")
+        uow.on_commit(lambda: committed.append(True))
+
+        with pytest.raises(UnitOfWorkError, match="slug=inc-404"):
+            uow.commit()
+
+        with Session(engine) as session:
+            assert [
+                session.get(IncidentRecord, id).status for id in (1, 2)
+            ] == ["resolved", "resolved"]
+
+        assert committed, "Callbacks should still run"
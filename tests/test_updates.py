@@ -0,0 +1,41 @@
+import threading
+
+from incidentbot.incident.updates import ChannelUpdateQueue, render_topic
+from incidentbot.models.database import IncidentParticipant, IncidentRecord
+
+
+class TestChannelUpdateQueue:
+    def test_burst_is_written_once(self):
+        writes = []
+        written = threading.Event()
+
+        def write(channel_id, targets):
+            writes.append((channel_id, targets))
+            written.set()
+
+        queue = ChannelUpdateQueue(write, window=0.1)
+        queue.request("C001", "topic")
+        queue.request("C001", "digest")
+        queue.request("C001", "topic")
+
+        assert written.wait(5)
+        assert writes == [
+            ("C001", {"digest", "topic"})
+        ], "Changes within the window should be merged into one write"
+
+
+class TestRenderTopic:
+    def test_lead_is_last(self):
+        record = IncidentRecord(severity="sev2", status="investigating")
+        lead = IncidentParticipant(
+            is_lead=True,
+            parent=1,
+            role="incident_commander",
+            user_id="U001",
+            user_name="jdoe",
+        )
+
+        assert (
+            render_topic(record, lead)
+            == "Severity: SEV2 | Status: Investigating | Incident Commander: <@U001>"
+        )